@@ -52,6 +52,9 @@ python manage.py seed_db
 
 echo "✅ Database migrations completed"
 
+# Start the background job workers
+sh ./run_background.sh
+
 # Start the application server
 echo "🚀 Starting Gunicorn server..."
 exec gunicorn -b 0.0.0.0:5000 --workers 3 manage:app
@@ -1255,6 +1255,7 @@ def create_super_admin():
 def create_service_admin():
     """Creates a service admin user."""
     from project.api.models import Service, ServiceAdmin
+    from project.api.permission_cache import bump_permission_version
     
     username = input("Enter service admin username: ")
     email = input("Enter service admin email: ")
@@ -1306,6 +1307,7 @@ def create_service_admin():
     )
     
     db.session.add(admin_assignment)
+    bump_permission_version()
     db.session.commit()
     
     print(f"✅ Service admin '{username}' created successfully!")
@@ -1352,6 +1354,7 @@ def list_admins():
 def grant_service_access():
     """Grant a user access to a service."""
     from project.api.models import Service, UserServicePermission
+    from project.api.permission_cache import bump_permission_version
     
     # Show users
     users = User.query.filter_by(role='user').all()
@@ -1418,9 +1421,156 @@ def grant_service_access():
         db.session.add(new_perm)
         print(f"✅ Granted {permissions} access to {selected_user.username} for {selected_service.name}")
     
+    bump_permission_version()
     db.session.commit()
 
 
+@cli.command('rebuild_cashbook_checkpoints')
+@click.option('--group-id', type=int, default=None, help='Only rebuild this group')
+def rebuild_cashbook_checkpoints(group_id):
+    """Recompute cashbook day/month checkpoints from the ledger."""
+    from project.api.models import SavingsGroup
+    from project.api.cashbook_service import CashbookService
+
+    group_ids = [group_id] if group_id else [g.id for g in SavingsGroup.query.with_entities(SavingsGroup.id)]
+    for gid in group_ids:
+        written = CashbookService.rebuild_checkpoints(gid)
+        db.session.commit()
+        print(f"✅ Group {gid}: {written} checkpoints")
+
+
+@cli.command('rebalance_cashbook')
+@click.option('--group-id', type=int, required=True, help='Group whose ledger to rebalance')
+@click.option('--from-date', default=None, help='First affected date (YYYY-MM-DD); whole ledger if omitted')
+def rebalance_cashbook(group_id, from_date):
+    """Recompute stale cashbook running balances."""
+    from datetime import date, datetime
+    from project.api.cashbook_service import CashbookService
+
+    start = datetime.strptime(from_date, '%Y-%m-%d').date() if from_date else date.min
+    rewritten = CashbookService.rebalance_cashbook(group_id, start)
+    db.session.commit()
+    print(f"✅ Group {group_id}: {rewritten} entries rebalanced")
+
+
+@cli.command('purge_idempotency_keys')
+@click.option('--batch-size', type=int, default=1000, help='Rows deleted per transaction')
+def purge_idempotency_keys(batch_size):
+    """Delete expired idempotency keys."""
+    from project.api.idempotency import purge_expired
+
+    print(f"✅ Purged {purge_expired(batch_size)} expired idempotency keys")
+
+
+@cli.command('run_outbox_dispatcher')
+@click.option('--once', is_flag=True, help='Drain the pending events and exit')
+@click.option('--batch-size', type=int, default=None, help='Events delivered per transaction')
+def run_outbox_dispatcher(once, batch_size):
+    """Deliver queued notifications, calendar events and broadcasts."""
+    import time
+    from project.api.outbox import dispatch_pending
+
+    poll_seconds = app.config.get('OUTBOX_POLL_SECONDS', 1)
+    while True:
+        delivered, failed = dispatch_pending(batch_size)
+        if delivered or failed:
+            print(f"✅ Outbox: {delivered} delivered, {failed} failed")
+        elif once:
+            return
+        else:
+            time.sleep(poll_seconds)
+
+
+@cli.command('reconcile_platform_stats')
+def reconcile_platform_stats():
+    """Recompute the admin dashboard totals in platform_stats."""
+    from project.api.platform_stats import reconcile
+
+    print(f"✅ Reconciled {reconcile()} platform_stats rows")
+
+
+@cli.command('rebuild_calendar')
+@click.option('--chunk-size', type=int, default=None, help='Events inserted per statement (SQLite)')
+def rebuild_calendar(chunk_size):
+    """Recompute every projected calendar event from the source tables."""
+    from project.api.calendar_projection import rebuild
+
+    def progress(reference_type, written):
+        print(f"   {reference_type}: {written} events written")
+
+    print(f"✅ Rebuilt {rebuild(chunk_size, progress)} calendar events")
+
+
+@cli.command('update_rollups')
+@click.option('--backfill', is_flag=True, help='Recompute the selected days from the raw rows')
+@click.option('--start', type=click.DateTime(formats=['%Y-%m-%d']), default=None, help='First day (YYYY-MM-DD)')
+@click.option('--end', type=click.DateTime(formats=['%Y-%m-%d']), default=None, help='Last day (YYYY-MM-DD)')
+@click.option('--group-id', type=int, default=None, help='Only this group')
+def update_rollups(backfill, start, end, group_id):
+    """Fold new cashbook, fine and attendance rows into group_daily_stats."""
+    from project.api import rollups
+
+    if backfill:
+        days = rollups.backfill(
+            start=start.date() if start else None, end=end.date() if end else None,
+            group_id=group_id
+        )
+        print(f"✅ Backfilled {days} group_daily_stats rows")
+    else:
+        print(f"✅ Folded {rollups.catch_up()} new rows into group_daily_stats")
+
+
+@cli.command('run_workers')
+@click.option('--workers', type=int, default=1, help='Worker processes to start')
+@click.option('--once', is_flag=True, help='Exit once no job is due')
+def run_workers(workers, once):
+    """Run background jobs queued in background_jobs."""
+    import multiprocessing
+    import socket
+    from project.api.jobs import work, worker_process
+
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    if workers <= 1:
+        print(f"✅ Processed {work(f'{prefix}-0', once)} jobs")
+        return
+
+    # Each worker builds its own app and connection pool
+    context = multiprocessing.get_context('spawn')
+    processes = [
+        context.Process(target=worker_process, args=(f"{prefix}-{i}", once), daemon=True)
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    print(f"✅ Started {workers} workers")
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+
+@cli.command('enqueue_job')
+@click.argument('name')
+@click.option('--arg', 'args', multiple=True, help='Job argument as key=value (JSON values allowed)')
+def enqueue_job(name, args):
+    """Queue a background job, e.g. enqueue_job loans.update_overdue."""
+    import json
+    from project.api.jobs import enqueue
+
+    kwargs = {}
+    for arg in args:
+        key, _, value = arg.partition('=')
+        try:
+            kwargs[key] = json.loads(value)
+        except ValueError:
+            kwargs[key] = value
+    queued = enqueue(name, kwargs)
+    db.session.commit()
+    print(f"✅ Queued job {queued.id} ({name})")
+
+
 @cli.command()
 def test():
     """Runs the tests without code coverage"""
@@ -0,0 +1,30 @@
+"""Add keyset pagination indexes
+
+Revision ID: b7d2f0c93e14
+Revises: a1c4e7b2d901
+Create Date: 2026-10-17 10:03:12.482913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2f0c93e14'
+down_revision = 'a1c4e7b2d901'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('idx_group_transactions_group_date', 'group_transactions', ['group_id', 'processed_date', 'id'], unique=False)
+    op.create_index('idx_saving_transactions_saving_date', 'saving_transactions', ['member_saving_id', 'processed_date', 'id'], unique=False)
+    op.create_index('idx_cashbook_group_date', 'group_cashbook', ['group_id', 'transaction_date', 'id'], unique=False)
+    op.create_index('idx_notifications_user_date', 'notifications', ['user_id', 'created_date', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('idx_notifications_user_date', table_name='notifications')
+    op.drop_index('idx_cashbook_group_date', table_name='group_cashbook')
+    op.drop_index('idx_saving_transactions_saving_date', table_name='saving_transactions')
+    op.drop_index('idx_group_transactions_group_date', table_name='group_transactions')
@@ -0,0 +1,53 @@
+"""Add platform_stats table
+
+Revision ID: b7e2d5a90c14
+Revises: a4d81f3c6e29
+Create Date: 2026-10-17 18:47:55.602311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2d5a90c14'
+down_revision = 'a4d81f3c6e29'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('platform_stats',
+        sa.Column('state', sa.String(length=50), nullable=False),
+        sa.Column('region', sa.String(length=100), nullable=False),
+        sa.Column('groups_count', sa.Integer(), nullable=False),
+        sa.Column('members_count', sa.Integer(), nullable=False),
+        sa.Column('total_savings', sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.Column('updated_date', sa.DateTime(), nullable=False),
+        sa.Column('reconciled_date', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('state', 'region')
+    )
+
+    # Seed from existing data; writes keep it current from here on
+    op.execute("""
+        INSERT INTO platform_stats (state, region, groups_count, members_count, total_savings,
+                                    updated_date, reconciled_date)
+        SELECT g.state, COALESCE(g.region, ''), COUNT(g.id),
+               COALESCE(SUM(m.members), 0), COALESCE(SUM(s.savings), 0),
+               CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+        FROM savings_groups g
+        LEFT JOIN (
+            SELECT group_id, COUNT(id) AS members
+            FROM group_members WHERE is_active = TRUE GROUP BY group_id
+        ) m ON m.group_id = g.id
+        LEFT JOIN (
+            SELECT gm.group_id, SUM(ms.current_balance) AS savings
+            FROM member_savings ms JOIN group_members gm ON gm.id = ms.member_id
+            GROUP BY gm.group_id
+        ) s ON s.group_id = g.id
+        GROUP BY g.state, COALESCE(g.region, '')
+    """)
+
+
+def downgrade():
+    op.drop_table('platform_stats')
@@ -0,0 +1,37 @@
+"""Add group_cashbook_heads table
+
+Revision ID: c3e8a5d17f62
+Revises: b7d2f0c93e14
+Create Date: 2026-10-17 11:26:47.091335
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e8a5d17f62'
+down_revision = 'b7d2f0c93e14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Heads are seeded lazily from the latest active entry on first append
+    op.create_table('group_cashbook_heads',
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('last_entry_id', sa.Integer(), nullable=True),
+        sa.Column('individual_balance', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('ecd_balance', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('social_balance', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('target_balance', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('total_balance', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('updated_date', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['group_id'], ['savings_groups.id'], ),
+        sa.ForeignKeyConstraint(['last_entry_id'], ['group_cashbook.id'], ),
+        sa.PrimaryKeyConstraint('group_id')
+    )
+
+
+def downgrade():
+    op.drop_table('group_cashbook_heads')
@@ -0,0 +1,56 @@
+"""Add group_daily_stats and processing_watermarks tables
+
+Revision ID: c3f8a1d6e472
+Revises: b7e2d5a90c14
+Create Date: 2026-10-17 20:12:31.418902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f8a1d6e472'
+down_revision = 'b7e2d5a90c14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('processing_watermarks',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('last_id', sa.Integer(), nullable=False),
+        sa.Column('updated_date', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table('group_daily_stats',
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('entries_count', sa.Integer(), nullable=False),
+        sa.Column('deposits', sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.Column('withdrawals', sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.Column('loans_disbursed', sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.Column('loans_repaid', sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.Column('fines_paid', sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.Column('individual_balance', sa.Numeric(precision=15, scale=2), nullable=True),
+        sa.Column('ecd_balance', sa.Numeric(precision=15, scale=2), nullable=True),
+        sa.Column('social_balance', sa.Numeric(precision=15, scale=2), nullable=True),
+        sa.Column('target_balance', sa.Numeric(precision=15, scale=2), nullable=True),
+        sa.Column('total_balance', sa.Numeric(precision=15, scale=2), nullable=True),
+        sa.Column('fines_count', sa.Integer(), nullable=False),
+        sa.Column('fines_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.Column('meetings_held', sa.Integer(), nullable=False),
+        sa.Column('attendance_records', sa.Integer(), nullable=False),
+        sa.Column('attendance_present', sa.Integer(), nullable=False),
+        sa.Column('updated_date', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['group_id'], ['savings_groups.id'], ),
+        sa.PrimaryKeyConstraint('group_id', 'day')
+    )
+    op.create_index('idx_group_daily_stats_day', 'group_daily_stats', ['day'], unique=False)
+    # Filled by `manage.py update_rollups --backfill` once deployed
+
+
+def downgrade():
+    op.drop_index('idx_group_daily_stats_day', table_name='group_daily_stats')
+    op.drop_table('group_daily_stats')
+    op.drop_table('processing_watermarks')
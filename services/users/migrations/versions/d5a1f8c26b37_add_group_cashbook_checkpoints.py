@@ -0,0 +1,44 @@
+"""Add group_cashbook_checkpoints table
+
+Revision ID: d5a1f8c26b37
+Revises: c3e8a5d17f62
+Create Date: 2026-10-17 13:02:18.550914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a1f8c26b37'
+down_revision = 'c3e8a5d17f62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing ledgers are backfilled with `manage.py rebuild_cashbook_checkpoints`;
+    # until then as-of lookups replay the entries after the last checkpoint
+    op.create_table('group_cashbook_checkpoints',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('group_id', sa.Integer(), nullable=False),
+        sa.Column('period', sa.String(length=10), nullable=False),
+        sa.Column('period_end', sa.Date(), nullable=False),
+        sa.Column('last_entry_id', sa.Integer(), nullable=True),
+        sa.Column('last_entry_date', sa.Date(), nullable=False),
+        sa.Column('individual_balance', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('ecd_balance', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('social_balance', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('target_balance', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('total_balance', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('updated_date', sa.DateTime(), nullable=False),
+        sa.CheckConstraint("period IN ('DAY', 'MONTH')", name='check_valid_checkpoint_period'),
+        sa.ForeignKeyConstraint(['group_id'], ['savings_groups.id'], ),
+        sa.ForeignKeyConstraint(['last_entry_id'], ['group_cashbook.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('group_id', 'period', 'period_end', name='unique_cashbook_checkpoint')
+    )
+
+
+def downgrade():
+    op.drop_table('group_cashbook_checkpoints')
@@ -0,0 +1,53 @@
+"""Key projected calendar events by their source row
+
+Revision ID: d9a4e7b2c5f1
+Revises: c3f8a1d6e472
+Create Date: 2026-10-17 21:05:48.227604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9a4e7b2c5f1'
+down_revision = 'c3f8a1d6e472'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Give events generated before the projector their source key
+    for reference_type, column, event_type in (
+        ('transaction', 'related_transaction_id', 'TRANSACTION'),
+        ('loan', 'related_loan_id', 'LOAN'),
+        ('group_campaign', 'related_campaign_id', 'CAMPAIGN'),
+        ('fine', 'related_fine_id', 'FINE'),
+    ):
+        op.execute(f"""
+            UPDATE calendar_events
+            SET reference_type = '{reference_type}', reference_id = CAST({column} AS VARCHAR(100))
+            WHERE event_type = '{event_type}' AND {column} IS NOT NULL
+        """)
+    op.execute("""
+        UPDATE calendar_events
+        SET reference_type = 'meeting',
+            reference_id = CAST(group_id AS VARCHAR(20)) || ':' || CAST(event_date AS VARCHAR(10))
+                           || ':' || meeting_type
+        WHERE event_type = 'MEETING' AND meeting_type IS NOT NULL
+    """)
+    op.execute("""
+        DELETE FROM calendar_events
+        WHERE reference_type IS NOT NULL AND id NOT IN (
+            SELECT keep_id FROM (
+                SELECT MAX(id) AS keep_id FROM calendar_events
+                WHERE reference_type IS NOT NULL
+                GROUP BY reference_type, reference_id
+            ) latest
+        )
+    """)
+    op.create_index('idx_calendar_reference', 'calendar_events', ['reference_type', 'reference_id'], unique=True)
+
+
+def downgrade():
+    op.drop_index('idx_calendar_reference', table_name='calendar_events')
@@ -0,0 +1,44 @@
+"""Copy the group location hierarchy onto calendar events
+
+Revision ID: e6b1c8f3a027
+Revises: d9a4e7b2c5f1
+Create Date: 2026-10-17 22:14:09.518336
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6b1c8f3a027'
+down_revision = 'd9a4e7b2c5f1'
+branch_labels = None
+depends_on = None
+
+LOCATION_COLUMNS = ('region', 'district', 'parish', 'village')
+
+
+def upgrade():
+    for column in LOCATION_COLUMNS:
+        op.add_column('calendar_events', sa.Column(column, sa.String(length=100), nullable=True))
+    op.execute(f"""
+        UPDATE calendar_events
+        SET {', '.join(
+            f'{column} = (SELECT g.{column} FROM savings_groups g WHERE g.id = calendar_events.group_id)'
+            for column in LOCATION_COLUMNS
+        )}
+    """)
+    op.create_index('idx_calendar_region_date', 'calendar_events', ['region', 'event_date'])
+    op.create_index('idx_calendar_district_date', 'calendar_events', ['district', 'event_date'])
+    op.create_index('idx_calendar_parish_date', 'calendar_events', ['parish', 'event_date'])
+    op.create_index('idx_calendar_village_type_date', 'calendar_events',
+                    ['village', 'event_type', 'event_date'])
+
+
+def downgrade():
+    op.drop_index('idx_calendar_village_type_date', table_name='calendar_events')
+    op.drop_index('idx_calendar_parish_date', table_name='calendar_events')
+    op.drop_index('idx_calendar_district_date', table_name='calendar_events')
+    op.drop_index('idx_calendar_region_date', table_name='calendar_events')
+    for column in reversed(LOCATION_COLUMNS):
+        op.drop_column('calendar_events', column)
@@ -0,0 +1,35 @@
+"""Add idempotency_keys table
+
+Revision ID: e9b4c2d7a813
+Revises: d5a1f8c26b37
+Create Date: 2026-10-17 14:21:40.318207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9b4c2d7a813'
+down_revision = 'd5a1f8c26b37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keys already on group_transactions stay there and are still honoured;
+    # new keys are only written here
+    op.create_table('idempotency_keys',
+        sa.Column('scope', sa.String(length=64), nullable=False),
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('response_body', sa.Text(), nullable=False),
+        sa.Column('created_date', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'key')
+    )
+    op.create_index('idx_idempotency_keys_expires', 'idempotency_keys', ['expires_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('idx_idempotency_keys_expires', table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
@@ -0,0 +1,37 @@
+"""Add outbox_events table
+
+Revision ID: f2c7a9e41b05
+Revises: e9b4c2d7a813
+Create Date: 2026-10-17 16:05:12.804519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c7a9e41b05'
+down_revision = 'e9b4c2d7a813'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('outbox_events',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('event_type', sa.String(length=50), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_date', sa.DateTime(), nullable=False),
+        sa.Column('available_at', sa.DateTime(), nullable=False),
+        sa.Column('delivered_date', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_outbox_events_status', 'outbox_events', ['status', 'available_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('idx_outbox_events_status', table_name='outbox_events')
+    op.drop_table('outbox_events')
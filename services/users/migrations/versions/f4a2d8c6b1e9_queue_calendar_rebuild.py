@@ -0,0 +1,46 @@
+"""Queue a calendar rebuild for source rows that predate the projector
+
+Revision ID: f4a2d8c6b1e9
+Revises: e6b1c8f3a027
+Create Date: 2026-10-17 23:41:27.806514
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4a2d8c6b1e9'
+down_revision = 'e6b1c8f3a027'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # d9a4e7b2c5f1 only keyed the events that existed. Transactions, loans,
+    # meetings, campaigns and fines without one are projected by the
+    # calendar.regenerate job, which the workers pick up after deploy.
+    jobs = sa.table(
+        'background_jobs',
+        sa.column('name', sa.String), sa.column('args', sa.Text), sa.column('status', sa.String),
+        sa.column('attempts', sa.Integer), sa.column('max_attempts', sa.Integer),
+        sa.column('run_at', sa.DateTime), sa.column('created_date', sa.DateTime),
+    )
+    queued = sa.select(sa.literal(1)).select_from(jobs).where(
+        jobs.c.name == 'calendar.regenerate', jobs.c.status.in_(('QUEUED', 'RUNNING'))
+    )
+    op.execute(
+        jobs.insert().from_select(
+            ['name', 'args', 'status', 'attempts', 'max_attempts', 'run_at', 'created_date'],
+            sa.select(
+                sa.literal('calendar.regenerate'), sa.literal('{}'), sa.literal('QUEUED'),
+                sa.literal(0), sa.literal(3), sa.func.now(), sa.func.now()
+            ).where(~queued.exists())
+        )
+    )
+
+
+def downgrade():
+    op.execute(
+        "DELETE FROM background_jobs WHERE name = 'calendar.regenerate' AND status = 'QUEUED'"
+    )
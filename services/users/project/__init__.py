@@ -32,7 +32,9 @@ def create_app(script_info=None):
     cors.init_app(app)
     migrate.init_app(app, db)
     bcrypt.init_app(app)
-    socketio.init_app(app, cors_allowed_origins="*")
+    socketio.init_app(
+        app, cors_allowed_origins="*", message_queue=app.config.get('SOCKETIO_MESSAGE_QUEUE')
+    )
 
     # Initialize professional error handling and stability system
     from project.error_handlers import register_error_handlers, setup_logging, create_stability_middleware
@@ -52,6 +54,7 @@ def create_app(script_info=None):
     from project.api.meeting_activities_api import meeting_activities_blueprint
     from project.api.attendance_api import attendance_blueprint
     from project.api.business_rules_api import business_rules_blueprint
+    from project.api.exports import exports_blueprint
 
     app.register_blueprint(users_blueprint)
     app.register_blueprint(auth_blueprint)
@@ -64,6 +67,7 @@ def create_app(script_info=None):
     app.register_blueprint(meeting_activities_blueprint)
     app.register_blueprint(attendance_blueprint)
     app.register_blueprint(business_rules_blueprint)
+    app.register_blueprint(exports_blueprint)
 
     # Initialize Aurora monitoring
     from project.monitoring import init_monitoring
@@ -3,9 +3,12 @@
 from flask import Blueprint, jsonify, request
 from sqlalchemy import exc
 
-from project.api.models import User, Service, ServiceAdmin, UserServicePermission, ServiceAccessRequest
+from project.api.models import User, Service, ServiceAdmin, UserServicePermission, ServiceAccessRequest, BackgroundJob
 from project import db
 from project.api.utils import authenticate, admin_required
+from project.api.principal import get_principal
+from project.api.permission_cache import bump_permission_version
+from project.api.jobs import UnknownJob, enqueue
 
 admin_blueprint = Blueprint('admin', __name__)
 
@@ -16,8 +19,8 @@ def super_admin_required(f):
 
     @wraps(f)
     def decorated_function(user_id, *args, **kwargs):
-        user = User.query.filter_by(id=user_id).first()
-        if not user or not user.is_super_admin:
+        principal = get_principal(user_id)
+        if not principal or not principal.is_super_admin:
             return jsonify({'status': 'fail', 'message': 'Super admin access required.'}), 403
 
         return f(user_id, *args, **kwargs)
@@ -31,17 +34,17 @@ def service_admin_required(service_name=None):
 
         @wraps(f)
         def decorated_function(user_id, *args, **kwargs):
-            user = User.query.filter_by(id=user_id).first()
-            if not user:
+            principal = get_principal(user_id)
+            if not principal:
                 return jsonify({'status': 'fail', 'message': 'User not found.'}), 404
 
             # Super admin has access to everything
-            if user.is_super_admin:
+            if principal.is_super_admin:
                 return f(user_id, *args, **kwargs)
 
             # Check if user is admin of the specific service
             if service_name:
-                if not user.is_service_admin(service_name):
+                if not principal.is_service_admin(service_name):
                     return jsonify({'status': 'fail', 'message': f'Admin access required for {service_name} service.'}), 403
 
             return f(user_id, *args, **kwargs)
@@ -54,12 +57,12 @@ def service_admin_required(service_name=None):
 @authenticate
 def test_admin_auth(user_id):
     """Test admin authentication"""
-    user = User.query.filter_by(id=user_id).first()
+    principal = get_principal(user_id)
     return jsonify({
         'status': 'success',
-        'message': f'Authenticated as user {user.username}',
+        'message': f'Authenticated as user {principal.user.username}',
         'user_id': user_id,
-        'is_super_admin': user.is_super_admin if user else False
+        'is_super_admin': principal.is_super_admin
     }), 200
 
 
@@ -185,6 +188,7 @@ def assign_service_admin(user_id):
         )
 
         db.session.add(service_admin)
+        bump_permission_version()
         db.session.commit()
 
         return jsonify({
@@ -202,14 +206,14 @@ def assign_service_admin(user_id):
 @admin_required
 def get_access_requests(user_id):
     """Get service access requests"""
-    user = User.query.filter_by(id=user_id).first()
+    principal = get_principal(user_id)
 
-    if user.is_super_admin:
+    if principal.is_super_admin:
         # Super admin sees all requests
         requests = ServiceAccessRequest.query.filter_by(status='pending').all()
     else:
         # Service admin sees requests for their services only
-        managed_service_ids = [sa.service_id for sa in user.managed_services]
+        managed_service_ids = [sa.service_id for sa in principal.user.managed_services]
         requests = ServiceAccessRequest.query.filter(
             ServiceAccessRequest.service_id.in_(managed_service_ids),
             ServiceAccessRequest.status == 'pending'
@@ -233,10 +237,10 @@ def approve_access_request(user_id, request_id):
     if not access_request:
         return jsonify({'status': 'fail', 'message': 'Request not found.'}), 404
 
-    user = User.query.filter_by(id=user_id).first()
+    principal = get_principal(user_id)
 
     # Check if user has permission to approve this request
-    if not user.is_super_admin and not user.is_service_admin(access_request.service.name):
+    if not principal.is_service_admin(access_request.service.name):
         return jsonify({'status': 'fail', 'message': 'Permission denied.'}), 403
 
     if access_request.status != 'pending':
@@ -266,6 +270,7 @@ def approve_access_request(user_id, request_id):
         access_request.reviewed_by = user_id
         access_request.reviewed_date = db.func.now()
 
+        bump_permission_version()
         db.session.commit()
 
         return jsonify({
@@ -291,10 +296,10 @@ def reject_access_request(user_id, request_id):
     if not access_request:
         return jsonify({'status': 'fail', 'message': 'Request not found.'}), 404
 
-    user = User.query.filter_by(id=user_id).first()
+    principal = get_principal(user_id)
 
     # Check if user has permission to reject this request
-    if not user.is_super_admin and not user.is_service_admin(access_request.service.name):
+    if not principal.is_service_admin(access_request.service.name):
         return jsonify({'status': 'fail', 'message': 'Permission denied.'}), 403
 
     if access_request.status != 'pending':
@@ -394,3 +399,86 @@ def get_my_requests(user_id):
             'requests': [req.to_json() for req in requests]
         }
     }), 200
+
+
+@admin_blueprint.route('/admin/jobs', methods=['POST'])
+@authenticate
+@super_admin_required
+def enqueue_job(user_id):
+    """Queue a background job, e.g. campaigns.apply_penalties (super admin only)"""
+    post_data = request.get_json(silent=True)
+    if not isinstance(post_data, dict) or not post_data.get('name'):
+        return jsonify({'status': 'fail', 'message': 'Job name is required.'}), 400
+
+    kwargs = post_data.get('args') or {}
+    if not isinstance(kwargs, dict):
+        return jsonify({'status': 'fail', 'message': 'Job args must be an object.'}), 400
+
+    try:
+        job = enqueue(post_data['name'], kwargs, unique=True)
+    except UnknownJob as e:
+        return jsonify({'status': 'fail', 'message': str(e)}), 400
+    db.session.commit()
+
+    return jsonify({
+        'status': 'success',
+        'message': 'Job queued.',
+        'data': {'job': job.to_json()}
+    }), 202
+
+
+@admin_blueprint.route('/admin/jobs/<int:job_id>', methods=['GET'])
+@authenticate
+@super_admin_required
+def get_job(user_id, job_id):
+    """Status, timing and result of a background job (super admin only)"""
+    job = db.session.get(BackgroundJob, job_id)
+    if not job:
+        return jsonify({'status': 'fail', 'message': 'Job not found.'}), 404
+
+    return jsonify({
+        'status': 'success',
+        'data': {'job': job.to_json()}
+    }), 200
+
+
+@admin_blueprint.route('/admin/portfolio', methods=['GET'])
+@authenticate
+@super_admin_required
+def get_portfolio_report(user_id):
+    """Platform-wide breakdown of a measure, e.g.
+    ?measure=savings&by=district,gender&region=Central (super admin only)"""
+    from project.api.portfolio import (
+        FACT_DIMENSIONS, GROUP_DIMENSIONS, MEMBER_DIMENSIONS, MEASURES, get_snapshot
+    )
+
+    measure = request.args.get('measure', 'savings')
+    if measure not in MEASURES:
+        return jsonify({
+            'status': 'fail', 'message': f"measure must be one of: {', '.join(sorted(MEASURES))}."
+        }), 400
+    by = [name for name in request.args.get('by', '').split(',') if name]
+
+    where = {}
+    for name in GROUP_DIMENSIONS + MEMBER_DIMENSIONS + FACT_DIMENSIONS:
+        values = [value for arg in request.args.getlist(name) for value in arg.split(',')]
+        if name == 'is_active':
+            values = [value.lower() == 'true' for value in values]
+        if values:
+            where[name] = values
+
+    snapshot = get_snapshot(refresh=request.args.get('refresh') == 'true')
+    try:
+        rows = snapshot.report(measure, by=by, where=where)
+    except ValueError as e:
+        return jsonify({'status': 'fail', 'message': str(e)}), 400
+
+    return jsonify({
+        'status': 'success',
+        'data': {
+            'measure': measure,
+            'by': by,
+            'rows': rows,
+            'snapshot_loaded': snapshot.loaded_at.isoformat()
+        }
+    }), 200
@@ -5,8 +5,10 @@ from flask import Blueprint, jsonify, request
 from sqlalchemy import exc, or_
 
 from project.api.models import User
-from project import db, bcrypt
+from project import db
 from project.api.utils import authenticate
+from project.api.hashing import HashingOverloaded, hash_password, check_password
+from project.api.principal import get_principal
 
 
 auth_blueprint = Blueprint('auth', __name__)
@@ -30,11 +32,11 @@ def register_user():
         user = User.query.filter(
             or_(User.username == username, User.email == email)).first()
         if not user:
-            # add new user to db
+            # add new user to db; bcrypt runs in the hashing pool
             new_user = User(
                 username=username,
                 email=email,
-                password=password
+                password_hash=hash_password(password)
             )
             db.session.add(new_user)
             db.session.commit()
@@ -49,6 +51,9 @@ def register_user():
             response_object['message'] = 'Sorry. That user already exists.'
             return jsonify(response_object), 400
     # handler errors
+    except HashingOverloaded:
+        response_object['message'] = 'Server busy. Please try again shortly.'
+        return jsonify(response_object), 503
     except (exc.IntegrityError, ValueError):
         db.session.rollback()
         return jsonify(response_object), 400
@@ -69,7 +74,7 @@ def login_user():
     try:
         # fetch the user data
         user = User.query.filter_by(email=email).first()
-        if user and bcrypt.check_password_hash(user.password, password):
+        if user and check_password(user.password, password):
             auth_token = user.encode_auth_token(user.id)
             if auth_token:
                 response_object['status'] = 'success'
@@ -80,6 +85,9 @@ def login_user():
         else:
             response_object['message'] = 'Invalid email or password.'
             return jsonify(response_object), 401
+    except HashingOverloaded:
+        response_object['message'] = 'Server busy. Please try again shortly.'
+        return jsonify(response_object), 503
     except Exception as e:
         print(f"Login error: {e}")  # Debug logging
         response_object['message'] = 'Try again.'
@@ -99,7 +107,7 @@ def logout_user(resp):
 @auth_blueprint.route('/auth/status', methods=['GET'])
 @authenticate
 def get_user_status(resp):
-    user = User.query.filter_by(id=resp).first()
+    user = get_principal(resp).user
     response_object = {
         'status': 'success',
         'message': 'success',
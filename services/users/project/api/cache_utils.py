@@ -0,0 +1,133 @@
+# services/users/project/api/cache_utils.py
+
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from project import db
+from project.api.models import CacheVersion
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU map whose entries also expire after a TTL.
+
+    Used for small per-process caches (permission matrices, tokens, ...).
+    Each entry may carry its own expiry; otherwise the cache-wide ttl applies.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60, timer=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                return default
+            value, expires_at = item
+            if expires_at <= self._timer():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = self._timer() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._data.pop(key, _MISSING)
+        return default if item is _MISSING else item[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def get_app_cache(name, maxsize, ttl):
+    """Return the named TTLCache of the current app, creating it on first use.
+
+    Caches live in app.extensions so each app instance (and each test) gets
+    its own.
+    """
+    caches = current_app.extensions.setdefault('ttl_caches', {})
+    cache = caches.get(name)
+    if cache is None:
+        cache = caches.setdefault(name, TTLCache(maxsize=maxsize, ttl=ttl))
+    return cache
+
+
+# Cross-worker invalidation -------------------------------------------------
+
+def _version_state():
+    return current_app.extensions.setdefault('cache_versions', {})
+
+
+def current_version(name):
+    """Current value of a cache_versions counter.
+
+    The database is consulted at most every CACHE_VERSION_POLL_SECONDS, so
+    other workers pick up a bump within that window; bumps committed by this
+    worker are seen on the next call.
+    """
+    state = _version_state()
+    now = time.monotonic()
+    cached = state.get(name)
+    poll_seconds = current_app.config.get('CACHE_VERSION_POLL_SECONDS', 5)
+    if cached is not None and now - cached[1] < poll_seconds:
+        return cached[0]
+
+    version = db.session.query(CacheVersion.version).filter(
+        CacheVersion.name == name
+    ).scalar() or 0
+    state[name] = (version, now)
+    return version
+
+
+def bump_version(name, session=None):
+    """Increment a cache_versions counter as part of the current transaction.
+
+    The caller commits; once it does, this worker drops its polled value and
+    the other workers see the new version on their next poll. Uses Core
+    statements, so it may also be called from flush hooks with their session.
+    """
+    session = session or db.session
+    versions = CacheVersion.__table__
+    updated = session.execute(
+        versions.update().where(versions.c.name == name).values(version=versions.c.version + 1)
+    ).rowcount
+    if not updated:
+        session.execute(versions.insert().values(name=name, version=1))
+    session.info.setdefault('bumped_cache_versions', set()).add(name)
+
+
+@event.listens_for(Session, 'after_commit')
+def _forget_bumped_versions(session):
+    names = session.info.pop('bumped_cache_versions', None)
+    if names and has_app_context():
+        state = _version_state()
+        for name in names:
+            state.pop(name, None)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_bumped_versions(session):
+    session.info.pop('bumped_cache_versions', None)
@@ -1,6 +1,6 @@
 # services/users/project/api/calendar.py
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from sqlalchemy import and_, or_, func, desc
 from datetime import datetime, date, timedelta
 from decimal import Decimal
@@ -8,139 +8,29 @@ from decimal import Decimal
 from project import db
 from project.api.models import (
     CalendarEvent, SavingsGroup, GroupMember, GroupTransaction,
-    MemberSaving, SavingType, User, MeetingAttendance, GroupLoan,
+    MemberSaving, SavingType, MeetingAttendance,
     MemberFine, GroupCashbook, TargetSavingsCampaign, GroupTargetCampaign
 )
 from project.api.utils import authenticate, admin_required
+from project.api.principal import get_principal
+from project.api.cache_utils import get_app_cache
+from project.api.group_directory import get_group_directory
+from project.api import calendar_projection
+from project.api.fieldsets import FieldsetError, parse_fieldset, serialize_with
+from project.api.pagination import (
+    CursorError, keyset_page, wants_cursor, wants_total, cursor_pagination
+)
 
 calendar_blueprint = Blueprint('calendar', __name__)
 
 
 def generate_calendar_events_from_real_data():
-    """Generate calendar events from existing savings transactions, meetings, loans, etc."""
-
-
-
-    # Clear existing calendar events
-    CalendarEvent.query.delete()
-
-    # 1. Generate events from group transactions
-    transactions = GroupTransaction.query.all()
-    for transaction in transactions:
-        if transaction.member:
-            member = transaction.member
-            event = CalendarEvent(
-                title=f"{member.name} - {transaction.type}",
-                description=f"{transaction.type} of {transaction.amount} UGX by {member.name}",
-                event_type='TRANSACTION',
-                event_date=transaction.processed_date.date(),
-                group_id=transaction.group_id,
-                user_id=member.user_id,
-                amount=abs(transaction.amount),  # Use absolute value for display
-                member_gender=member.gender,
-                member_role=member.role,
-                verification_status='VERIFIED',
-                related_transaction_id=transaction.id,
-                location=member.group.village if member.group.village else member.group.parish
-            )
-            db.session.add(event)
-
-    # 2. Generate events from meeting attendance
-    meetings = db.session.query(MeetingAttendance.group_id, MeetingAttendance.meeting_date, MeetingAttendance.meeting_type)\
-                       .distinct().all()
+    """Rebuild every calendar event from savings transactions, meetings, loans, etc.
 
-    for group_id, meeting_date, meeting_type in meetings:
-        group = SavingsGroup.query.get(group_id)
-        if group:
-            # Count attendees
-            attendees = MeetingAttendance.query.filter_by(
-                group_id=group_id,
-                meeting_date=meeting_date,
-                attended=True
-            ).count()
-
-            total_members = GroupMember.query.filter_by(group_id=group_id, is_active=True).count()
-
-            event = CalendarEvent(
-                title=f"{group.name} - {meeting_type} Meeting",
-                description=f"{meeting_type} meeting with {attendees}/{total_members} members present",
-                event_type='MEETING',
-                event_date=meeting_date,
-                group_id=group_id,
-                verification_status='VERIFIED',
-                location=group.village if group.village else group.parish,
-                meeting_type=meeting_type,
-                attendees_count=attendees,
-                total_members=total_members
-            )
-            db.session.add(event)
-
-    # 3. Generate events from loans
-    loans = GroupLoan.query.all()
-    for loan in loans:
-        if loan.requester:
-            member = loan.requester
-            event = CalendarEvent(
-                title=f"{member.name} - Loan {loan.status}",
-                description=f"Loan of {loan.principal} UGX - {loan.status}",
-                event_type='LOAN',
-                event_date=loan.request_date.date(),
-                group_id=loan.group_id,
-                user_id=member.user_id,
-                amount=loan.principal,
-                member_gender=member.gender,
-                member_role=member.role,
-                verification_status='VERIFIED' if loan.status == 'APPROVED' else 'PENDING',
-                related_loan_id=loan.id,
-                location=member.group.village if member.group.village else member.group.parish
-            )
-            db.session.add(event)
-
-    # 4. Generate events from target campaigns
-    group_campaigns = GroupTargetCampaign.query.filter_by(status='ACTIVE').all()
-    for group_campaign in group_campaigns:
-        if group_campaign.group and group_campaign.campaign:
-            event = CalendarEvent(
-                title=f"{group_campaign.group.name} - {group_campaign.campaign.name}",
-                description=f"Target campaign: {group_campaign.campaign.description}",
-                event_type='CAMPAIGN',
-                event_date=group_campaign.decision_date.date() if group_campaign.decision_date else group_campaign.campaign.start_date,
-                group_id=group_campaign.group_id,
-                amount=group_campaign.get_effective_target_amount(),
-                verification_status='VERIFIED',
-                related_campaign_id=group_campaign.id,
-                location=group_campaign.group.village if group_campaign.group.village else group_campaign.group.parish
-            )
-            db.session.add(event)
-
-    # 5. Generate events from fines
-    fines = MemberFine.query.all()
-    for fine in fines:
-        member = GroupMember.query.get(fine.member_id)
-        if member and member.group:
-            event = CalendarEvent(
-                title=f"{member.name} - Fine {fine.status}",
-                description=f"Fine: {fine.reason} - Amount: {fine.amount} UGX",
-                event_type='FINE',
-                event_date=fine.imposed_date.date(),
-                group_id=member.group_id,
-                user_id=member.user_id,
-                amount=fine.amount,
-                member_gender=member.gender,
-                member_role=member.role,
-                verification_status='VERIFIED' if fine.status == 'PAID' else 'PENDING',
-                related_fine_id=fine.id,
-                location=member.group.village if member.group.village else member.group.parish
-            )
-            db.session.add(event)
-
-    try:
-        db.session.commit()
-        event_count = CalendarEvent.query.count()
-        return event_count
-    except Exception as e:
-        db.session.rollback()
-        raise
+    Writes keep calendar_events current as they flush (see
+    calendar_projection); this full rebuild is for recovery.
+    """
+    return calendar_projection.rebuild()
 
 
 class FilterProcessor:
@@ -228,22 +118,15 @@ class FilterProcessor:
     
     def apply_geographic_filters(self, query):
         """Apply geographic filtering (region, district, parish, village)"""
-        if self.args.get('region') and self.args.get('region') != 'ALL':
-            query = query.join(SavingsGroup).filter(SavingsGroup.region == self.args.get('region'))
-            self.applied_filters.append(f"Region: {self.args.get('region')}")
-        
-        if self.args.get('district') and self.args.get('district') != 'ALL':
-            query = query.join(SavingsGroup).filter(SavingsGroup.district == self.args.get('district'))
-            self.applied_filters.append(f"District: {self.args.get('district')}")
-        
-        if self.args.get('parish') and self.args.get('parish') != 'ALL':
-            query = query.join(SavingsGroup).filter(SavingsGroup.parish == self.args.get('parish'))
-            self.applied_filters.append(f"Parish: {self.args.get('parish')}")
-        
-        if self.args.get('village') and self.args.get('village') != 'ALL':
-            query = query.join(SavingsGroup).filter(SavingsGroup.village == self.args.get('village'))
-            self.applied_filters.append(f"Village: {self.args.get('village')}")
-        
+        for name, column in (
+            ('region', CalendarEvent.region), ('district', CalendarEvent.district),
+            ('parish', CalendarEvent.parish), ('village', CalendarEvent.village),
+        ):
+            value = self.args.get(name)
+            if value and value != 'ALL':
+                query = query.filter(column == value)
+                self.applied_filters.append(f"{name.title()}: {value}")
+
         return query
     
     def apply_demographic_filters(self, query):
@@ -332,36 +215,62 @@ class FilterProcessor:
 def get_filtered_calendar_events(user_id):
     """
     Get calendar events with comprehensive filtering support
-    Generates events from real data if calendar events table is empty
     """
-
-    # Check if we need to generate calendar events from real data
-    event_count = CalendarEvent.query.count()
-    if event_count == 0:
-        generate_calendar_events_from_real_data()
+    try:
+        fieldset = parse_fieldset('calendar_event')
+    except FieldsetError as e:
+        return jsonify({'status': 'fail', 'message': str(e)}), 400
 
     # Base query
     query = CalendarEvent.query
 
     # Apply role-based filtering
-    user = User.query.get(user_id)
-    if not user.is_super_admin and user.role != 'service_admin':
+    principal = get_principal(user_id)
+    scope = 'all'
+    if not principal.is_super_admin and principal.role != 'service_admin':
         # Regular users can only see events from their groups
         user_groups = db.session.query(GroupMember.group_id).filter_by(user_id=user_id).subquery()
         query = query.filter(CalendarEvent.group_id.in_(user_groups))
+        scope = user_id
 
     # Apply filters
     filters = FilterProcessor(request.args)
     query = filters.apply_all(query)
+    summary = generate_filter_summary(
+        query, filters.get_applied_filters(), cache_key=summary_cache_key(scope, request.args)
+    )
 
     # Order by date (most recent first)
     query = query.order_by(desc(CalendarEvent.event_date), desc(CalendarEvent.created_date))
+    if fieldset:
+        # Keyset pagination reads event_date
+        query = fieldset.apply(query, 'event_date')
 
     # Pagination
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 50, type=int)
     per_page = min(per_page, 100)  # Limit to 100 items per page
 
+    if wants_cursor(request.args):
+        try:
+            keyset = keyset_page(
+                query, CalendarEvent.event_date, CalendarEvent.id,
+                cursor=request.args.get('cursor'), limit=per_page,
+                include_total=wants_total(request.args)
+            )
+        except CursorError as e:
+            return jsonify({'status': 'fail', 'message': str(e)}), 400
+        response = {
+            'events': serialize_with(fieldset, keyset.items),
+            'filters_applied': filters.get_applied_filters(),
+            'per_page': per_page,
+            'pagination': cursor_pagination(keyset, per_page),
+            'summary': summary
+        }
+        if keyset.total is not None:
+            response['total_count'] = keyset.total
+        return jsonify(response)
+
     paginated_events = query.paginate(
         page=page,
         per_page=per_page,
@@ -370,11 +279,8 @@ def get_filtered_calendar_events(user_id):
 
     events = paginated_events.items
 
-    # Generate summary statistics
-    summary = generate_filter_summary(events, filters.get_applied_filters())
-
     return jsonify({
-        'events': [event.to_json() for event in events],
+        'events': serialize_with(fieldset, events),
         'filters_applied': filters.get_applied_filters(),
         'total_count': paginated_events.total,
         'page': page,
@@ -395,8 +301,8 @@ def get_calendar_event_details(user_id, event_id):
         event = CalendarEvent.query.get_or_404(event_id)
 
         # Check access permissions
-        user = User.query.get(user_id)
-        if not user.is_super_admin and user.role != 'service_admin':
+        principal = get_principal(user_id)
+        if not principal.is_super_admin and principal.role != 'service_admin':
             # Check if user is member of the event's group
             member = GroupMember.query.filter_by(user_id=user_id, group_id=event.group_id).first()
             if not member:
@@ -598,7 +504,7 @@ def get_calendar_event_details(user_id, event_id):
 def get_filter_options(user_id):
     """Get available filter options based on user's access level"""
     
-    user = User.query.get(user_id)
+    principal = get_principal(user_id)
     
     # Base filter options
     options = {
@@ -642,76 +548,81 @@ def get_filter_options(user_id):
         ]
     }
     
-    # Add geographic options based on access level
-    if user.is_super_admin or user.role == 'service_admin':
-        # Get all available geographic options
-        regions = db.session.query(SavingsGroup.region).distinct().all()
-        districts = db.session.query(SavingsGroup.district).distinct().all()
-        parishes = db.session.query(SavingsGroup.parish).distinct().all()
-        villages = db.session.query(SavingsGroup.village).distinct().all()
-        
-        options['regions'] = [{'value': r[0], 'label': r[0]} for r in regions if r[0]]
-        options['districts'] = [{'value': d[0], 'label': d[0]} for d in districts if d[0]]
-        options['parishes'] = [{'value': p[0], 'label': p[0]} for p in parishes if p[0]]
-        options['villages'] = [{'value': v[0], 'label': v[0]} for v in villages if v[0]]
-        
-        # Get all groups
-        groups = SavingsGroup.query.all()
-        options['groups'] = [{'value': g.id, 'label': g.name} for g in groups]
-    
+    # Geographic and group options, from the in-memory group directory
+    directory = get_group_directory()
+    if principal.is_super_admin or principal.role == 'service_admin':
+        options.update(directory.filter_options())
     else:
         # Regular users only see their groups
-        user_groups = db.session.query(SavingsGroup).join(
-            GroupMember, SavingsGroup.id == GroupMember.group_id
-        ).filter(
-            GroupMember.user_id == user_id
-        ).all()
-        
-        options['groups'] = [{'value': g.id, 'label': g.name} for g in user_groups]
-        
-        # Geographic options based on user's groups
-        if user_groups:
-            regions = list(set(g.region for g in user_groups if g.region))
-            districts = list(set(g.district for g in user_groups if g.district))
-            parishes = list(set(g.parish for g in user_groups if g.parish))
-            villages = list(set(g.village for g in user_groups if g.village))
-            
-            options['regions'] = [{'value': r, 'label': r} for r in regions]
-            options['districts'] = [{'value': d, 'label': d} for d in districts]
-            options['parishes'] = [{'value': p, 'label': p} for p in parishes]
-            options['villages'] = [{'value': v, 'label': v} for v in villages]
+        options.update(directory.filter_options(principal.group_ids))
     
     return jsonify(options)
 
 
-def generate_filter_summary(events, applied_filters):
-    """Generate summary statistics for filtered events"""
-    if not events:
-        return {
-            'total_events': 0,
-            'total_amount': 0,
-            'event_type_breakdown': {},
-            'fund_type_breakdown': {},
-            'applied_filters': applied_filters
-        }
-    
-    total_amount = sum(float(event.amount) for event in events if event.amount)
-    
-    # Event type breakdown
+# Request parameters that page through a result rather than filter it
+SUMMARY_IGNORED_ARGS = ('page', 'per_page', 'cursor', 'fields', 'include_total')
+
+
+def summary_cache_key(scope, args):
+    """Cache key of the summary of the events scope (a user id, or 'all')
+    may see under the given filter arguments.
+
+    Equivalent filters share a key: parameter order, empty and 'ALL'
+    values and the order of comma-separated lists do not matter. Today's
+    date is part of the key because time_period filters depend on it.
+    """
+    filters = []
+    for name in sorted(args):
+        if name in SUMMARY_IGNORED_ARGS:
+            continue
+        value = args.get(name)
+        if not value or value == 'ALL':
+            continue
+        if ',' in value:
+            value = ','.join(sorted(part.strip() for part in value.split(',')))
+        filters.append((name, value))
+    return (scope, date.today().isoformat(), tuple(filters))
+
+
+def generate_filter_summary(query, applied_filters, cache_key=None):
+    """Summary statistics over every event the filtered query matches.
+
+    One GROUP BY event_type, fund_type query; the totals and both
+    breakdowns are summed from its few rows. Cached under cache_key for
+    CALENDAR_SUMMARY_CACHE_TTL seconds.
+    """
+    cache = get_app_cache(
+        'calendar_summary',
+        maxsize=current_app.config.get('CALENDAR_SUMMARY_CACHE_SIZE', 2000),
+        ttl=current_app.config.get('CALENDAR_SUMMARY_CACHE_TTL', 30)
+    )
+    if cache_key is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return dict(cached, applied_filters=applied_filters)
+
+    rows = query.order_by(None).with_entities(
+        CalendarEvent.event_type, CalendarEvent.fund_type,
+        func.count(CalendarEvent.id), func.sum(CalendarEvent.amount)
+    ).group_by(CalendarEvent.event_type, CalendarEvent.fund_type).all()
+
+    total_events = 0
+    total_amount = 0
     event_type_breakdown = {}
-    for event in events:
-        event_type_breakdown[event.event_type] = event_type_breakdown.get(event.event_type, 0) + 1
-    
-    # Fund type breakdown
     fund_type_breakdown = {}
-    for event in events:
-        if event.fund_type:
-            fund_type_breakdown[event.fund_type] = fund_type_breakdown.get(event.fund_type, 0) + 1
-    
-    return {
-        'total_events': len(events),
+    for event_type, fund_type, count, amount in rows:
+        total_events += count
+        total_amount += float(amount or 0)
+        event_type_breakdown[event_type] = event_type_breakdown.get(event_type, 0) + count
+        if fund_type:
+            fund_type_breakdown[fund_type] = fund_type_breakdown.get(fund_type, 0) + count
+
+    summary = {
+        'total_events': total_events,
         'total_amount': total_amount,
         'event_type_breakdown': event_type_breakdown,
         'fund_type_breakdown': fund_type_breakdown,
-        'applied_filters': applied_filters
-    }
\ No newline at end of file
+    }
+    if cache_key is not None:
+        cache.set(cache_key, summary)
+    return dict(summary, applied_filters=applied_filters)
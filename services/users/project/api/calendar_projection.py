@@ -0,0 +1,474 @@
+# services/users/project/api/calendar_projection.py
+
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import Date, String, case, cast, event, func, inspect, literal, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from project import db
+from project.api.models import (
+    CalendarEvent, SavingsGroup, GroupMember, GroupTransaction, MeetingAttendance, GroupLoan,
+    MemberFine, TargetSavingsCampaign, GroupTargetCampaign
+)
+
+
+# calendar_events rows are keyed by (reference_type, reference_id); each
+# source row (a meeting: group, date and type) projects to at most one.
+TRANSACTION = 'transaction'
+MEETING = 'meeting'
+LOAN = 'loan'
+CAMPAIGN = 'group_campaign'
+FINE = 'fine'
+
+PROJECTED_COLUMNS = (
+    'title', 'description', 'event_type', 'event_date', 'group_id', 'user_id', 'amount',
+    'member_gender', 'member_role', 'verification_status', 'location', 'meeting_type',
+    'attendees_count', 'total_members', 'related_transaction_id', 'related_loan_id',
+    'related_campaign_id', 'related_fine_id', 'region', 'district', 'parish', 'village',
+)
+
+# Copied from the event's group so location filters need no join
+LOCATION_COLUMNS = ('region', 'district', 'parish', 'village')
+
+
+def _group_location(group):
+    return dict(
+        region=group.region, district=group.district, parish=group.parish, village=group.village,
+        location=group.village if group.village else group.parish
+    )
+
+
+_GROUP_LOCATION = tuple(getattr(SavingsGroup, name) for name in LOCATION_COLUMNS)
+
+
+def _member_event(row, **fields):
+    return dict(
+        fields, group_id=row.group_id, user_id=row.user_id, member_gender=row.gender,
+        member_role=row.role, **_group_location(row)
+    )
+
+
+def _transactions(session, keys):
+    t = GroupTransaction
+    stmt = select(
+        t.id, t.type, t.amount, t.processed_date, t.group_id, GroupMember.name,
+        GroupMember.user_id, GroupMember.gender, GroupMember.role, *_GROUP_LOCATION
+    ).join(GroupMember, GroupMember.id == t.member_id).join(SavingsGroup, SavingsGroup.id == t.group_id)
+    if keys is not None:
+        stmt = stmt.where(t.id.in_([int(key) for key in keys]))
+    for row in session.execute(stmt):
+        yield str(row.id), _member_event(
+            row,
+            title=f"{row.name} - {row.type}",
+            description=f"{row.type} of {row.amount} UGX by {row.name}",
+            event_type='TRANSACTION',
+            event_date=row.processed_date.date(),
+            amount=abs(row.amount),
+            verification_status='VERIFIED',
+            related_transaction_id=row.id
+        )
+
+
+def _meeting_key(group_id, meeting_date, meeting_type):
+    return f"{group_id}:{meeting_date.isoformat()}:{meeting_type}"
+
+
+def _active_members(group_id):
+    return select(func.count(GroupMember.id)).where(
+        GroupMember.group_id == group_id, GroupMember.is_active.is_(True)
+    ).scalar_subquery()
+
+
+def _meetings(session, keys):
+    a = MeetingAttendance
+    stmt = select(
+        a.group_id, a.meeting_date, a.meeting_type,
+        func.count(a.id).filter(a.attended.is_(True)).label('attendees'),
+        SavingsGroup.name, *_GROUP_LOCATION, _active_members(a.group_id).label('total_members')
+    ).join(SavingsGroup, SavingsGroup.id == a.group_id).group_by(
+        a.group_id, a.meeting_date, a.meeting_type, SavingsGroup.name, *_GROUP_LOCATION
+    )
+    if keys is not None:
+        stmt = stmt.where(tuple_(a.group_id, a.meeting_date, a.meeting_type).in_(list(keys.values())))
+    for row in session.execute(stmt):
+        yield _meeting_key(row.group_id, row.meeting_date, row.meeting_type), dict(
+            title=f"{row.name} - {row.meeting_type} Meeting",
+            description=f"{row.meeting_type} meeting with {row.attendees}/{row.total_members} members present",
+            event_type='MEETING',
+            event_date=row.meeting_date,
+            group_id=row.group_id,
+            verification_status='VERIFIED',
+            meeting_type=row.meeting_type,
+            attendees_count=row.attendees,
+            total_members=row.total_members,
+            **_group_location(row)
+        )
+
+
+def _loans(session, keys):
+    loan = GroupLoan
+    stmt = select(
+        loan.id, loan.status, loan.principal, loan.request_date, loan.group_id, GroupMember.name,
+        GroupMember.user_id, GroupMember.gender, GroupMember.role, *_GROUP_LOCATION
+    ).join(GroupMember, GroupMember.id == loan.requested_by) \
+        .join(SavingsGroup, SavingsGroup.id == GroupMember.group_id)
+    if keys is not None:
+        stmt = stmt.where(loan.id.in_([int(key) for key in keys]))
+    for row in session.execute(stmt):
+        yield str(row.id), _member_event(
+            row,
+            title=f"{row.name} - Loan {row.status}",
+            description=f"Loan of {row.principal} UGX - {row.status}",
+            event_type='LOAN',
+            event_date=row.request_date.date(),
+            amount=row.principal,
+            verification_status='VERIFIED' if row.status == 'APPROVED' else 'PENDING',
+            related_loan_id=row.id
+        )
+
+
+def _campaigns(session, keys):
+    gc, campaign = GroupTargetCampaign, TargetSavingsCampaign
+    stmt = select(
+        gc.id, gc.group_id, gc.decision_date, gc.group_target_amount, campaign.name.label('campaign'),
+        campaign.description, campaign.start_date, campaign.target_amount, SavingsGroup.name,
+        *_GROUP_LOCATION
+    ).join(campaign, campaign.id == gc.campaign_id).join(SavingsGroup, SavingsGroup.id == gc.group_id) \
+        .where(gc.status == 'ACTIVE')
+    if keys is not None:
+        stmt = stmt.where(gc.id.in_([int(key) for key in keys]))
+    for row in session.execute(stmt):
+        yield str(row.id), dict(
+            title=f"{row.name} - {row.campaign}",
+            description=f"Target campaign: {row.description}",
+            event_type='CAMPAIGN',
+            event_date=row.decision_date.date() if row.decision_date else row.start_date,
+            group_id=row.group_id,
+            amount=row.group_target_amount or row.target_amount,
+            verification_status='VERIFIED',
+            related_campaign_id=row.id,
+            **_group_location(row)
+        )
+
+
+def _fines(session, keys):
+    fine = MemberFine
+    stmt = select(
+        fine.id, fine.status, fine.reason, fine.amount, fine.imposed_date, GroupMember.group_id,
+        GroupMember.name, GroupMember.user_id, GroupMember.gender, GroupMember.role, *_GROUP_LOCATION
+    ).join(GroupMember, GroupMember.id == fine.member_id) \
+        .join(SavingsGroup, SavingsGroup.id == GroupMember.group_id)
+    if keys is not None:
+        stmt = stmt.where(fine.id.in_([int(key) for key in keys]))
+    for row in session.execute(stmt):
+        yield str(row.id), _member_event(
+            row,
+            title=f"{row.name} - Fine {row.status}",
+            description=f"Fine: {row.reason} - Amount: {row.amount} UGX",
+            event_type='FINE',
+            event_date=row.imposed_date.date(),
+            amount=row.amount,
+            verification_status='VERIFIED' if row.status == 'PAID' else 'PENDING',
+            related_fine_id=row.id
+        )
+
+
+# reference_type -> generator of (reference_id, event columns) for the
+# given reference ids (None: every source row)
+PROJECTIONS = {
+    TRANSACTION: _transactions,
+    MEETING: _meetings,
+    LOAN: _loans,
+    CAMPAIGN: _campaigns,
+    FINE: _fines,
+}
+
+
+def _text(column):
+    return cast(column, String)
+
+
+def _sql_group_location():
+    return dict(
+        {name: getattr(SavingsGroup, name) for name in LOCATION_COLUMNS},
+        location=func.coalesce(func.nullif(SavingsGroup.village, ''), SavingsGroup.parish)
+    )
+
+
+def _sql_member_event(**columns):
+    return dict(
+        columns, user_id=GroupMember.user_id, member_gender=GroupMember.gender,
+        member_role=GroupMember.role, **_sql_group_location()
+    )
+
+
+def _bulk_transactions():
+    t = GroupTransaction
+    return _sql_member_event(
+        reference_id=_text(t.id),
+        title=GroupMember.name + ' - ' + t.type,
+        description=t.type + ' of ' + _text(t.amount) + ' UGX by ' + GroupMember.name,
+        event_type=literal('TRANSACTION'),
+        event_date=cast(t.processed_date, Date),
+        group_id=t.group_id,
+        amount=func.abs(t.amount),
+        verification_status=literal('VERIFIED'),
+        related_transaction_id=t.id
+    ), lambda stmt: stmt.select_from(t).join(GroupMember, GroupMember.id == t.member_id) \
+        .join(SavingsGroup, SavingsGroup.id == t.group_id)
+
+
+def _bulk_meetings():
+    a = MeetingAttendance
+    total = _active_members(a.group_id)
+    attendees = func.count(a.id).filter(a.attended.is_(True))
+    return dict(
+        reference_id=_text(a.group_id) + ':' + _text(a.meeting_date) + ':' + a.meeting_type,
+        title=SavingsGroup.name + ' - ' + a.meeting_type + ' Meeting',
+        description=a.meeting_type + ' meeting with ' + _text(attendees) + '/' + _text(total)
+        + ' members present',
+        event_type=literal('MEETING'),
+        event_date=a.meeting_date,
+        group_id=a.group_id,
+        verification_status=literal('VERIFIED'),
+        meeting_type=a.meeting_type,
+        attendees_count=attendees,
+        total_members=total,
+        **_sql_group_location()
+    ), lambda stmt: stmt.select_from(a).join(SavingsGroup, SavingsGroup.id == a.group_id).group_by(
+        a.group_id, a.meeting_date, a.meeting_type, SavingsGroup.name, *_GROUP_LOCATION
+    )
+
+
+def _bulk_loans():
+    loan = GroupLoan
+    return _sql_member_event(
+        reference_id=_text(loan.id),
+        title=GroupMember.name + ' - Loan ' + loan.status,
+        description='Loan of ' + _text(loan.principal) + ' UGX - ' + loan.status,
+        event_type=literal('LOAN'),
+        event_date=cast(loan.request_date, Date),
+        group_id=loan.group_id,
+        amount=loan.principal,
+        verification_status=case((loan.status == 'APPROVED', 'VERIFIED'), else_='PENDING'),
+        related_loan_id=loan.id
+    ), lambda stmt: stmt.select_from(loan).join(GroupMember, GroupMember.id == loan.requested_by) \
+        .join(SavingsGroup, SavingsGroup.id == GroupMember.group_id)
+
+
+def _bulk_campaigns():
+    gc, campaign = GroupTargetCampaign, TargetSavingsCampaign
+    return dict(
+        reference_id=_text(gc.id),
+        title=SavingsGroup.name + ' - ' + campaign.name,
+        description='Target campaign: ' + func.coalesce(campaign.description, 'None'),
+        event_type=literal('CAMPAIGN'),
+        event_date=func.coalesce(cast(gc.decision_date, Date), campaign.start_date),
+        group_id=gc.group_id,
+        amount=func.coalesce(func.nullif(gc.group_target_amount, 0), campaign.target_amount),
+        verification_status=literal('VERIFIED'),
+        related_campaign_id=gc.id,
+        **_sql_group_location()
+    ), lambda stmt: stmt.select_from(gc).join(campaign, campaign.id == gc.campaign_id) \
+        .join(SavingsGroup, SavingsGroup.id == gc.group_id).where(gc.status == 'ACTIVE')
+
+
+def _bulk_fines():
+    fine = MemberFine
+    return _sql_member_event(
+        reference_id=_text(fine.id),
+        title=GroupMember.name + ' - Fine ' + fine.status,
+        description='Fine: ' + fine.reason + ' - Amount: ' + _text(fine.amount) + ' UGX',
+        event_type=literal('FINE'),
+        event_date=cast(fine.imposed_date, Date),
+        group_id=GroupMember.group_id,
+        amount=fine.amount,
+        verification_status=case((fine.status == 'PAID', 'VERIFIED'), else_='PENDING'),
+        related_fine_id=fine.id
+    ), lambda stmt: stmt.select_from(fine).join(GroupMember, GroupMember.id == fine.member_id) \
+        .join(SavingsGroup, SavingsGroup.id == GroupMember.group_id)
+
+
+# The same projections as (column expressions, FROM/JOIN/GROUP BY) for a
+# single INSERT ... SELECT each. Used on PostgreSQL, where numbers and
+# dates cast to text exactly as Python formats them.
+BULK_PROJECTIONS = {
+    TRANSACTION: _bulk_transactions,
+    MEETING: _bulk_meetings,
+    LOAN: _bulk_loans,
+    CAMPAIGN: _bulk_campaigns,
+    FINE: _bulk_fines,
+}
+
+
+def bulk_insert_statement(reference_type, now):
+    """INSERT INTO calendar_events ... SELECT of every event of reference_type"""
+    columns, shape = BULK_PROJECTIONS[reference_type]()
+    columns = dict(columns, reference_type=literal(reference_type), updated_date=literal(now))
+    names = [name for name in PROJECTED_COLUMNS + ('reference_type', 'reference_id', 'updated_date')
+             if name in columns]
+    select_ = shape(select(*(columns[name].label(name) for name in names)))
+    return CalendarEvent.__table__.insert().from_select(names, select_)
+
+
+def _rows(session, reference_type, keys, now):
+    for reference_id, fields in PROJECTIONS[reference_type](session, keys):
+        row = dict.fromkeys(PROJECTED_COLUMNS)
+        row.update(fields, reference_type=reference_type, reference_id=reference_id, updated_date=now)
+        yield row
+
+
+def _insert(session):
+    dialect = postgresql if session.get_bind().dialect.name == 'postgresql' else sqlite
+    return dialect.insert(CalendarEvent.__table__)
+
+
+def project(reference_type, keys, session=None):
+    """Bring the calendar events of the given source rows in step with them.
+
+    keys are reference ids (for meetings, {reference id: (group_id, date,
+    type)}). Rows that still exist are upserted; events whose source row
+    is gone, or no longer projects (a campaign that stopped being ACTIVE),
+    are deleted. Nothing is committed.
+    """
+    if not keys:
+        return
+    session = session or db.session
+    now = datetime.utcnow()
+    rows = list(_rows(session, reference_type, keys, now))
+    if rows:
+        stmt = _insert(session)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=['reference_type', 'reference_id'],
+            set_={name: stmt.excluded[name] for name in PROJECTED_COLUMNS + ('updated_date',)}
+        ), rows)
+    gone = set(keys) - {row['reference_id'] for row in rows}
+    if gone:
+        events = CalendarEvent.__table__
+        session.execute(events.delete().where(
+            events.c.reference_type == reference_type, events.c.reference_id.in_(gone)
+        ))
+
+
+def rebuild(chunk_size=None, progress=None):
+    """Replace every projected calendar event with one computed from scratch.
+
+    For recovery only: the change hooks below keep the table current. On
+    PostgreSQL each event type is one INSERT ... SELECT; elsewhere rows
+    are computed here and inserted chunk_size at a time. progress, if
+    given, is called with (reference_type, events written so far) after
+    each statement. Runs in one transaction and commits; returns the
+    number of events written.
+    """
+    chunk_size = chunk_size or current_app.config.get('EXPORT_CHUNK_SIZE', 1000)
+    set_based = db.session.get_bind().dialect.name == 'postgresql'
+    now = datetime.utcnow()
+    written = 0
+    try:
+        events = CalendarEvent.__table__
+        db.session.execute(events.delete().where(events.c.reference_type.in_(list(PROJECTIONS))))
+        for reference_type in PROJECTIONS:
+            if set_based:
+                written += db.session.execute(bulk_insert_statement(reference_type, now)).rowcount
+                if progress:
+                    progress(reference_type, written)
+                continue
+            chunk = []
+            for row in _rows(db.session, reference_type, None, now):
+                chunk.append(row)
+                if len(chunk) >= chunk_size:
+                    db.session.execute(_insert(db.session), chunk)
+                    written += len(chunk)
+                    chunk = []
+                    if progress:
+                        progress(reference_type, written)
+            if chunk:
+                db.session.execute(_insert(db.session), chunk)
+                written += len(chunk)
+            if progress:
+                progress(reference_type, written)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return written
+
+
+def _meeting_keys(attendance, kind):
+    keys = {}
+    values = [(attendance.group_id, attendance.meeting_date, attendance.meeting_type)]
+    if kind != 'new':
+        state = inspect(attendance)
+        values.append(tuple(
+            state.attrs[name].history.deleted[0] if state.attrs[name].history.deleted
+            else getattr(attendance, name)
+            for name in ('group_id', 'meeting_date', 'meeting_type')
+        ))
+    for value in values:
+        keys[_meeting_key(*value)] = value
+    return keys
+
+
+def _moved(group):
+    state = inspect(group)
+    return any(state.attrs[name].history.has_changes() for name in LOCATION_COLUMNS)
+
+
+def _relocate(session, group):
+    events = CalendarEvent.__table__
+    location = _group_location(group)
+    session.execute(events.update().where(events.c.group_id == group.id).values(
+        {name: location[name] for name in LOCATION_COLUMNS}
+    ))
+    session.execute(events.update().where(
+        events.c.group_id == group.id, events.c.reference_type.in_(list(PROJECTIONS))
+    ).values(location=location['location']))
+
+
+@event.listens_for(CalendarEvent, 'before_insert')
+def _copy_group_location(mapper, connection, target):
+    """Events added through the ORM (not projected) get their group's location"""
+    if target.district is None and target.group_id is not None:
+        group = connection.execute(
+            select(*_GROUP_LOCATION).where(SavingsGroup.id == target.group_id)
+        ).first()
+        if group is not None:
+            for name in LOCATION_COLUMNS:
+                setattr(target, name, getattr(group, name))
+
+
+SOURCE_TYPES = (
+    (GroupTransaction, TRANSACTION),
+    (GroupLoan, LOAN),
+    (GroupTargetCampaign, CAMPAIGN),
+    (MemberFine, FINE),
+)
+
+
+@event.listens_for(Session, 'after_flush')
+def _project_flushed_rows(session, flush_context):
+    """Re-project the calendar events of the source rows just flushed, in
+    the same transaction.
+
+    A group whose location changed has it copied onto all its events.
+    Member renames and membership changes are not followed; run
+    `manage.py rebuild_calendar` to refresh those.
+    """
+    changed = {reference_type: set() for reference_type in PROJECTIONS}
+    meetings = {}
+    for kind, objs in (('new', session.new), ('dirty', session.dirty), ('deleted', session.deleted)):
+        for obj in objs:
+            if isinstance(obj, MeetingAttendance):
+                meetings.update(_meeting_keys(obj, kind))
+                continue
+            if isinstance(obj, SavingsGroup) and kind == 'dirty' and _moved(obj):
+                _relocate(session, obj)
+                continue
+            for model, reference_type in SOURCE_TYPES:
+                if isinstance(obj, model) and obj.id is not None:
+                    changed[reference_type].add(str(obj.id))
+    changed[MEETING] = meetings
+    for reference_type, keys in changed.items():
+        project(reference_type, keys, session)
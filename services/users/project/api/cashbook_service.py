@@ -2,12 +2,15 @@
 Cashbook service for managing group financial records
 """
 
-from datetime import date, datetime
+import calendar
+from datetime import date, datetime, timedelta
 from decimal import Decimal
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, case, update
+from sqlalchemy.dialects import postgresql, sqlite
 from project import db
+from project.api.pagination import keyset_page, cursor_pagination
 from project.api.models import (
-    GroupCashbook, SavingsGroup, GroupMember, 
+    GroupCashbook, GroupCashbookHead, GroupCashbookCheckpoint, SavingsGroup, GroupMember, 
     MemberSaving, SavingTransaction, MemberFine, 
     GroupLoan, LoanRepaymentSchedule
 )
@@ -16,38 +19,283 @@ from project.api.models import (
 class CashbookService:
     """Service for managing group cashbook operations"""
 
+    # Cashbook column credited by each saving type
+    SAVING_FUND_COLUMNS = {
+        'PERSONAL': 'individual_saving',
+        'ECD': 'ecd_fund',
+        'SOCIAL': 'social_fund',
+        'TARGET': 'target_saving'
+    }
+
+    CHECKPOINT_PERIODS = ('DAY', 'MONTH')
+
     @staticmethod
-    def create_cashbook_entry(group_id, transaction_date, description, entry_type, created_by, 
-                            member_id=None, reference_number=None, **amounts):
+    def lock_cashbook_head(group_id):
         """
-        Create a new cashbook entry with automatic balance calculation
-        
-        Args:
-            group_id: ID of the savings group
-            transaction_date: Date of the transaction
-            description: Description of the transaction
-            entry_type: Type of entry (DEPOSIT, WITHDRAWAL, etc.)
-            created_by: User ID who created the entry
-            member_id: Optional member ID for member-specific entries
-            reference_number: Optional reference number
-            **amounts: Dictionary of amount fields (individual_saving, ecd_fund, etc.)
+        Return the group's cashbook head locked FOR UPDATE, creating it on first use
+
+        A missing head is seeded from the latest active entry, so ledgers
+        written before heads existed carry on from their last balance.
         """
-        
-        # Get the last cashbook entry for balance calculation
+        head = GroupCashbookHead.query.filter_by(group_id=group_id).with_for_update().first()
+        if head:
+            return head
+
         last_entry = db.session.query(GroupCashbook).filter(
             GroupCashbook.group_id == group_id,
             GroupCashbook.status == 'ACTIVE'
         ).order_by(GroupCashbook.transaction_date.desc(), GroupCashbook.id.desc()).first()
-        
-        # Initialize balances from last entry or zero
+
+        values = {'group_id': group_id}
         if last_entry:
-            individual_balance = last_entry.individual_balance
-            ecd_balance = last_entry.ecd_balance
-            social_balance = last_entry.social_balance
-            target_balance = last_entry.target_balance
-        else:
-            individual_balance = ecd_balance = social_balance = target_balance = Decimal('0.00')
-        
+            values.update(
+                last_entry_id=last_entry.id,
+                individual_balance=last_entry.individual_balance,
+                ecd_balance=last_entry.ecd_balance,
+                social_balance=last_entry.social_balance,
+                target_balance=last_entry.target_balance,
+                total_balance=last_entry.total_balance
+            )
+
+        # A concurrent first append may insert the head too; the loser simply
+        # waits for the winner's row lock below
+        dialect = postgresql if db.engine.dialect.name == 'postgresql' else sqlite
+        inserted = db.session.execute(
+            dialect.insert(GroupCashbookHead.__table__).values(**values)
+            .on_conflict_do_nothing(index_elements=['group_id'])
+        ).rowcount
+        if inserted and last_entry:
+            CashbookService.rebuild_checkpoints(group_id)
+        return GroupCashbookHead.query.filter_by(group_id=group_id).with_for_update().first()
+
+    @staticmethod
+    def period_end(period, day):
+        """Last date of the DAY or MONTH period containing day"""
+        if period == 'MONTH':
+            return day.replace(day=calendar.monthrange(day.year, day.month)[1])
+        return day
+
+    @staticmethod
+    def record_checkpoints(entries):
+        """
+        Upsert the DAY and MONTH checkpoints covering newly appended entries
+
+        A new entry has the highest id, so it is always the latest entry of
+        its day; a month checkpoint only moves when the entry is dated on or
+        after the one it holds.
+        """
+        rows = {}
+        for entry in entries:
+            for period in CashbookService.CHECKPOINT_PERIODS:
+                key = (entry.group_id, period, CashbookService.period_end(period, entry.transaction_date))
+                held = rows.get(key)
+                if held is None or entry.transaction_date >= held['last_entry_date']:
+                    rows[key] = {
+                        'group_id': entry.group_id,
+                        'period': period,
+                        'period_end': key[2],
+                        'last_entry_id': entry.id,
+                        'last_entry_date': entry.transaction_date,
+                        'individual_balance': entry.individual_balance,
+                        'ecd_balance': entry.ecd_balance,
+                        'social_balance': entry.social_balance,
+                        'target_balance': entry.target_balance,
+                        'total_balance': entry.total_balance
+                    }
+        if not rows:
+            return
+
+        table = GroupCashbookCheckpoint.__table__
+        dialect = postgresql if db.engine.dialect.name == 'postgresql' else sqlite
+        stmt = dialect.insert(table).values(list(rows.values()))
+        updated = {
+            column: stmt.excluded[column] for column in (
+                'last_entry_id', 'last_entry_date', 'individual_balance', 'ecd_balance',
+                'social_balance', 'target_balance', 'total_balance'
+            )
+        }
+        updated['updated_date'] = func.now()
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=['group_id', 'period', 'period_end'],
+            set_=updated,
+            where=table.c.last_entry_date <= stmt.excluded.last_entry_date
+        ))
+
+    @staticmethod
+    def rebuild_checkpoints(group_id, from_date=None):
+        """
+        Recompute a group's checkpoints from its active entries
+
+        Used for ledgers written before checkpoints existed and after
+        rebalancing. With from_date, only checkpoints from the start of that
+        month on are rewritten. Returns the number of checkpoints written.
+        """
+        Checkpoint = GroupCashbookCheckpoint
+        stale = Checkpoint.query.filter(Checkpoint.group_id == group_id)
+        entries = db.session.query(
+            GroupCashbook.id, GroupCashbook.transaction_date,
+            GroupCashbook.individual_balance, GroupCashbook.ecd_balance,
+            GroupCashbook.social_balance, GroupCashbook.target_balance,
+            GroupCashbook.total_balance
+        ).filter(GroupCashbook.group_id == group_id, GroupCashbook.status == 'ACTIVE')
+        if from_date is not None:
+            from_date = from_date.replace(day=1)
+            stale = stale.filter(Checkpoint.period_end >= from_date)
+            entries = entries.filter(GroupCashbook.transaction_date >= from_date)
+        stale.delete(synchronize_session=False)
+
+        latest = {}
+        for entry in entries.order_by(GroupCashbook.transaction_date, GroupCashbook.id).yield_per(1000):
+            for period in CashbookService.CHECKPOINT_PERIODS:
+                latest[(period, CashbookService.period_end(period, entry.transaction_date))] = entry
+
+        db.session.bulk_insert_mappings(Checkpoint, [
+            {
+                'group_id': group_id,
+                'period': period,
+                'period_end': end,
+                'last_entry_id': entry.id,
+                'last_entry_date': entry.transaction_date,
+                'individual_balance': entry.individual_balance,
+                'ecd_balance': entry.ecd_balance,
+                'social_balance': entry.social_balance,
+                'target_balance': entry.target_balance,
+                'total_balance': entry.total_balance
+            }
+            for (period, end), entry in latest.items()
+        ])
+        return len(latest)
+
+    @staticmethod
+    def has_later_entries(group_id, transaction_date):
+        """Whether an active entry is dated after transaction_date (an index seek)"""
+        return db.session.query(
+            GroupCashbook.query.filter(
+                GroupCashbook.group_id == group_id,
+                GroupCashbook.status == 'ACTIVE',
+                GroupCashbook.transaction_date > transaction_date
+            ).exists()
+        ).scalar()
+
+    @staticmethod
+    def rebalance_cashbook(group_id, from_date):
+        """
+        Recompute running balances of every active entry dated from_date on
+
+        Needed after a backdated insert, a reversal or a correction. The
+        suffix's cumulative sums come from one window-function query, added
+        to the balances of the last entry before from_date; only rows whose
+        balances actually change are written, with a single bulk UPDATE by
+        primary key. The head and the checkpoints from that month are
+        refreshed, and a group_daily_stats backfill from from_date is queued.
+        Nothing is committed. Returns the number of rows rewritten.
+        """
+        db.session.flush()
+        head = CashbookService.lock_cashbook_head(group_id)
+
+        columns = (
+            ('individual_balance', GroupCashbook.individual_saving),
+            ('ecd_balance', GroupCashbook.ecd_fund),
+            ('social_balance', GroupCashbook.social_fund),
+            ('target_balance', GroupCashbook.target_saving)
+        )
+        active = and_(GroupCashbook.group_id == group_id, GroupCashbook.status == 'ACTIVE')
+
+        anchor = db.session.query(
+            *(getattr(GroupCashbook, name) for name, _ in columns)
+        ).filter(active, GroupCashbook.transaction_date < from_date).order_by(
+            GroupCashbook.transaction_date.desc(), GroupCashbook.id.desc()
+        ).first()
+        base = [Decimal(str(value)) for value in anchor] if anchor else [Decimal('0.00')] * len(columns)
+
+        # Same arithmetic as build_cashbook_entry, withdrawals included
+        def movement(amount):
+            return case(
+                (GroupCashbook.entry_type == 'WITHDRAWAL', amount - func.abs(amount)),
+                else_=amount
+            )
+
+        window = {'order_by': (GroupCashbook.transaction_date, GroupCashbook.id), 'rows': (None, 0)}
+        suffix = db.session.query(
+            GroupCashbook.id,
+            *(getattr(GroupCashbook, name) for name, _ in columns),
+            *(func.sum(movement(amount)).over(**window) for _, amount in columns)
+        ).filter(active, GroupCashbook.transaction_date >= from_date).order_by(
+            GroupCashbook.transaction_date, GroupCashbook.id
+        )
+
+        cent = Decimal('0.01')
+        changes, last = [], None
+        for row in suffix:
+            stored = row[1:1 + len(columns)]
+            running = row[1 + len(columns):]
+            balances = [(b + Decimal(str(r or 0))).quantize(cent) for b, r in zip(base, running)]
+            total = sum(balances)
+            if total < 0:
+                raise ValueError("Rebalancing would leave a negative cashbook balance")
+            last = dict(zip((name for name, _ in columns), balances), id=row[0], total_balance=total)
+            if any(Decimal(str(old)).quantize(cent) != new for old, new in zip(stored, balances)):
+                changes.append(last)
+
+        if changes:
+            db.session.execute(update(GroupCashbook), changes)
+            balance_names = [name for name, _ in columns] + ['total_balance']
+            for change in changes:
+                entry = db.session.identity_map.get(db.session.identity_key(GroupCashbook, change['id']))
+                if entry is not None:
+                    db.session.expire(entry, balance_names)
+
+        if last is None:
+            latest = db.session.query(
+                GroupCashbook.id, *(getattr(GroupCashbook, name) for name, _ in columns),
+                GroupCashbook.total_balance
+            ).filter(active).order_by(GroupCashbook.transaction_date.desc(), GroupCashbook.id.desc()).first()
+            last = latest._asdict() if latest else dict(
+                {name: Decimal('0.00') for name, _ in columns}, id=None, total_balance=Decimal('0.00')
+            )
+        head.last_entry_id = last['id']
+        for name in ('individual_balance', 'ecd_balance', 'social_balance', 'target_balance', 'total_balance'):
+            setattr(head, name, last[name])
+
+        CashbookService.rebuild_checkpoints(group_id, from_date)
+
+        # Closing balances already rolled up for those days are now stale
+        from project.api import jobs
+        jobs.enqueue('rollups.group_daily_backfill', {
+            'group_id': group_id, 'start': from_date.isoformat()
+        }, unique=True)
+        return len(changes)
+
+    @staticmethod
+    def reverse_cashbook_entry(entry_id):
+        """
+        Mark an entry REVERSED and rebalance the entries after it
+
+        Only the cashbook is touched; the caller undoes the posting's effect
+        on savings, fines or loans. Nothing is committed.
+        """
+        entry = GroupCashbook.query.get(entry_id)
+        if not entry:
+            raise ValueError("Cashbook entry not found")
+        if entry.status != 'ACTIVE':
+            raise ValueError("Cashbook entry is not active")
+
+        entry.status = 'REVERSED'
+        CashbookService.rebalance_cashbook(entry.group_id, entry.transaction_date)
+        return entry
+
+    @staticmethod
+    def build_cashbook_entry(previous, group_id, transaction_date, description, entry_type,
+                             created_by, member_id=None, reference_number=None, **amounts):
+        """
+        Build an unsaved cashbook entry whose running balances continue from
+        previous (the cashbook head or the entry before it)
+        """
+        individual_balance = previous.individual_balance
+        ecd_balance = previous.ecd_balance
+        social_balance = previous.social_balance
+        target_balance = previous.target_balance
+
         # Create new entry
         entry = GroupCashbook(
             group_id=group_id,
@@ -84,9 +332,46 @@ class CashbookService:
         
         # Calculate total balance
         entry.calculate_total_balance()
+
+        return entry
+
+    @staticmethod
+    def create_cashbook_entry(group_id, transaction_date, description, entry_type, created_by, 
+                            member_id=None, reference_number=None, **amounts):
+        """
+        Create a new cashbook entry with automatic balance calculation
+
+        Running balances come from the group's cashbook head, locked for the
+        rest of the transaction. The entry is flushed, not committed: the
+        caller commits it together with the rest of its changes.
+        
+        Args:
+            group_id: ID of the savings group
+            transaction_date: Date of the transaction
+            description: Description of the transaction
+            entry_type: Type of entry (DEPOSIT, WITHDRAWAL, etc.)
+            created_by: User ID who created the entry
+            member_id: Optional member ID for member-specific entries
+            reference_number: Optional reference number
+            **amounts: Dictionary of amount fields (individual_saving, ecd_fund, etc.)
+        """
+        
+        # Current balances from the (locked) cashbook head
+        head = CashbookService.lock_cashbook_head(group_id)
+        entry = CashbookService.build_cashbook_entry(
+            head, group_id, transaction_date, description, entry_type, created_by,
+            member_id=member_id, reference_number=reference_number, **amounts
+        )
         
         db.session.add(entry)
-        db.session.commit()
+        if CashbookService.has_later_entries(group_id, transaction_date):
+            # Backdated: the entries after it must include it too
+            CashbookService.rebalance_cashbook(group_id, transaction_date)
+            return entry
+
+        db.session.flush()
+        head.advance(entry)
+        CashbookService.record_checkpoints([entry])
         
         return entry
 
@@ -283,9 +568,258 @@ class CashbookService:
         return cashbook_entry
 
     @staticmethod
-    def get_group_cashbook(group_id, start_date=None, end_date=None, limit=100, offset=0):
+    def post_meeting_batch(group_id, postings, processed_by, transaction_date=None, atomic=True):
+        """
+        Record a meeting's worth of savings, fine payments and loan repayments
+
+        Every line is validated against the group's state as left by the lines
+        before it, using rows preloaded with one query per table. Valid lines
+        are then applied in order: running balances continue in memory from
+        the locked cashbook head, and all new rows go to the database in a
+        single flush. Nothing is committed; the caller commits.
+
+        Each posting is a dict with a 'type' of SAVING (member_id,
+        saving_type_code, amount, transaction_type, mobile_money_*),
+        FINE_PAYMENT (fine_id, amount) or LOAN_REPAYMENT (loan_id, amount,
+        installment_number).
+
+        With atomic set, any invalid line means nothing is applied.
+
+        Returns {'posted': [...], 'errors': [{'index', 'message'}]}
+        """
+        from project.api.models import SavingType
+
+        if not SavingsGroup.query.get(group_id):
+            raise ValueError("Savings group not found")
+        if not isinstance(postings, list) or not postings:
+            raise ValueError("Postings must be a non-empty list")
+
+        transaction_date = transaction_date or date.today()
+
+        def ids(key):
+            return {p.get(key) for p in postings if isinstance(p, dict) and isinstance(p.get(key), int)}
+
+        members = {
+            m.id: m for m in GroupMember.query.filter(
+                GroupMember.group_id == group_id, GroupMember.id.in_(ids('member_id'))
+            )
+        }
+        saving_types = {t.code: t for t in SavingType.query.all()}
+        member_savings = {
+            (ms.member_id, ms.saving_type_id): ms for ms in MemberSaving.query.filter(
+                MemberSaving.member_id.in_(members.keys())
+            )
+        }
+        fines = {
+            f.id: f for f in MemberFine.query.join(
+                GroupMember, MemberFine.member_id == GroupMember.id
+            ).filter(GroupMember.group_id == group_id, MemberFine.id.in_(ids('fine_id')))
+        }
+        loans = {
+            loan.id: loan for loan in GroupLoan.query.filter(
+                GroupLoan.group_id == group_id, GroupLoan.id.in_(ids('loan_id'))
+            )
+        }
+        schedule = {
+            (s.loan_id, s.installment_number): s for s in LoanRepaymentSchedule.query.filter(
+                LoanRepaymentSchedule.loan_id.in_(loans.keys())
+            )
+        }
+        mobile_money_ids = {
+            p.get('mobile_money_transaction_id') for p in postings
+            if isinstance(p, dict) and p.get('mobile_money_transaction_id')
+        }
+        used_mobile_money_ids = {
+            row[0] for row in db.session.query(SavingTransaction.mobile_money_transaction_id).filter(
+                SavingTransaction.mobile_money_transaction_id.in_(mobile_money_ids)
+            )
+        } if mobile_money_ids else set()
+
+        # Validation pass, against the state each line leaves behind
+        saving_balances = {key: ms.current_balance for key, ms in member_savings.items()}
+        paid_fines = set()
+        loan_outstanding = {}
+        planned, errors = [], []
+
+        for index, posting in enumerate(postings):
+            try:
+                if not isinstance(posting, dict):
+                    raise ValueError("Posting must be an object")
+                try:
+                    amount = Decimal(str(posting.get('amount')))
+                except ArithmeticError:
+                    raise ValueError("Invalid amount format")
+                if not amount.is_finite() or amount <= 0:
+                    raise ValueError("Amount must be positive")
+
+                posting_type = posting.get('type')
+                if posting_type == 'SAVING':
+                    member = members.get(posting.get('member_id'))
+                    if not member:
+                        raise ValueError("Member not found in this group")
+                    saving_type = saving_types.get(posting.get('saving_type_code'))
+                    if not saving_type:
+                        raise ValueError(f"Saving type '{posting.get('saving_type_code')}' not found")
+                    transaction_type = posting.get('transaction_type', 'DEPOSIT')
+                    if transaction_type not in ('DEPOSIT', 'WITHDRAWAL'):
+                        raise ValueError("Transaction type must be DEPOSIT or WITHDRAWAL")
+                    reference = posting.get('mobile_money_transaction_id')
+                    if reference and reference in used_mobile_money_ids:
+                        raise ValueError("Mobile money transaction already recorded")
+
+                    key = (member.id, saving_type.id)
+                    balance_before = saving_balances.get(key, Decimal('0.00'))
+                    if transaction_type == 'DEPOSIT':
+                        balance_after = balance_before + amount
+                    else:
+                        if balance_before < amount:
+                            raise ValueError("Insufficient balance for withdrawal")
+                        balance_after = balance_before - amount
+
+                    saving_balances[key] = balance_after
+                    if reference:
+                        used_mobile_money_ids.add(reference)
+                    planned.append((index, posting_type, amount, (member, saving_type, transaction_type)))
+
+                elif posting_type == 'FINE_PAYMENT':
+                    fine = fines.get(posting.get('fine_id'))
+                    if not fine:
+                        raise ValueError("Fine not found")
+                    if fine.status != 'PENDING' or fine.id in paid_fines:
+                        raise ValueError("Fine is not pending payment")
+                    if amount < fine.amount:
+                        raise ValueError("Payment amount is less than fine amount")
+
+                    paid_fines.add(fine.id)
+                    planned.append((index, posting_type, amount, (fine,)))
+
+                elif posting_type == 'LOAN_REPAYMENT':
+                    loan = loans.get(posting.get('loan_id'))
+                    if not loan:
+                        raise ValueError("Loan not found in this group")
+                    outstanding = loan_outstanding.get(loan.id, loan.outstanding_balance)
+                    if loan.status not in ['DISBURSED', 'PARTIALLY_REPAID'] or outstanding <= 0:
+                        raise ValueError("Loan is not active for repayment")
+
+                    loan_outstanding[loan.id] = outstanding - amount
+                    installment = schedule.get((loan.id, posting.get('installment_number')))
+                    planned.append((index, posting_type, amount, (loan, installment)))
+
+                else:
+                    raise ValueError("Posting type must be SAVING, FINE_PAYMENT or LOAN_REPAYMENT")
+            except ValueError as e:
+                errors.append({'index': index, 'message': str(e)})
+
+        if (errors and atomic) or not planned:
+            return {'posted': [], 'errors': errors}
+
+        # Apply pass: running balances continue from the locked head
+        head = CashbookService.lock_cashbook_head(group_id)
+        backdated = CashbookService.has_later_entries(group_id, transaction_date)
+        previous = head
+        new_rows, posted = [], []
+
+        with db.session.no_autoflush:
+            for index, posting_type, amount, targets in planned:
+                posting = postings[index]
+                saving_transaction = None
+
+                if posting_type == 'SAVING':
+                    member, saving_type, transaction_type = targets
+                    member_saving = member_savings.get((member.id, saving_type.id))
+                    if member_saving is None:
+                        member_saving = MemberSaving(member_id=member.id, saving_type_id=saving_type.id)
+                        member_saving.current_balance = Decimal('0.00')
+                        member_savings[(member.id, saving_type.id)] = member_saving
+                        new_rows.append(member_saving)
+
+                    balance_before = member_saving.current_balance
+                    balance_after = (
+                        balance_before + amount if transaction_type == 'DEPOSIT'
+                        else balance_before - amount
+                    )
+                    saving_transaction = SavingTransaction(
+                        member_saving_id=member_saving.id,
+                        amount=amount,
+                        transaction_type=transaction_type,
+                        processed_by=processed_by,
+                        mobile_money_transaction_id=posting.get('mobile_money_transaction_id'),
+                        mobile_money_provider=posting.get('mobile_money_provider'),
+                        mobile_money_phone=posting.get('mobile_money_phone')
+                    )
+                    saving_transaction.member_saving = member_saving
+                    saving_transaction.balance_before = balance_before
+                    saving_transaction.balance_after = balance_after
+                    member_saving.current_balance = balance_after
+                    member_saving.check_target_achievement()
+                    new_rows.append(saving_transaction)
+
+                    column = CashbookService.SAVING_FUND_COLUMNS.get(saving_type.code)
+                    amounts = {column: amount if transaction_type == 'DEPOSIT' else -amount} if column else {}
+                    entry = CashbookService.build_cashbook_entry(
+                        previous, group_id, transaction_date,
+                        f"{transaction_type.title()} - {member.name} - {saving_type.name}",
+                        transaction_type, processed_by,
+                        member_id=member.id,
+                        reference_number=posting.get('mobile_money_transaction_id'),
+                        **amounts
+                    )
+
+                elif posting_type == 'FINE_PAYMENT':
+                    fine, = targets
+                    fine.status = 'PAID'
+                    fine.paid_date = date.today()
+                    entry = CashbookService.build_cashbook_entry(
+                        previous, group_id, transaction_date,
+                        f"Fine Payment - {fine.member.name} - {fine.reason}",
+                        'DEPOSIT', processed_by,
+                        member_id=fine.member_id,
+                        fines=amount
+                    )
+
+                else:
+                    loan, installment = targets
+                    loan.record_repayment(amount)
+                    if installment is not None:
+                        installment.amount_paid += amount
+                        installment.payment_date = date.today()
+                        installment.update_status()
+                    entry = CashbookService.build_cashbook_entry(
+                        previous, group_id, transaction_date,
+                        f"Loan Repayment - {loan.requester.name}",
+                        'DEPOSIT', processed_by,
+                        member_id=loan.requested_by,
+                        loan_repayment=amount
+                    )
+
+                new_rows.append(entry)
+                previous = entry
+                posted.append({
+                    'index': index,
+                    'type': posting_type,
+                    'cashbook_entry': entry,
+                    'saving_transaction': saving_transaction
+                })
+
+        db.session.add_all(new_rows)
+        if backdated:
+            CashbookService.rebalance_cashbook(group_id, transaction_date)
+        else:
+            db.session.flush()
+            head.advance(previous)
+            CashbookService.record_checkpoints([line['cashbook_entry'] for line in posted])
+
+        return {'posted': posted, 'errors': errors}
+
+    @staticmethod
+    def get_group_cashbook(group_id, start_date=None, end_date=None, limit=100, offset=0,
+                           cursor=None, include_total=True):
         """
         Get cashbook entries for a group with optional date filtering
+
+        Passing a cursor (empty string for the first page) switches from
+        OFFSET to keyset pagination on (transaction_date, id); the total is
+        then only counted when include_total is set.
         """
         query = GroupCashbook.query.filter_by(group_id=group_id, status='ACTIVE')
         
@@ -293,6 +827,16 @@ class CashbookService:
             query = query.filter(GroupCashbook.transaction_date >= start_date)
         if end_date:
             query = query.filter(GroupCashbook.transaction_date <= end_date)
+
+        if cursor is not None:
+            keyset = keyset_page(
+                query, GroupCashbook.transaction_date, GroupCashbook.id,
+                cursor=cursor, limit=limit, include_total=include_total
+            )
+            return {
+                'entries': [entry.to_json() for entry in keyset.items],
+                'pagination': cursor_pagination(keyset, limit)
+            }
         
         total = query.count()
         entries = query.order_by(
@@ -308,24 +852,37 @@ class CashbookService:
         }
 
     @staticmethod
-    def get_group_financial_summary(group_id, as_of_date=None):
+    def balance_as_of(group_id, as_of_date):
         """
-        Get financial summary for a group as of a specific date
+        The latest active entry or checkpoint dated on or before as_of_date
+
+        Seeks the nearest DAY checkpoint, then replays only the entries
+        dated after it (none, once a ledger's checkpoints are complete).
+        Returns None for a group with no entries by that date.
         """
-        if not as_of_date:
-            as_of_date = date.today()
-        
-        # Get the latest cashbook entry as of the specified date
-        latest_entry = GroupCashbook.query.filter(
+        checkpoint = GroupCashbookCheckpoint.query.filter(
+            GroupCashbookCheckpoint.group_id == group_id,
+            GroupCashbookCheckpoint.period == 'DAY',
+            GroupCashbookCheckpoint.period_end <= as_of_date
+        ).order_by(GroupCashbookCheckpoint.period_end.desc()).first()
+
+        tail = GroupCashbook.query.filter(
             GroupCashbook.group_id == group_id,
             GroupCashbook.transaction_date <= as_of_date,
             GroupCashbook.status == 'ACTIVE'
-        ).order_by(
+        )
+        if checkpoint:
+            tail = tail.filter(GroupCashbook.transaction_date > checkpoint.period_end)
+        latest_entry = tail.order_by(
             GroupCashbook.transaction_date.desc(),
             GroupCashbook.id.desc()
         ).first()
-        
-        if not latest_entry:
+
+        return latest_entry or checkpoint
+
+    @staticmethod
+    def _balances_json(source, as_of_date):
+        if source is None:
             return {
                 'individual_balance': 0.00,
                 'ecd_balance': 0.00,
@@ -334,13 +891,77 @@ class CashbookService:
                 'total_balance': 0.00,
                 'as_of_date': as_of_date.isoformat()
             }
-        
+
+        last_date = source.transaction_date if isinstance(source, GroupCashbook) else source.last_entry_date
         return {
-            'individual_balance': float(latest_entry.individual_balance),
-            'ecd_balance': float(latest_entry.ecd_balance),
-            'social_balance': float(latest_entry.social_balance),
-            'target_balance': float(latest_entry.target_balance),
-            'total_balance': float(latest_entry.total_balance),
+            'individual_balance': float(source.individual_balance),
+            'ecd_balance': float(source.ecd_balance),
+            'social_balance': float(source.social_balance),
+            'target_balance': float(source.target_balance),
+            'total_balance': float(source.total_balance),
             'as_of_date': as_of_date.isoformat(),
-            'last_transaction_date': latest_entry.transaction_date.isoformat()
-        }
\ No newline at end of file
+            'last_transaction_date': last_date.isoformat()
+        }
+
+    @staticmethod
+    def get_group_financial_summary(group_id, as_of_date=None):
+        """
+        Get financial summary for a group as of a specific date
+        """
+        if not as_of_date:
+            as_of_date = date.today()
+
+        return CashbookService._balances_json(
+            CashbookService.balance_as_of(group_id, as_of_date), as_of_date
+        )
+
+    @staticmethod
+    def get_group_balance_series(group_id, start_date, end_date):
+        """
+        Month-end balances for every month from start_date to end_date
+
+        One as-of lookup for the opening balance and one range read of MONTH
+        checkpoints. A month without a checkpoint carries the previous
+        balance forward if it had no entries, and is answered with an as-of
+        lookup if it had some (a ledger whose checkpoints were never
+        rebuilt). A final partial month is answered as of end_date.
+        """
+        month_ends = []
+        month = start_date.replace(day=1)
+        while month <= end_date:
+            month_ends.append(CashbookService.period_end('MONTH', month))
+            month = month_ends[-1] + timedelta(days=1)
+
+        checkpoints = {
+            checkpoint.period_end: checkpoint
+            for checkpoint in GroupCashbookCheckpoint.query.filter(
+                GroupCashbookCheckpoint.group_id == group_id,
+                GroupCashbookCheckpoint.period == 'MONTH',
+                GroupCashbookCheckpoint.period_end.between(month_ends[0], month_ends[-1])
+            )
+        }
+
+        missing = [m for m in month_ends if m <= end_date and m not in checkpoints]
+        active_months = set()
+        if missing:
+            entry_dates = db.session.query(GroupCashbook.transaction_date).filter(
+                GroupCashbook.group_id == group_id,
+                GroupCashbook.status == 'ACTIVE',
+                GroupCashbook.transaction_date.between(missing[0].replace(day=1), missing[-1])
+            ).distinct()
+            active_months = {CashbookService.period_end('MONTH', day) for day, in entry_dates}
+
+        current = CashbookService.balance_as_of(group_id, start_date.replace(day=1) - timedelta(days=1))
+        series = []
+        for month_end in month_ends:
+            if month_end > end_date:
+                series.append(CashbookService._balances_json(
+                    CashbookService.balance_as_of(group_id, end_date), end_date
+                ))
+                break
+            if month_end in checkpoints:
+                current = checkpoints[month_end]
+            elif month_end in active_months:
+                current = CashbookService.balance_as_of(group_id, month_end)
+            series.append(CashbookService._balances_json(current, month_end))
+        return series
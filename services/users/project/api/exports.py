@@ -0,0 +1,202 @@
+# services/users/project/api/exports.py
+
+import csv
+import io
+import json
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from sqlalchemy import select
+
+from project import db
+from project.api.models import (
+    SavingsGroup, GroupMember, GroupCashbook, GroupTransaction,
+    MemberSaving, SavingTransaction, SavingType
+)
+from project.api.utils import authenticate
+from project.api.principal import get_principal
+from project.api.savings_groups import service_permission_required
+
+exports_blueprint = Blueprint('exports', __name__)
+
+
+# columns: (header, expression) pairs; group_id/date_column: what the scope
+# filters apply to; joins: (target, onclause) needed to reach the group
+ExportSpec = namedtuple('ExportSpec', ['model', 'columns', 'group_id', 'date_column', 'joins'])
+
+
+EXPORTS = {
+    'cashbook': ExportSpec(
+        GroupCashbook,
+        [(name, getattr(GroupCashbook, name)) for name in (
+            'id', 'group_id', 'member_id', 'transaction_date', 'reference_number',
+            'description', 'entry_type', 'status', 'individual_saving', 'ecd_fund',
+            'social_fund', 'target_saving', 'fines', 'loan_taken', 'loan_repayment',
+            'interest_earned', 'individual_balance', 'ecd_balance', 'social_balance',
+            'target_balance', 'total_balance', 'created_by', 'created_date'
+        )],
+        GroupCashbook.group_id,
+        GroupCashbook.transaction_date,
+        ()
+    ),
+    'group-transactions': ExportSpec(
+        GroupTransaction,
+        [(name, getattr(GroupTransaction, name)) for name in (
+            'id', 'group_id', 'member_id', 'loan_id', 'type', 'amount', 'description',
+            'member_balance_before', 'member_balance_after', 'group_balance_before',
+            'group_balance_after', 'idempotency_key', 'processed_by', 'processed_date'
+        )],
+        GroupTransaction.group_id,
+        GroupTransaction.processed_date,
+        ()
+    ),
+    'saving-transactions': ExportSpec(
+        SavingTransaction,
+        [
+            ('id', SavingTransaction.id),
+            ('group_id', GroupMember.group_id),
+            ('member_id', MemberSaving.member_id),
+            ('saving_type', SavingType.code),
+            ('amount', SavingTransaction.amount),
+            ('transaction_type', SavingTransaction.transaction_type),
+            ('description', SavingTransaction.description),
+            ('balance_before', SavingTransaction.balance_before),
+            ('balance_after', SavingTransaction.balance_after),
+            ('status', SavingTransaction.status),
+            ('mobile_money_transaction_id', SavingTransaction.mobile_money_transaction_id),
+            ('mobile_money_provider', SavingTransaction.mobile_money_provider),
+            ('processed_by', SavingTransaction.processed_by),
+            ('processed_date', SavingTransaction.processed_date),
+        ],
+        GroupMember.group_id,
+        SavingTransaction.processed_date,
+        (
+            (MemberSaving, SavingTransaction.member_saving_id == MemberSaving.id),
+            (GroupMember, MemberSaving.member_id == GroupMember.id),
+            (SavingType, MemberSaving.saving_type_id == SavingType.id),
+        )
+    ),
+}
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+}
+
+
+def export_statement(spec, group_ids=None, district=None, start_date=None, end_date=None):
+    """SELECT of the spec's columns in (group, date, id) order for the given scope"""
+    stmt = select(*(expression.label(header) for header, expression in spec.columns))
+    stmt = stmt.select_from(spec.model)
+    for target, onclause in spec.joins:
+        stmt = stmt.join(target, onclause)
+
+    if group_ids is not None:
+        stmt = stmt.where(spec.group_id.in_(group_ids))
+    if district:
+        stmt = stmt.join(SavingsGroup, SavingsGroup.id == spec.group_id).where(
+            SavingsGroup.district == district
+        )
+
+    # Dates are inclusive; DATETIME columns are bounded by the next midnight
+    is_datetime = spec.date_column.type.python_type is datetime
+    if start_date:
+        stmt = stmt.where(spec.date_column >= start_date)
+    if end_date:
+        stmt = stmt.where(spec.date_column < end_date + timedelta(days=1) if is_datetime
+                          else spec.date_column <= end_date)
+
+    return stmt.order_by(spec.group_id, spec.date_column, spec.model.id)
+
+
+def _plain(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def stream_rows(stmt, headers, fmt, chunk_size):
+    """Yield the statement's rows encoded as CSV or NDJSON, one chunk at a time.
+
+    The rows come from a server-side cursor (stream_results), so memory holds
+    at most one chunk whatever the size of the export.
+    """
+    result = db.session.execute(
+        stmt.execution_options(stream_results=True, yield_per=chunk_size)
+    )
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == 'csv' else None
+    if writer:
+        writer.writerow(headers)
+
+    try:
+        for partition in result.partitions():
+            for row in partition:
+                if writer:
+                    writer.writerow([
+                        value.isoformat() if isinstance(value, (date, datetime)) else value
+                        for value in row
+                    ])
+                else:
+                    buffer.write(json.dumps(dict(zip(headers, map(_plain, row)))))
+                    buffer.write('\n')
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if writer and buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        result.close()
+
+
+def _parse_date(name):
+    value = request.args.get(name)
+    return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+
+
+@exports_blueprint.route('/exports/<string:resource>', methods=['GET'])
+@authenticate
+@service_permission_required('Savings Groups', 'read')
+def export_resource(user_id, resource):
+    """Stream a cashbook or transaction export as CSV (default) or NDJSON"""
+    spec = EXPORTS.get(resource)
+    if spec is None:
+        return jsonify({'status': 'fail', 'message': 'Unknown export.'}), 404
+
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in FORMATS:
+        return jsonify({'status': 'fail', 'message': 'Format must be csv or ndjson.'}), 400
+
+    try:
+        group_ids = [int(value) for value in request.args.getlist('group_id')] or None
+        start_date = _parse_date('start_date')
+        end_date = _parse_date('end_date')
+    except ValueError:
+        return jsonify({'status': 'fail', 'message': 'Invalid group_id or date. Use YYYY-MM-DD.'}), 400
+    district = request.args.get('district')
+
+    # Members may only export their own groups
+    principal = get_principal(user_id)
+    if not principal.is_service_admin('Savings Groups'):
+        own = set(principal.group_ids)
+        if group_ids is None:
+            group_ids = sorted(own)
+        elif not own.issuperset(group_ids):
+            return jsonify({'status': 'fail', 'message': 'You can only export your own groups.'}), 403
+    if group_ids is None and not district and not (start_date or end_date):
+        return jsonify({'status': 'fail', 'message': 'Scope the export by group_id, district or date range.'}), 400
+
+    stmt = export_statement(spec, group_ids, district, start_date, end_date)
+    headers = [header for header, _ in spec.columns]
+    mimetype, extension = FORMATS[fmt]
+    chunk_size = current_app.config.get('EXPORT_CHUNK_SIZE', 1000)
+
+    return Response(
+        stream_with_context(stream_rows(stmt, headers, fmt, chunk_size)),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={resource.replace("-", "_")}.{extension}'}
+    )
@@ -0,0 +1,171 @@
+# services/users/project/api/fieldsets.py
+
+import functools
+from collections import namedtuple
+
+from flask import request
+from sqlalchemy.orm import joinedload, load_only
+
+from project.api.models import (
+    User, Service, Notification, SavingsGroup, GroupMember, GroupTransaction,
+    CalendarEvent, Meeting
+)
+
+
+class FieldsetError(ValueError):
+    """Raised for a ?fields= parameter naming fields the resource does not have"""
+
+
+# columns: attribute names the field's to_json renderer reads; loaders: a
+# function returning the relationship options it needs (already projected).
+# Values come from the model's JSON_FIELDS, so they match to_json.
+Field = namedtuple('Field', ['columns', 'loaders'])
+
+
+def column(attr):
+    """A field read from one column"""
+    return Field((attr,), None)
+
+
+# Loader options are built on first use: building them at import would
+# configure the mappers while project.api is still being imported.
+
+@functools.cache
+def _event_group():
+    return (joinedload(CalendarEvent.group).load_only(SavingsGroup.name),)
+
+
+@functools.cache
+def _officer_group():
+    return (joinedload(GroupMember.group).load_only(
+        SavingsGroup.chair_member_id, SavingsGroup.treasurer_member_id,
+        SavingsGroup.secretary_member_id
+    ),)
+
+
+@functools.cache
+def _transaction_member():
+    return (joinedload(GroupTransaction.member).load_only(GroupMember.name),)
+
+
+@functools.cache
+def _transaction_processor():
+    return (joinedload(GroupTransaction.processor).load_only(User.username),)
+
+
+@functools.cache
+def _notification_service():
+    return (joinedload(Notification.service).load_only(Service.name),)
+
+
+@functools.cache
+def _notification_creator():
+    return (joinedload(Notification.creator).load_only(User.username),)
+
+
+@functools.cache
+def _meeting_leadership():
+    return (joinedload(Meeting.chairperson).load_only(GroupMember.name),
+            joinedload(Meeting.secretary).load_only(GroupMember.name),
+            joinedload(Meeting.treasurer).load_only(GroupMember.name))
+
+
+def _fields(model, **overrides):
+    """A Field for each of the model's JSON_FIELDS: the column of the same
+    name unless overridden"""
+    return model, {
+        name: overrides.get(name) or column(name) for name in model.JSON_FIELDS
+    }
+
+
+FIELDSETS = {
+    'group_member': _fields(
+        GroupMember,
+        officer_role=Field(('group_id',), _officer_group),
+        is_officer=Field(('group_id',), _officer_group),
+    ),
+    'group_transaction': _fields(
+        GroupTransaction,
+        member=Field(('member_id',), _transaction_member),
+        processed_by=Field(('processed_by',), _transaction_processor),
+        metadata=column('transaction_metadata'),
+    ),
+    'calendar_event': _fields(
+        CalendarEvent,
+        group_name=Field(('group_id',), _event_group),
+        group_district=column('district'),
+        group_parish=column('parish'),
+        group_village=column('village'),
+        group_region=column('region'),
+    ),
+    'notification': _fields(
+        Notification,
+        service=Field(('service_id',), _notification_service),
+        creator=Field(('created_by',), _notification_creator),
+    ),
+    'meeting': _fields(
+        Meeting,
+        leadership=Field(('chairperson_id', 'secretary_id', 'treasurer_id'), _meeting_leadership),
+        attendance=Field(('total_members', 'members_present', 'quorum_met'), None),
+        financial_summary=Field(
+            ('total_savings_collected', 'loans_disbursed_count', 'loans_disbursed_amount',
+             'fines_imposed_count', 'fines_imposed_amount'),
+            None
+        ),
+    ),
+}
+
+
+class Fieldset:
+    """A client-selected subset of a resource's to_json fields"""
+
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = fields
+
+    def apply(self, query, *extra_columns):
+        """Restrict the query's select list to the requested fields.
+
+        extra_columns names columns the endpoint itself reads (e.g. for
+        summaries), so they are not lazily loaded row by row.
+        """
+        columns = {'id'}
+        columns.update(extra_columns)
+        options = []
+        for field in self.fields.values():
+            columns.update(field.columns)
+            for loader in field.loaders() if field.loaders else ():
+                if not any(loader is seen for seen in options):
+                    options.append(loader)
+        options.append(load_only(*(getattr(self.model, name) for name in sorted(columns))))
+        return query.options(*options)
+
+    def serialize(self, obj):
+        renderers = self.model.JSON_FIELDS
+        return {name: renderers[name](obj) for name in self.fields}
+
+
+def parse_fieldset(resource, args=None):
+    """Fieldset from the ?fields= parameter, or None when it is absent.
+
+    Raises FieldsetError naming any unknown field.
+    """
+    raw = (request.args if args is None else args).get('fields')
+    if not raw:
+        return None
+
+    model, available = FIELDSETS[resource]
+    names = [name.strip() for name in raw.split(',') if name.strip()]
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise FieldsetError(f"Unknown fields: {', '.join(unknown)}.")
+    return Fieldset(model, {name: available[name] for name in names})
+
+
+def serialize_with(fieldset, items, default=None):
+    """Serialize items with the fieldset if one was requested, else with default/to_json"""
+    if fieldset is not None:
+        return [fieldset.serialize(item) for item in items]
+    if default is not None:
+        return default(items)
+    return [item.to_json() for item in items]
@@ -0,0 +1,87 @@
+# services/users/project/api/group_directory.py
+
+from collections import namedtuple
+
+from flask import current_app
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from project import db
+from project.api.models import SavingsGroup
+from project.api.cache_utils import get_app_cache, current_version, bump_version
+
+
+GROUP_DIRECTORY_VERSION = 'group_directory'
+
+LOCATION_LEVELS = ('region', 'district', 'parish', 'village')
+
+DirectoryGroup = namedtuple('DirectoryGroup', ('id', 'name') + LOCATION_LEVELS)
+
+
+class GroupDirectory:
+    """Every savings group's name and location, held in memory.
+
+    groups maps id -> DirectoryGroup. Loaded with one query and reused
+    until the group_directory version changes; the options over all
+    groups are computed once per load.
+    """
+
+    def __init__(self, groups):
+        self.groups = {group.id: group for group in groups}
+        self._all_options = self._options(sorted(self.groups))
+
+    @classmethod
+    def load(cls):
+        g = SavingsGroup
+        rows = db.session.execute(
+            select(g.id, g.name, *(getattr(g, name) for name in LOCATION_LEVELS)).order_by(g.id)
+        )
+        return cls([DirectoryGroup(*row) for row in rows])
+
+    def _options(self, group_ids):
+        groups = [self.groups[group_id] for group_id in group_ids if group_id in self.groups]
+        options = {
+            plural: [
+                {'value': value, 'label': value}
+                for value in sorted({getattr(group, name) for group in groups} - {None, ''})
+            ]
+            for name, plural in zip(LOCATION_LEVELS, ('regions', 'districts', 'parishes', 'villages'))
+        }
+        options['groups'] = [{'value': group.id, 'label': group.name} for group in groups]
+        return options
+
+    def filter_options(self, group_ids=None):
+        """Location and group filter options over group_ids (None: every group)"""
+        if group_ids is None:
+            return self._all_options
+        return self._options(sorted(group_ids))
+
+
+def get_group_directory():
+    """The worker's GroupDirectory for the current group_directory version"""
+    cache = get_app_cache(
+        'group_directory', maxsize=1,
+        ttl=current_app.config.get('GROUP_DIRECTORY_CACHE_TTL', 3600)
+    )
+    version = current_version(GROUP_DIRECTORY_VERSION)
+    directory = cache.get(version)
+    if directory is None:
+        directory = GroupDirectory.load()
+        cache.set(version, directory)
+    return directory
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_on_group_change(session, flush_context):
+    """Retire cached directories when a group is created, renamed, moved or deleted"""
+    watched = ('name',) + LOCATION_LEVELS
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, SavingsGroup):
+            bump_version(GROUP_DIRECTORY_VERSION, session)
+            return
+    for obj in session.dirty:
+        if isinstance(obj, SavingsGroup):
+            state = inspect(obj)
+            if any(state.attrs[name].history.has_changes() for name in watched):
+                bump_version(GROUP_DIRECTORY_VERSION, session)
+                return
@@ -0,0 +1,140 @@
+# services/users/project/api/hashing.py
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt as bcrypt_lib
+from flask import current_app
+
+
+class HashingOverloaded(Exception):
+    """Raised when the hashing pool already holds its maximum of pending jobs,
+    or a job did not finish within the timeout"""
+
+
+def _hash_password(password, rounds):
+    salt = bcrypt_lib.gensalt(rounds=rounds, prefix=b'2b')
+    return bcrypt_lib.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+def _check_password(pw_hash, password):
+    return bcrypt_lib.checkpw(password.encode('utf-8'), pw_hash.encode('utf-8'))
+
+
+class PasswordHasher:
+    """Runs bcrypt in a bounded process pool, away from the request loop.
+
+    At most max_pending jobs are queued or running; further requests are
+    refused with HashingOverloaded instead of waiting. A job that outlives
+    the timeout also raises HashingOverloaded, but keeps its slot until the
+    pool has finished it. With workers=0 the work runs inline (tests, CLI).
+    """
+
+    def __init__(self, workers, max_pending, timeout):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = ProcessPoolExecutor(max_workers=workers) if workers else None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._stats = {
+            'submitted': 0, 'completed': 0, 'rejected': 0, 'failed': 0,
+            'timed_out': 0, 'in_flight': 0, 'total_ms': 0.0
+        }
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, delta in deltas.items():
+                self._stats[key] += delta
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            self._count(rejected=1)
+            raise HashingOverloaded()
+
+        started = time.monotonic()
+        self._count(submitted=1, in_flight=1)
+        try:
+            if self._executor is None:
+                try:
+                    result = fn(*args)
+                finally:
+                    self._release()
+            else:
+                try:
+                    future = self._executor.submit(fn, *args)
+                except Exception:
+                    self._release()
+                    raise
+                # The slot is held until the pool is done with the job, even
+                # if this request stops waiting for it
+                future.add_done_callback(lambda _: self._release())
+                try:
+                    result = future.result(timeout=self.timeout)
+                except TimeoutError as e:
+                    self._count(timed_out=1)
+                    raise HashingOverloaded() from e
+        except Exception:
+            self._count(failed=1)
+            raise
+        self._count(completed=1, total_ms=(time.monotonic() - started) * 1000)
+        return result
+
+    def _release(self):
+        self._slots.release()
+        self._count(in_flight=-1)
+
+    def hash_password(self, password, rounds):
+        return self._run(_hash_password, password, rounds)
+
+    def check_password(self, pw_hash, password):
+        return self._run(_check_password, pw_hash, password)
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self._stats)
+        total_ms = stats.pop('total_ms')
+        stats.update({
+            'workers': self.workers,
+            'max_pending': self.max_pending,
+            'queue_depth': max(stats['in_flight'] - self.workers, 0),
+            'avg_ms': round(total_ms / stats['completed'], 2) if stats['completed'] else 0.0
+        })
+        return stats
+
+
+def get_password_hasher():
+    """The current app's PasswordHasher, created on first use"""
+    hasher = current_app.extensions.get('password_hasher')
+    if hasher is None:
+        workers = current_app.config.get('HASHING_WORKERS')
+        if workers is None:
+            workers = os.cpu_count() or 1
+        hasher = PasswordHasher(
+            workers=workers,
+            max_pending=current_app.config.get('HASHING_MAX_PENDING') or max(workers, 1) * 4,
+            timeout=current_app.config.get('HASHING_TIMEOUT_SECONDS', 10)
+        )
+        winner = current_app.extensions.setdefault('password_hasher', hasher)
+        if winner is not hasher and hasher._executor is not None:
+            hasher._executor.shutdown(wait=False)
+        hasher = winner
+    return hasher
+
+
+def hash_password(password):
+    """bcrypt hash of password at BCRYPT_LOG_ROUNDS, computed in the pool"""
+    if not isinstance(password, str) or not password:
+        raise ValueError('Password must be a non-empty string')
+    return get_password_hasher().hash_password(
+        password, current_app.config.get('BCRYPT_LOG_ROUNDS')
+    )
+
+
+def check_password(pw_hash, password):
+    """Whether password matches pw_hash, checked in the pool"""
+    if not isinstance(password, str) or not pw_hash:
+        return False
+    return get_password_hasher().check_password(pw_hash, password)
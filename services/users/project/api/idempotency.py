@@ -0,0 +1,107 @@
+# services/users/project/api/idempotency.py
+
+import json
+from datetime import datetime, timedelta
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, tuple_
+from sqlalchemy.orm import Session
+
+from project import db
+from project.api.models import IdempotencyKey
+from project.api.cache_utils import get_app_cache
+
+
+GROUP_TRANSACTION = 'group_transaction'
+
+
+def _cache():
+    return get_app_cache(
+        'idempotency',
+        maxsize=current_app.config.get('IDEMPOTENCY_CACHE_SIZE', 10000),
+        ttl=current_app.config.get('IDEMPOTENCY_CACHE_TTL', 600)
+    )
+
+
+def _cache_set(scope, key, body, expires_at):
+    remaining = (expires_at - datetime.utcnow()).total_seconds()
+    if remaining > 0:
+        cache = _cache()
+        cache.set((scope, key), body, ttl=min(cache.ttl, remaining))
+
+
+def lookup_many(scope, keys):
+    """Stored responses for those of keys already used in scope -> {key: body}.
+
+    Recent keys are answered from the in-process cache; the rest with one
+    IN query on idempotency_keys.
+    """
+    cache = _cache()
+    found, missing = {}, []
+    for key in set(keys):
+        body = cache.get((scope, key))
+        if body is None:
+            missing.append(key)
+        else:
+            found[key] = body
+
+    if missing:
+        rows = IdempotencyKey.query.filter(
+            IdempotencyKey.scope == scope,
+            IdempotencyKey.key.in_(missing),
+            IdempotencyKey.expires_at > datetime.utcnow()
+        )
+        for row in rows:
+            found[row.key] = json.loads(row.response_body)
+            _cache_set(scope, row.key, found[row.key], row.expires_at)
+    return found
+
+
+def lookup(scope, key):
+    """Stored response for key in scope, or None"""
+    return lookup_many(scope, [key]).get(key)
+
+
+def remember(scope, key, body, ttl=None):
+    """Store body as the response for key, as part of the current transaction.
+
+    The caller commits; a concurrent request that stored the same key first
+    makes that commit fail with an IntegrityError. The key reaches the cache
+    only once the commit succeeds.
+    """
+    if ttl is None:
+        ttl = current_app.config.get('IDEMPOTENCY_TTL_SECONDS', 7 * 24 * 3600)
+    expires_at = datetime.utcnow() + timedelta(seconds=ttl)
+    db.session.add(IdempotencyKey(
+        scope=scope, key=key, response_body=json.dumps(body), expires_at=expires_at
+    ))
+    db.session.info.setdefault('idempotency_pending', []).append((scope, key, body, expires_at))
+
+
+def purge_expired(batch_size=1000):
+    """Delete expired keys in batches, committing after each; returns the count"""
+    purged = 0
+    while True:
+        expired = db.session.query(IdempotencyKey.scope, IdempotencyKey.key).filter(
+            IdempotencyKey.expires_at <= datetime.utcnow()
+        ).limit(batch_size).all()
+        if not expired:
+            return purged
+        IdempotencyKey.query.filter(
+            tuple_(IdempotencyKey.scope, IdempotencyKey.key).in_(expired)
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        purged += len(expired)
+
+
+@event.listens_for(Session, 'after_commit')
+def _cache_committed_keys(session):
+    pending = session.info.pop('idempotency_pending', None)
+    if pending and has_app_context():
+        for scope, key, body, expires_at in pending:
+            _cache_set(scope, key, body, expires_at)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_keys(session):
+    session.info.pop('idempotency_pending', None)
@@ -0,0 +1,360 @@
+# services/users/project/api/jobs.py
+
+import json
+import os
+import socket
+import time
+from datetime import date, datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import case, func, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from project import db
+from project.api.models import BackgroundJob, ProcessingWatermark
+
+
+# name -> function; job functions take JSON-serializable keyword arguments
+JOBS = {}
+
+
+class UnknownJob(ValueError):
+    """Raised when enqueueing a job name that is not registered"""
+
+
+def job(name):
+    """Register the decorated function as the job called name"""
+    def decorator(fn):
+        JOBS[name] = fn
+        return fn
+    return decorator
+
+
+def enqueue(name, kwargs=None, run_at=None, max_attempts=None, unique=False):
+    """Queue a run of job name with kwargs, as part of the current transaction.
+
+    The caller commits, so a job enqueued by a request handler only becomes
+    visible to workers if the handler's own writes commit. With unique=True
+    an already queued or running job with the same arguments is returned
+    instead of adding another.
+    """
+    if name not in JOBS:
+        raise UnknownJob(f'Unknown job: {name}')
+    args = json.dumps(kwargs or {}, sort_keys=True)
+
+    if unique:
+        existing = BackgroundJob.query.filter(
+            BackgroundJob.name == name,
+            BackgroundJob.args == args,
+            BackgroundJob.status.in_(('QUEUED', 'RUNNING'))
+        ).first()
+        if existing:
+            return existing
+
+    queued = BackgroundJob(
+        name=name,
+        args=args,
+        status='QUEUED',
+        attempts=0,
+        max_attempts=max_attempts or current_app.config.get('JOB_MAX_ATTEMPTS', 3),
+        run_at=run_at or datetime.utcnow()
+    )
+    db.session.add(queued)
+    return queued
+
+
+def claim_next(worker_id):
+    """Claim the next due job for worker_id and return its id, or None.
+
+    The claim is a conditional UPDATE (status still QUEUED), so of several
+    workers racing for a job exactly one wins, on SQLite and Postgres alike.
+    """
+    now = datetime.utcnow()
+    candidates = db.session.query(BackgroundJob.id).filter(
+        BackgroundJob.status == 'QUEUED',
+        BackgroundJob.run_at <= now
+    ).order_by(BackgroundJob.run_at, BackgroundJob.id).limit(10).all()
+
+    for (job_id,) in candidates:
+        claimed = db.session.execute(
+            update(BackgroundJob)
+            .where(BackgroundJob.id == job_id, BackgroundJob.status == 'QUEUED')
+            .values(status='RUNNING', locked_by=worker_id, started_at=now,
+                    finished_at=None, attempts=BackgroundJob.attempts + 1),
+            execution_options={'synchronize_session': False}
+        ).rowcount
+        db.session.commit()
+        if claimed:
+            return job_id
+    db.session.rollback()
+    return None
+
+
+def _backoff(attempts):
+    # 30s, 60s, 120s, ... after the first, second, third failure
+    return timedelta(seconds=current_app.config.get('JOB_RETRY_SECONDS', 30) * 2 ** (attempts - 1))
+
+
+def run_job(job_id):
+    """Run a claimed job and record its outcome and timing; returns success"""
+    claimed = db.session.get(BackgroundJob, job_id)
+    fn = JOBS.get(claimed.name)
+    kwargs = json.loads(claimed.args)
+
+    started = time.monotonic()
+    try:
+        if fn is None:
+            raise UnknownJob(f'Unknown job: {claimed.name}')
+        result = fn(**kwargs)
+        db.session.commit()
+        error = None
+    except Exception as e:
+        db.session.rollback()
+        error = f'{type(e).__name__}: {e}'
+    duration_ms = int((time.monotonic() - started) * 1000)
+
+    finished = db.session.get(BackgroundJob, job_id)
+    finished.duration_ms = duration_ms
+    finished.locked_by = None
+    if error is None:
+        finished.status = 'SUCCEEDED'
+        finished.finished_at = datetime.utcnow()
+        finished.result = json.dumps(result, default=str)
+        finished.last_error = None
+    elif finished.attempts >= finished.max_attempts:
+        finished.status = 'FAILED'
+        finished.finished_at = datetime.utcnow()
+        finished.last_error = error[:2000]
+    else:
+        finished.status = 'QUEUED'
+        finished.run_at = datetime.utcnow() + _backoff(finished.attempts)
+        finished.last_error = error[:2000]
+    db.session.commit()
+
+    if error:
+        current_app.logger.warning(f'Job {job_id} ({finished.name}) failed: {error}')
+    return error is None
+
+
+def requeue_stale(timeout_seconds=None):
+    """Requeue (or fail) RUNNING jobs whose worker died; returns the count"""
+    if timeout_seconds is None:
+        timeout_seconds = current_app.config.get('JOB_TIMEOUT_SECONDS', 3600)
+    stale = (
+        (BackgroundJob.status == 'RUNNING')
+        & (BackgroundJob.started_at < datetime.utcnow() - timedelta(seconds=timeout_seconds))
+    )
+    count = db.session.execute(
+        update(BackgroundJob).where(stale).values(
+            status=case((BackgroundJob.attempts >= BackgroundJob.max_attempts, 'FAILED'), else_='QUEUED'),
+            locked_by=None,
+            last_error='Worker timed out'
+        ),
+        execution_options={'synchronize_session': False}
+    ).rowcount
+    db.session.commit()
+    return count
+
+
+# processing_watermarks row locked while queueing periodic jobs
+SCHEDULE_LOCK = 'jobs.schedule'
+
+
+def schedule_periodic(now=None):
+    """Queue the next run of each PERIODIC_JOBS job that has none queued.
+
+    A run is due its interval after the previous run was due, or now if
+    the job never ran. Workers take a lock on the jobs.schedule watermark
+    row first, so each run is queued once. Commits; returns the names
+    queued.
+    """
+    periodic = current_app.config.get('PERIODIC_JOBS') or {}
+    if not periodic:
+        return []
+    now = now or datetime.utcnow()
+
+    dialect = postgresql if db.session.get_bind().dialect.name == 'postgresql' else sqlite
+    db.session.execute(
+        dialect.insert(ProcessingWatermark.__table__)
+        .values(name=SCHEDULE_LOCK, last_id=0, updated_date=now)
+        .on_conflict_do_nothing(index_elements=['name'])
+    )
+    db.session.query(ProcessingWatermark).filter_by(name=SCHEDULE_LOCK).with_for_update().one()
+
+    names = list(periodic)
+    pending = {name for name, in db.session.query(BackgroundJob.name).filter(
+        BackgroundJob.name.in_(names), BackgroundJob.status.in_(('QUEUED', 'RUNNING'))
+    ).distinct()}
+    last_due = dict(db.session.query(BackgroundJob.name, func.max(BackgroundJob.run_at)).filter(
+        BackgroundJob.name.in_(names)
+    ).group_by(BackgroundJob.name).all())
+
+    queued = []
+    for name, seconds in periodic.items():
+        if name in pending:
+            continue
+        if name not in JOBS:
+            current_app.logger.warning(f'Unknown periodic job: {name}')
+            continue
+        run_at = last_due[name] + timedelta(seconds=seconds) if name in last_due else now
+        enqueue(name, run_at=max(run_at, now))
+        queued.append(name)
+    db.session.commit()
+    return queued
+
+
+def work(worker_id=None, once=False, poll_seconds=None):
+    """Run due jobs until interrupted, or until none are left with once=True.
+
+    Every poll_seconds the worker also queues the periodic jobs that are due.
+    """
+    worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+    if poll_seconds is None:
+        poll_seconds = current_app.config.get('JOB_POLL_SECONDS', 2)
+
+    processed = 0
+    requeue_stale()
+    schedule_periodic()
+    scheduled_at = time.monotonic()
+    while True:
+        if time.monotonic() - scheduled_at >= poll_seconds:
+            schedule_periodic()
+            scheduled_at = time.monotonic()
+        job_id = claim_next(worker_id)
+        if job_id is None:
+            if once:
+                return processed
+            time.sleep(poll_seconds)
+            requeue_stale()
+            continue
+        run_job(job_id)
+        processed += 1
+
+
+def worker_process(worker_id, once=False):
+    """Entry point of a worker process started by manage.py run_workers"""
+    from project import create_app
+
+    app, _ = create_app()
+    with app.app_context():
+        work(worker_id, once)
+
+
+def job_metrics():
+    """Per job name: counts by status and timings of the succeeded runs"""
+    rows = db.session.query(
+        BackgroundJob.name,
+        BackgroundJob.status,
+        func.count(BackgroundJob.id),
+        func.avg(BackgroundJob.duration_ms),
+        func.max(BackgroundJob.duration_ms),
+        func.min(BackgroundJob.run_at)
+    ).group_by(BackgroundJob.name, BackgroundJob.status).all()
+
+    now = datetime.utcnow()
+    metrics = {}
+    for name, status, count, avg_ms, max_ms, oldest_run_at in rows:
+        entry = metrics.setdefault(name, {
+            'QUEUED': 0, 'RUNNING': 0, 'SUCCEEDED': 0, 'FAILED': 0,
+            'avg_ms': 0.0, 'max_ms': 0, 'oldest_queued_seconds': 0
+        })
+        entry[status] = count
+        if status == 'SUCCEEDED':
+            entry['avg_ms'] = round(float(avg_ms or 0), 2)
+            entry['max_ms'] = max_ms or 0
+        elif status == 'QUEUED' and oldest_run_at:
+            entry['oldest_queued_seconds'] = max(int((now - oldest_run_at).total_seconds()), 0)
+    return metrics
+
+
+# Registered jobs. Imports are local: the modules doing the work also
+# enqueue jobs from their request handlers.
+
+@job('calendar.regenerate')
+def regenerate_calendar_events():
+    from project.api.calendar import generate_calendar_events_from_real_data
+
+    return {'events': generate_calendar_events_from_real_data()}
+
+
+@job('campaigns.assign_globally')
+def assign_campaign_globally(campaign_id, assigned_by):
+    from project.api.target_campaign_service import TargetCampaignService
+
+    return {'assigned': TargetCampaignService.assign_campaign_globally(campaign_id, assigned_by)}
+
+
+@job('campaigns.apply_penalties')
+def apply_campaign_penalties(campaign_id):
+    from project.api.target_campaign_service import TargetCampaignService
+
+    return {'penalties': TargetCampaignService.apply_penalties_for_non_participation(campaign_id)}
+
+
+@job('loans.update_overdue')
+def update_overdue_repayments(batch_size=500):
+    """Refresh status and days_overdue of past-due repayment installments"""
+    from project.api.models import LoanRepaymentSchedule
+
+    today = date.today()
+    updated, last_id = 0, 0
+    while True:
+        installments = LoanRepaymentSchedule.query.filter(
+            LoanRepaymentSchedule.id > last_id,
+            LoanRepaymentSchedule.status.in_(('PENDING', 'PARTIAL', 'OVERDUE')),
+            LoanRepaymentSchedule.due_date < today
+        ).order_by(LoanRepaymentSchedule.id).limit(batch_size).all()
+        if not installments:
+            return {'updated': updated}
+        for installment in installments:
+            before = (installment.status, installment.days_overdue)
+            installment.update_status()
+            if (installment.status, installment.days_overdue) != before:
+                updated += 1
+        last_id = installments[-1].id
+        db.session.commit()
+
+
+@job('outbox.dispatch')
+def drain_outbox():
+    from project.api.outbox import dispatch_pending
+
+    delivered = failed = 0
+    while True:
+        batch_delivered, batch_failed = dispatch_pending()
+        if not (batch_delivered or batch_failed):
+            return {'delivered': delivered, 'failed': failed}
+        delivered += batch_delivered
+        failed += batch_failed
+
+
+@job('idempotency.purge')
+def purge_idempotency_keys():
+    from project.api.idempotency import purge_expired
+
+    return {'purged': purge_expired()}
+
+
+@job('platform_stats.reconcile')
+def reconcile_platform_stats():
+    from project.api.platform_stats import reconcile
+
+    return {'rows': reconcile()}
+
+
+@job('rollups.group_daily')
+def update_group_daily_stats():
+    from project.api.rollups import catch_up
+
+    return {'rows': catch_up()}
+
+
+@job('rollups.group_daily_backfill')
+def backfill_group_daily_stats(start=None, end=None, group_id=None):
+    from project.api.rollups import backfill
+
+    return {'days': backfill(
+        start=date.fromisoformat(start) if start else None,
+        end=date.fromisoformat(end) if end else None,
+        group_id=group_id
+    )}
@@ -0,0 +1,83 @@
+# services/users/project/api/loading_plans.py
+
+import functools
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+
+from project import db
+from project.api.models import User, SavingsGroup, GroupMember, GroupLoan
+
+
+ACTIVE_LOAN_STATUSES = ('APPROVED', 'DISBURSED', 'PARTIALLY_REPAID')
+
+
+# Relationship loading per endpoint, named after the serializer that needs it.
+# Officers are selectin-loaded; their back reference to the group is then
+# answered from the identity map. Built on first use, as building loader
+# options configures the mappers.
+@functools.cache
+def loading_plans():
+    return {
+        'savings_group.list': (
+            joinedload(SavingsGroup.creator),
+            selectinload(SavingsGroup.chair),
+            selectinload(SavingsGroup.treasurer),
+            selectinload(SavingsGroup.secretary),
+        ),
+        'group_member.membership': (
+            joinedload(GroupMember.group),
+        ),
+    }
+
+
+def with_plan(query, plan_name):
+    """Apply a named loading plan to a query"""
+    return query.options(*loading_plans()[plan_name])
+
+
+def _prime(model, ids):
+    """Load rows by primary key so later many-to-one lazy loads hit the identity map"""
+    ids = {i for i in ids if i is not None}
+    if ids:
+        model.query.filter(model.id.in_(ids)).all()
+
+
+def active_loan_group_ids(group_ids):
+    """Ids of the given groups that have at least one active loan (one query)"""
+    if not group_ids:
+        return set()
+    rows = db.session.query(GroupLoan.group_id).filter(
+        GroupLoan.group_id.in_(group_ids),
+        GroupLoan.status.in_(ACTIVE_LOAN_STATUSES)
+    ).group_by(GroupLoan.group_id).all()
+    return {group_id for group_id, in rows}
+
+
+def serialize_groups(groups):
+    """SavingsGroup.to_json for a list of groups in a constant number of queries.
+
+    Officers and creators not already loaded by a plan are fetched with one
+    IN query each, and active-loan flags come from a single grouped query
+    instead of loading every group's loans.
+    """
+    groups = list(groups)
+    if not groups:
+        return []
+
+    officer_ids, creator_ids = set(), set()
+    for group in groups:
+        unloaded = inspect(group).unloaded
+        for attr in ('chair', 'treasurer', 'secretary'):
+            if attr in unloaded:
+                officer_ids.add(getattr(group, attr + '_member_id'))
+        if 'creator' in unloaded:
+            creator_ids.add(group.created_by)
+    _prime(GroupMember, officer_ids)
+    _prime(User, creator_ids)
+
+    with_active_loan = active_loan_group_ids([group.id for group in groups])
+    return [
+        group.to_json(has_active_loan=group.id in with_active_loan)
+        for group in groups
+    ]
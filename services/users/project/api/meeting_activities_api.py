@@ -15,7 +15,7 @@ from project.api.meeting_models import (
     ActivityDocument, ActivityTransaction
 )
 from project.api.utils import authenticate, admin_required
-from project.api.notifications import create_system_notification
+from project.api import outbox
 
 meeting_activities_blueprint = Blueprint('meeting_activities', __name__, url_prefix='/api/meeting-activities')
 
@@ -150,16 +150,16 @@ def create_meeting_activity(user_id, meeting_id):
             )
             db.session.add(participation)
         
-        db.session.commit()
-        
         # Create notification
-        create_system_notification(
+        outbox.notify(
             user_id=user_id,
             title=f"New Activity Created",
             message=f"Activity '{activity.activity_name}' has been created for meeting #{meeting.meeting_number}",
             notification_type="MEETING_ACTIVITY",
-            related_id=activity.id
+            action_data={'activity_id': activity.id}
         )
+
+        db.session.commit()
         
         return jsonify({
             'status': 'success',
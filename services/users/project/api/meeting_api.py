@@ -14,6 +14,7 @@ from project.api.models import SavingsGroup, GroupMember, User
 from project.api.models import (
     GroupConstitution, Meeting, SavingsGroup, GroupMember, User
 )
+from project.api.fieldsets import FieldsetError, parse_fieldset, serialize_with
 
 
 meeting_blueprint = Blueprint('meetings', __name__)
@@ -98,6 +99,11 @@ def create_group_constitution(user_id, group_id):
 @authenticate
 def get_group_meetings(user_id, group_id):
     """Get all meetings for a group with pagination"""
+    try:
+        fieldset = parse_fieldset('meeting')
+    except FieldsetError as e:
+        return jsonify({'status': 'fail', 'message': str(e)}), 400
+
     try:
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
@@ -111,14 +117,17 @@ def get_group_meetings(user_id, group_id):
         if meeting_type:
             query = query.filter_by(meeting_type=meeting_type)
         
-        meetings = query.order_by(Meeting.meeting_date.desc()).paginate(
+        query = query.order_by(Meeting.meeting_date.desc())
+        if fieldset:
+            query = fieldset.apply(query)
+        meetings = query.paginate(
             page=page, per_page=per_page, error_out=False
         )
         
         return jsonify({
             'status': 'success',
             'data': {
-                'meetings': [meeting.to_json() for meeting in meetings.items],
+                'meetings': serialize_with(fieldset, meetings.items),
                 'pagination': {
                     'page': page,
                     'per_page': per_page,
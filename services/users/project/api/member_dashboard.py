@@ -0,0 +1,275 @@
+# services/users/project/api/member_dashboard.py
+
+from datetime import date, timedelta
+
+from flask import current_app
+from sqlalchemy import and_, desc, event, func, select, true
+from sqlalchemy.orm import Session, aliased, joinedload
+
+from project import db
+from project.api.models import (
+    User, SavingsGroup, GroupMember, GroupLoan, MemberSaving, SavingType,
+    SavingTransaction, MeetingAttendance, MemberFine
+)
+from project.api.cache_utils import get_app_cache, current_version, bump_version
+from project.api.loading_plans import ACTIVE_LOAN_STATUSES
+
+
+ATTENDANCE_WINDOW_DAYS = 90
+RECENT_TRANSACTIONS = 10
+
+# Loans shown on the dashboard, newest first
+DASHBOARD_LOAN_STATUSES = ('PENDING',) + ACTIVE_LOAN_STATUSES
+
+# cache_versions counters, one pair per group: the member parts of its
+# members' dashboards, and its group part
+MEMBERS_VERSION = 'member_dashboard.members:{}'
+GROUP_VERSION = 'member_dashboard.group:{}'
+
+
+def _cache():
+    return get_app_cache(
+        'member_dashboard',
+        maxsize=current_app.config.get('MEMBER_DASHBOARD_CACHE_SIZE', 5000),
+        ttl=current_app.config.get('MEMBER_DASHBOARD_CACHE_TTL', 60)
+    )
+
+
+def _float(value):
+    return float(value) if value is not None else None
+
+
+def member_dashboard_statement(member_id, since):
+    """One SELECT for the member, their group's officers, every dashboard
+    aggregate and their active savings.
+
+    There is a row per active saving (MemberSaving, with its saving type
+    loaded, and type_total, the balance of all the member's active savings
+    of that type), or one row with a null saving; none if the member does
+    not exist.
+    """
+    savings_by_type = select(
+        MemberSaving.saving_type_id,
+        func.sum(MemberSaving.current_balance).label('type_total'),
+    ).where(
+        MemberSaving.member_id == member_id, MemberSaving.is_active.is_(True)
+    ).group_by(MemberSaving.saving_type_id).cte('savings_by_type')
+
+    attendance = select(
+        func.count().filter(MeetingAttendance.meeting_date >= since).label('meetings_total'),
+        func.count().filter(and_(
+            MeetingAttendance.meeting_date >= since, MeetingAttendance.attended.is_(True)
+        )).label('meetings_attended'),
+    ).where(MeetingAttendance.member_id == member_id).cte('attendance')
+
+    fines = select(
+        func.count(MemberFine.id).label('fines_pending'),
+        func.coalesce(func.sum(MemberFine.amount), 0).label('fines_amount'),
+    ).where(MemberFine.member_id == member_id, MemberFine.status == 'PENDING').cte('fines')
+
+    loan = select(
+        GroupLoan.id.label('loan_id'), GroupLoan.status.label('loan_status'),
+        GroupLoan.principal.label('loan_principal'),
+        GroupLoan.outstanding_balance.label('loan_outstanding'),
+        GroupLoan.due_date.label('loan_due_date'),
+    ).where(
+        GroupLoan.requested_by == member_id, GroupLoan.status.in_(DASHBOARD_LOAN_STATUSES)
+    ).order_by(desc(GroupLoan.request_date), desc(GroupLoan.id)).limit(1).cte('active_loan')
+
+    return select(
+        GroupMember.id.label('member_id'), GroupMember.group_id, GroupMember.user_id,
+        GroupMember.name, GroupMember.gender, GroupMember.phone, GroupMember.role,
+        GroupMember.is_active, GroupMember.joined_date, GroupMember.share_balance,
+        GroupMember.total_contributions, GroupMember.created_date,
+        SavingsGroup.chair_member_id, SavingsGroup.treasurer_member_id,
+        SavingsGroup.secretary_member_id,
+        attendance.c.meetings_total, attendance.c.meetings_attended,
+        fines.c.fines_pending, fines.c.fines_amount,
+        loan.c.loan_id, loan.c.loan_status, loan.c.loan_principal,
+        loan.c.loan_outstanding, loan.c.loan_due_date,
+        MemberSaving, savings_by_type.c.type_total,
+    ).select_from(GroupMember) \
+        .join(SavingsGroup, SavingsGroup.id == GroupMember.group_id) \
+        .join(attendance, true()).join(fines, true()) \
+        .outerjoin(loan, true()) \
+        .outerjoin(MemberSaving, and_(
+            MemberSaving.member_id == GroupMember.id, MemberSaving.is_active.is_(True)
+        )) \
+        .outerjoin(savings_by_type, savings_by_type.c.saving_type_id == MemberSaving.saving_type_id) \
+        .where(GroupMember.id == member_id) \
+        .order_by(MemberSaving.id) \
+        .options(joinedload(MemberSaving.saving_type).joinedload(SavingType.creator))
+
+
+def recent_transactions(member_id, limit=RECENT_TRANSACTIONS):
+    """SavingTransaction.to_json rows of the member's latest transactions, in one query"""
+    processor, verifier = aliased(User), aliased(User)
+    rows = db.session.execute(
+        select(
+            SavingTransaction, SavingType.code,
+            processor.username.label('processed_by'), verifier.username.label('verified_by')
+        )
+        .join(MemberSaving, SavingTransaction.member_saving_id == MemberSaving.id)
+        .join(SavingType, MemberSaving.saving_type_id == SavingType.id)
+        .outerjoin(processor, processor.id == SavingTransaction.processed_by)
+        .outerjoin(verifier, verifier.id == SavingTransaction.verified_by)
+        .where(MemberSaving.member_id == member_id)
+        .order_by(desc(SavingTransaction.processed_date), desc(SavingTransaction.id))
+        .limit(limit)
+    )
+    transactions = []
+    for tx, saving_type, processed_by, verified_by in rows:
+        transactions.append({
+            'id': tx.id,
+            'member_saving_id': tx.member_saving_id,
+            'saving_type': saving_type,
+            'amount': float(tx.amount),
+            'transaction_type': tx.transaction_type,
+            'description': tx.description,
+            'mobile_money_transaction_id': tx.mobile_money_transaction_id,
+            'mobile_money_provider': tx.mobile_money_provider,
+            'mobile_money_phone': tx.mobile_money_phone,
+            'balance_before': float(tx.balance_before),
+            'balance_after': float(tx.balance_after),
+            'status': tx.status,
+            'verified_by': verified_by,
+            'verified_date': tx.verified_date.isoformat() if tx.verified_date else None,
+            'processed_by': processed_by,
+            'processed_date': tx.processed_date.isoformat() if tx.processed_date else None,
+            'idempotency_key': tx.idempotency_key,
+        })
+    return transactions
+
+
+def _build_member(member_id):
+    """Member part of the dashboard, or None"""
+    since = date.today() - timedelta(days=ATTENDANCE_WINDOW_DAYS)
+    rows = db.session.execute(member_dashboard_statement(member_id, since)).all()
+    if not rows:
+        return None
+    row = rows[0]
+
+    officer_role = next((
+        role for role, officer_id in (
+            ('chair', row.chair_member_id), ('treasurer', row.treasurer_member_id),
+            ('secretary', row.secretary_member_id)
+        ) if officer_id == row.member_id
+    ), None)
+    savings = [r.MemberSaving for r in rows if r.MemberSaving is not None]
+    savings_by_type = {
+        r.MemberSaving.saving_type.code: float(r.type_total)
+        for r in rows if r.MemberSaving is not None
+    }
+    attendance_rate = (
+        row.meetings_attended / row.meetings_total * 100 if row.meetings_total else 0
+    )
+
+    return {
+        'user_id': row.user_id,
+        'group_id': row.group_id,
+        'member': {
+            'id': row.member_id,
+            'group_id': row.group_id,
+            'user_id': row.user_id,
+            'name': row.name,
+            'gender': row.gender,
+            'phone': row.phone,
+            'joined_date': row.joined_date.isoformat() if row.joined_date else None,
+            'is_active': row.is_active,
+            'share_balance': _float(row.share_balance),
+            'total_contributions': _float(row.total_contributions),
+            'role': row.role,
+            'officer_role': officer_role,
+            'is_officer': officer_role is not None,
+            'created_date': row.created_date.isoformat() if row.created_date else None,
+        },
+        'savings': [saving.to_json() for saving in savings],
+        'savings_by_type': savings_by_type,
+        'total_savings': sum(savings_by_type.values()),
+        'recent_transactions': recent_transactions(member_id),
+        'attendance': {
+            'window_days': ATTENDANCE_WINDOW_DAYS,
+            'meetings': row.meetings_total,
+            'attended': row.meetings_attended,
+        },
+        'attendance_rate': round(attendance_rate, 2),
+        'fines': {'pending': row.fines_pending, 'amount': float(row.fines_amount)},
+        'active_loan': {
+            'id': row.loan_id,
+            'status': row.loan_status,
+            'principal': _float(row.loan_principal),
+            'outstanding_balance': _float(row.loan_outstanding),
+            'due_date': row.loan_due_date.isoformat() if row.loan_due_date else None,
+        } if row.loan_id else None,
+    }
+
+
+def get_member_dashboard_data(member_id):
+    """Cached dashboard of a member, or None if the member does not exist.
+
+    The member part and the group part (SavingsGroup.to_json) are cached
+    separately, keyed by their group's cache_versions counters, so a
+    write in one group only retires that group's entries, in every
+    worker.
+    """
+    cache = _cache()
+    group_id = cache.get(('group_of', member_id))
+    if group_id is None:
+        group_id = db.session.query(GroupMember.group_id).filter(GroupMember.id == member_id).scalar()
+        if group_id is None:
+            return None
+        cache.set(('group_of', member_id), group_id)
+
+    member_key = ('member', member_id, current_version(MEMBERS_VERSION.format(group_id)))
+    member = cache.get(member_key)
+    if member is None:
+        member = _build_member(member_id)
+        if member is None:
+            cache.pop(('group_of', member_id))
+            return None
+        cache.set(member_key, member)
+
+    group_key = ('group', group_id, current_version(GROUP_VERSION.format(group_id)))
+    group = cache.get(group_key)
+    if group is None:
+        group = db.session.get(SavingsGroup, group_id).to_json()
+        cache.set(group_key, group)
+
+    return dict(member, group=group)
+
+
+def _bump_once(session, name):
+    if name not in session.info.get('bumped_cache_versions', ()):
+        bump_version(name, session)
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_dashboard_versions(session, flush_context):
+    """Retire the cached dashboards of groups touched by this flush"""
+    members, groups, member_ids, saving_ids = set(), set(), set(), set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, SavingsGroup):
+            groups.add(obj.id)
+        elif isinstance(obj, (GroupMember, GroupLoan)):
+            # Officers and has_active_loan appear in the group part too
+            members.add(obj.group_id)
+            groups.add(obj.group_id)
+        elif isinstance(obj, MeetingAttendance):
+            members.add(obj.group_id)
+        elif isinstance(obj, (MemberSaving, MemberFine)):
+            member_ids.add(obj.member_id)
+        elif isinstance(obj, SavingTransaction):
+            saving_ids.add(obj.member_saving_id)
+    if member_ids:
+        members.update(group_id for group_id, in session.execute(
+            select(GroupMember.group_id).where(GroupMember.id.in_(member_ids))
+        ))
+    if saving_ids:
+        members.update(group_id for group_id, in session.execute(
+            select(GroupMember.group_id).join(MemberSaving, MemberSaving.member_id == GroupMember.id)
+            .where(MemberSaving.id.in_(saving_ids))
+        ))
+    for group_id in members - {None}:
+        _bump_once(session, MEMBERS_VERSION.format(group_id))
+    for group_id in groups - {None}:
+        _bump_once(session, GROUP_VERSION.format(group_id))
@@ -32,12 +32,14 @@ class User(db.Model):
     managed_services = db.relationship('ServiceAdmin', back_populates='admin_user', foreign_keys='ServiceAdmin.user_id', cascade='all, delete-orphan')
     access_requests = db.relationship('ServiceAccessRequest', back_populates='user', foreign_keys='ServiceAccessRequest.user_id', cascade='all, delete-orphan')
 
-    def __init__(self, username, email, password):
+    def __init__(self, username, email, password=None, password_hash=None):
         self.username = username
         self.email = email
-        self.password = bcrypt.generate_password_hash(
-            password, current_app.config.get('BCRYPT_LOG_ROUNDS')
-        ).decode()
+        if password_hash is None:
+            password_hash = bcrypt.generate_password_hash(
+                password, current_app.config.get('BCRYPT_LOG_ROUNDS')
+            ).decode()
+        self.password = password_hash
 
     def check_password(self, password):
         """Check if provided password matches the hashed password."""
@@ -67,10 +69,19 @@ class User(db.Model):
         """
         Decodes the auth token - :param auth_token: - :return: integer|string
         """
+        payload = User.decode_auth_payload(auth_token)
+        if isinstance(payload, str):
+            return payload
+        return payload['sub']
+
+    @staticmethod
+    def decode_auth_payload(auth_token):
+        """
+        Verifies the auth token - :param auth_token: - :return: dict|string
+        """
         try:
-            payload = jwt.decode(
+            return jwt.decode(
                 auth_token, current_app.config.get('SECRET_KEY'), algorithms=['HS256'])
-            return payload['sub']
         except jwt.ExpiredSignatureError:
             return 'Signature expired. Please log in again.'
         except jwt.InvalidTokenError:
@@ -100,29 +111,16 @@ class User(db.Model):
         if self.is_super_admin:
             return True
 
-        # Check if user is admin of this service
-        for managed_service in self.managed_services:
-            if managed_service.service.name == service_name:
-                return True
-
-        # Check specific permissions
-        for perm in self.service_permissions:
-            if perm.service.name == service_name:
-                permissions = perm.permissions.split(',') if perm.permissions else []
-                return permission_type in permissions
-
-        return False
+        from project.api.permission_cache import get_permission_matrix
+        return get_permission_matrix(self.id).allows(service_name, permission_type)
 
     def is_service_admin(self, service_name):
         """Check if user is admin of a specific service"""
         if self.is_super_admin:
             return True
 
-        for managed_service in self.managed_services:
-            if managed_service.service.name == service_name:
-                return True
-
-        return False
+        from project.api.permission_cache import get_permission_matrix
+        return get_permission_matrix(self.id).is_admin_of(service_name)
 
 
 class Service(db.Model):
@@ -248,6 +246,201 @@ class ServiceAccessRequest(db.Model):
         }
 
 
+class CacheVersion(db.Model):
+    """Named counters bumped to invalidate in-process caches in every worker"""
+
+    __tablename__ = "cache_versions"
+
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, default=0, nullable=False)
+    updated_date = db.Column(db.DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class IdempotencyKey(db.Model):
+    """Stored response of a write made under a client idempotency key.
+
+    Kept until expires_at so retries can be answered without repeating the
+    write; expired rows are purged in the background.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    scope = db.Column(db.String(64), primary_key=True)
+    key = db.Column(db.String(255), primary_key=True)
+    response_body = db.Column(db.Text, nullable=False)  # JSON
+    created_date = db.Column(db.DateTime, default=func.now(), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        db.Index('idx_idempotency_keys_expires', 'expires_at'),
+    )
+
+
+class OutboxEvent(db.Model):
+    """Side effect of a write, stored in the same transaction as the write.
+
+    A dispatcher delivers pending events (notifications, calendar events,
+    real-time broadcasts) in batches after the request has returned.
+    """
+
+    __tablename__ = "outbox_events"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    event_type = db.Column(db.String(50), nullable=False)  # notification, calendar_event, broadcast
+    payload = db.Column(db.Text, nullable=False)  # JSON
+    status = db.Column(db.String(20), default='PENDING', nullable=False)  # PENDING, DELIVERED, FAILED
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    last_error = db.Column(db.Text, nullable=True)
+    created_date = db.Column(db.DateTime, default=func.now(), nullable=False)
+    available_at = db.Column(db.DateTime, default=func.now(), nullable=False)  # not retried before
+    delivered_date = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index('idx_outbox_events_status', 'status', 'available_at', 'id'),
+    )
+
+
+class PlatformStat(db.Model):
+    """Platform totals for the groups in one state and region.
+
+    Adjusted by every flush that adds or changes groups, members or member
+    savings; the platform_stats.reconcile job recomputes it from scratch.
+    """
+
+    __tablename__ = "platform_stats"
+
+    state = db.Column(db.String(50), primary_key=True)
+    region = db.Column(db.String(100), primary_key=True)  # '' when the group has none
+    groups_count = db.Column(db.Integer, default=0, nullable=False)
+    members_count = db.Column(db.Integer, default=0, nullable=False)  # active members
+    total_savings = db.Column(db.Numeric(15, 2), default=0.00, nullable=False)  # sum of member balances
+    updated_date = db.Column(db.DateTime, default=func.now(), nullable=False)
+    reconciled_date = db.Column(db.DateTime, nullable=True)
+
+
+class BackgroundJob(db.Model):
+    """Queued call of a registered job function, run by manage.py run_workers.
+
+    Workers claim a QUEUED row with a conditional UPDATE; failed runs are
+    requeued with backoff until max_attempts.
+    """
+
+    __tablename__ = "background_jobs"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    name = db.Column(db.String(100), nullable=False)  # registered job name
+    args = db.Column(db.Text, nullable=False)  # JSON keyword arguments
+    status = db.Column(db.String(20), default='QUEUED', nullable=False)  # QUEUED, RUNNING, SUCCEEDED, FAILED
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    max_attempts = db.Column(db.Integer, default=3, nullable=False)
+    run_at = db.Column(db.DateTime, nullable=False)  # not started before
+    locked_by = db.Column(db.String(100), nullable=True)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    duration_ms = db.Column(db.Integer, nullable=True)  # of the last attempt
+    result = db.Column(db.Text, nullable=True)  # JSON
+    last_error = db.Column(db.Text, nullable=True)
+    created_date = db.Column(db.DateTime, default=func.now(), nullable=False)
+
+    __table_args__ = (
+        db.Index('idx_background_jobs_status', 'status', 'run_at', 'id'),
+        db.Index('idx_background_jobs_name', 'name', 'status'),
+    )
+
+    def to_json(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "args": json.loads(self.args),
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "run_at": self.run_at.isoformat() if self.run_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration_ms": self.duration_ms,
+            "result": json.loads(self.result) if self.result else None,
+            "last_error": self.last_error,
+        }
+
+
+class ProcessingWatermark(db.Model):
+    """Highest source row id an incremental process has consumed, by name"""
+
+    __tablename__ = "processing_watermarks"
+
+    name = db.Column(db.String(100), primary_key=True)  # e.g. group_daily_stats:group_transactions
+    last_id = db.Column(db.Integer, default=0, nullable=False)
+    updated_date = db.Column(db.DateTime, default=func.now(), nullable=False)
+
+
+class GroupDailyStat(db.Model):
+    """One group's activity on one day, for time-series analytics.
+
+    Filled incrementally from the cashbook, fines and attendance by the
+    rollups.group_daily job; closing balances are NULL on days without a
+    posting (carry the last known balance forward).
+    """
+
+    __tablename__ = "group_daily_stats"
+
+    group_id = db.Column(db.Integer, db.ForeignKey('savings_groups.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+
+    # Postings in group_cashbook (active entries, by transaction date)
+    entries_count = db.Column(db.Integer, default=0, nullable=False)
+    deposits = db.Column(db.Numeric(15, 2), default=0.00, nullable=False)  # into the four funds
+    withdrawals = db.Column(db.Numeric(15, 2), default=0.00, nullable=False)
+    loans_disbursed = db.Column(db.Numeric(15, 2), default=0.00, nullable=False)
+    loans_repaid = db.Column(db.Numeric(15, 2), default=0.00, nullable=False)
+    fines_paid = db.Column(db.Numeric(15, 2), default=0.00, nullable=False)
+
+    # Closing fund balances: those of the day's last cashbook entry
+    individual_balance = db.Column(db.Numeric(15, 2), nullable=True)
+    ecd_balance = db.Column(db.Numeric(15, 2), nullable=True)
+    social_balance = db.Column(db.Numeric(15, 2), nullable=True)
+    target_balance = db.Column(db.Numeric(15, 2), nullable=True)
+    total_balance = db.Column(db.Numeric(15, 2), nullable=True)
+
+    # From member_fines (by imposed date) and meeting_attendance
+    fines_count = db.Column(db.Integer, default=0, nullable=False)
+    fines_amount = db.Column(db.Numeric(15, 2), default=0.00, nullable=False)
+    meetings_held = db.Column(db.Integer, default=0, nullable=False)
+    attendance_records = db.Column(db.Integer, default=0, nullable=False)
+    attendance_present = db.Column(db.Integer, default=0, nullable=False)
+
+    updated_date = db.Column(db.DateTime, default=func.now(), nullable=False)
+
+    __table_args__ = (
+        db.Index('idx_group_daily_stats_day', 'day'),
+    )
+
+    def to_json(self):
+        def amount(value):
+            return float(value) if value is not None else None
+
+        return {
+            "group_id": self.group_id,
+            "day": self.day.isoformat(),
+            "entries_count": self.entries_count,
+            "deposits": amount(self.deposits),
+            "withdrawals": amount(self.withdrawals),
+            "loans_disbursed": amount(self.loans_disbursed),
+            "loans_repaid": amount(self.loans_repaid),
+            "fines_paid": amount(self.fines_paid),
+            "individual_balance": amount(self.individual_balance),
+            "ecd_balance": amount(self.ecd_balance),
+            "social_balance": amount(self.social_balance),
+            "target_balance": amount(self.target_balance),
+            "total_balance": amount(self.total_balance),
+            "fines_count": self.fines_count,
+            "fines_amount": amount(self.fines_amount),
+            "meetings_held": self.meetings_held,
+            "attendance_records": self.attendance_records,
+            "attendance_present": self.attendance_present,
+        }
+
+
 class Notification(db.Model):
     """Cross-service notification system"""
 
@@ -280,6 +473,11 @@ class Notification(db.Model):
     service = db.relationship('Service', foreign_keys=[service_id])
     creator = db.relationship('User', foreign_keys=[created_by])
 
+    # Keyset pagination of a user's notifications
+    __table_args__ = (
+        db.Index('idx_notifications_user_date', 'user_id', 'created_date', 'id'),
+    )
+
     def __init__(self, user_id, message, type='info', title=None, service_id=None, created_by=None, action_url=None, action_data=None, expires_at=None):
         self.user_id = user_id
         self.message = message
@@ -296,28 +494,30 @@ class Notification(db.Model):
         self.read = True
         self.read_date = func.now()
 
+    JSON_FIELDS = {
+        "id": lambda self: self.id,
+        "user_id": lambda self: self.user_id,
+        "service": lambda self: {
+            "id": self.service.id,
+            "name": self.service.name
+        } if self.service else None,
+        "type": lambda self: self.type,
+        "title": lambda self: self.title,
+        "message": lambda self: self.message,
+        "read": lambda self: self.read,
+        "read_date": lambda self: self.read_date.isoformat() if self.read_date else None,
+        "created_date": lambda self: self.created_date.isoformat() if self.created_date else None,
+        "creator": lambda self: {
+            "id": self.creator.id,
+            "username": self.creator.username
+        } if self.creator else None,
+        "action_url": lambda self: self.action_url,
+        "action_data": lambda self: self.action_data,
+        "expires_at": lambda self: self.expires_at.isoformat() if self.expires_at else None,
+    }
+
     def to_json(self):
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "service": {
-                "id": self.service.id,
-                "name": self.service.name
-            } if self.service else None,
-            "type": self.type,
-            "title": self.title,
-            "message": self.message,
-            "read": self.read,
-            "read_date": self.read_date.isoformat() if self.read_date else None,
-            "created_date": self.created_date.isoformat() if self.created_date else None,
-            "creator": {
-                "id": self.creator.id,
-                "username": self.creator.username
-            } if self.creator else None,
-            "action_url": self.action_url,
-            "action_data": self.action_data,
-            "expires_at": self.expires_at.isoformat() if self.expires_at else None
-        }
+        return {name: render(self) for name, render in self.JSON_FIELDS.items()}
 
 
 class SavingsGroup(db.Model):
@@ -331,7 +531,8 @@ class SavingsGroup(db.Model):
     
     # Enhanced location information
     country = db.Column(db.String(100), nullable=True)
-    region = db.Column(db.String(100), nullable=True)
+    # active_history: platform_stats needs the value being replaced
+    region = db.column_property(db.Column(db.String(100), nullable=True), active_history=True)
     district = db.Column(db.String(100), nullable=False)
     parish = db.Column(db.String(100), nullable=False)
     village = db.Column(db.String(100), nullable=False)
@@ -345,7 +546,8 @@ class SavingsGroup(db.Model):
     
     # Group lifecycle
     formation_date = db.Column(db.Date, nullable=False)
-    state = db.Column(db.String(50), nullable=False, default='FORMING')  # FORMING, ACTIVE, MATURE, ELIGIBLE_FOR_LOAN, LOAN_ACTIVE, CLOSED
+    # active_history: platform_stats needs the value being replaced
+    state = db.column_property(db.Column(db.String(50), nullable=False, default='FORMING'), active_history=True)  # FORMING, ACTIVE, MATURE, ELIGIBLE_FOR_LOAN, LOAN_ACTIVE, CLOSED
     
     # Financial information
     savings_balance = db.Column(db.Numeric(12, 2), default=0.00, nullable=False)
@@ -447,7 +649,10 @@ class SavingsGroup(db.Model):
         # Return the lower of the two
         return min(balance_based, percentage_based)
 
-    def to_json(self):
+    def to_json(self, has_active_loan=None):
+        """Serialize the group; list serializers pass has_active_loan precomputed"""
+        if has_active_loan is None:
+            has_active_loan = self.has_active_loan()
         return {
             "id": self.id,
             "name": self.name,
@@ -472,7 +677,7 @@ class SavingsGroup(db.Model):
             "updated_date": self.updated_date.isoformat() if self.updated_date else None,
             "is_mature": self.is_mature(),
             "loan_limit": self.calculate_loan_limit(),
-            "has_active_loan": self.has_active_loan()
+            "has_active_loan": has_active_loan
         }
 
 
@@ -492,7 +697,8 @@ class GroupMember(db.Model):
     
     # Membership details
     joined_date = db.Column(db.Date, default=func.current_date(), nullable=False)
-    is_active = db.Column(db.Boolean, default=True, nullable=False)
+    # active_history: platform_stats needs the value being replaced
+    is_active = db.column_property(db.Column(db.Boolean, default=True, nullable=False), active_history=True)
     
     # Financial tracking
     share_balance = db.Column(db.Numeric(12, 2), default=0.00, nullable=False)
@@ -547,23 +753,25 @@ class GroupMember(db.Model):
             return 'secretary'
         return None
 
+    JSON_FIELDS = {
+        "id": lambda self: self.id,
+        "group_id": lambda self: self.group_id,
+        "user_id": lambda self: self.user_id,
+        "name": lambda self: self.name,
+        "gender": lambda self: self.gender,
+        "phone": lambda self: self.phone,
+        "joined_date": lambda self: self.joined_date.isoformat() if self.joined_date else None,
+        "is_active": lambda self: self.is_active,
+        "share_balance": lambda self: float(self.share_balance),
+        "total_contributions": lambda self: float(self.total_contributions),
+        "role": lambda self: self.role,
+        "officer_role": lambda self: self.get_officer_role(),
+        "is_officer": lambda self: self.is_officer(),
+        "created_date": lambda self: self.created_date.isoformat() if self.created_date else None,
+    }
+
     def to_json(self):
-        return {
-            "id": self.id,
-            "group_id": self.group_id,
-            "user_id": self.user_id,
-            "name": self.name,
-            "gender": self.gender,
-            "phone": self.phone,
-            "joined_date": self.joined_date.isoformat() if self.joined_date else None,
-            "is_active": self.is_active,
-            "share_balance": float(self.share_balance),
-            "total_contributions": float(self.total_contributions),
-            "role": self.role,
-            "officer_role": self.get_officer_role(),
-            "is_officer": self.is_officer(),
-            "created_date": self.created_date.isoformat() if self.created_date else None
-        }
+        return {name: render(self) for name, render in self.JSON_FIELDS.items()}
 
 
 class GroupLoan(db.Model):
@@ -753,6 +961,7 @@ class GroupTransaction(db.Model):
         db.CheckConstraint('amount != 0', name='check_non_zero_amount'),
         db.CheckConstraint('group_balance_after >= 0', name='check_positive_group_balance'),
         db.CheckConstraint("type IN ('SAVING_CONTRIBUTION', 'WITHDRAWAL', 'LOAN_DISBURSEMENT', 'LOAN_REPAYMENT', 'PENALTY', 'INTEREST')", name='check_valid_transaction_type'),
+        db.Index('idx_group_transactions_group_date', 'group_id', 'processed_date', 'id'),
     )
 
     def __init__(self, group_id, type, amount, processed_by, member_id=None, loan_id=None, description=None, idempotency_key=None, transaction_metadata=None):
@@ -766,24 +975,26 @@ class GroupTransaction(db.Model):
         self.idempotency_key = idempotency_key
         self.transaction_metadata = transaction_metadata
 
+    JSON_FIELDS = {
+        "id": lambda self: self.id,
+        "group_id": lambda self: self.group_id,
+        "member": lambda self: self.member.name if self.member else None,
+        "loan_id": lambda self: self.loan_id,
+        "type": lambda self: self.type,
+        "amount": lambda self: float(self.amount),
+        "description": lambda self: self.description,
+        "member_balance_before": lambda self: float(self.member_balance_before) if self.member_balance_before else None,
+        "member_balance_after": lambda self: float(self.member_balance_after) if self.member_balance_after else None,
+        "group_balance_before": lambda self: float(self.group_balance_before),
+        "group_balance_after": lambda self: float(self.group_balance_after),
+        "processed_by": lambda self: self.processor.username if self.processor else None,
+        "processed_date": lambda self: self.processed_date.isoformat() if self.processed_date else None,
+        "idempotency_key": lambda self: self.idempotency_key,
+        "metadata": lambda self: self.transaction_metadata,
+    }
+
     def to_json(self):
-        return {
-            "id": self.id,
-            "group_id": self.group_id,
-            "member": self.member.name if self.member else None,
-            "loan_id": self.loan_id,
-            "type": self.type,
-            "amount": float(self.amount),
-            "description": self.description,
-            "member_balance_before": float(self.member_balance_before) if self.member_balance_before else None,
-            "member_balance_after": float(self.member_balance_after) if self.member_balance_after else None,
-            "group_balance_before": float(self.group_balance_before),
-            "group_balance_after": float(self.group_balance_after),
-            "processed_by": self.processor.username if self.processor else None,
-            "processed_date": self.processed_date.isoformat() if self.processed_date else None,
-            "idempotency_key": self.idempotency_key,
-            "metadata": self.transaction_metadata
-        }
+        return {name: render(self) for name, render in self.JSON_FIELDS.items()}
 
 class SavingType(db.Model):
     """Configurable saving types for different purposes"""
@@ -847,7 +1058,8 @@ class MemberSaving(db.Model):
     saving_type_id = db.Column(db.Integer, db.ForeignKey('saving_types.id'), nullable=False)
     
     # Saving details
-    current_balance = db.Column(db.Numeric(12, 2), default=0.00, nullable=False)
+    # active_history: platform_stats needs the value being replaced
+    current_balance = db.column_property(db.Column(db.Numeric(12, 2), default=0.00, nullable=False), active_history=True)
     target_amount = db.Column(db.Numeric(12, 2), nullable=True)  # For target savings
     target_date = db.Column(db.Date, nullable=True)
     target_description = db.Column(db.Text, nullable=True)
@@ -954,6 +1166,7 @@ class SavingTransaction(db.Model):
         db.CheckConstraint('balance_after >= 0', name='check_positive_balance_after'),
         db.CheckConstraint("transaction_type IN ('DEPOSIT', 'WITHDRAWAL')", name='check_valid_saving_transaction_type'),
         db.CheckConstraint("status IN ('PENDING', 'VERIFIED', 'REJECTED')", name='check_valid_saving_status'),
+        db.Index('idx_saving_transactions_saving_date', 'member_saving_id', 'processed_date', 'id'),
     )
 
     def __init__(self, member_saving_id, amount, transaction_type, processed_by, description=None, mobile_money_transaction_id=None, mobile_money_provider=None, mobile_money_phone=None, idempotency_key=None):
@@ -998,8 +1211,11 @@ class MeetingAttendance(db.Model):
     member_id = db.Column(db.Integer, db.ForeignKey('group_members.id'), nullable=False)
     
     # Meeting details
-    meeting_date = db.Column(db.Date, nullable=False)
-    meeting_type = db.Column(db.String(50), default='REGULAR', nullable=False)  # REGULAR, SPECIAL, ANNUAL
+    # active_history: calendar_projection needs the meeting being left
+    meeting_date = db.column_property(db.Column(db.Date, nullable=False), active_history=True)
+    meeting_type = db.column_property(
+        db.Column(db.String(50), default='REGULAR', nullable=False), active_history=True
+    )  # REGULAR, SPECIAL, ANNUAL
     
     # Attendance tracking
     attended = db.Column(db.Boolean, default=False, nullable=False)
@@ -1174,6 +1390,7 @@ class GroupCashbook(db.Model):
         db.CheckConstraint('total_balance >= 0', name='check_positive_total_balance'),
         db.CheckConstraint("entry_type IN ('DEPOSIT', 'WITHDRAWAL', 'LOAN', 'FINE', 'INTEREST', 'TRANSFER')", name='check_valid_entry_type'),
         db.CheckConstraint("status IN ('ACTIVE', 'REVERSED', 'CORRECTED')", name='check_valid_cashbook_status'),
+        db.Index('idx_cashbook_group_date', 'group_id', 'transaction_date', 'id'),
     )
 
     def __init__(self, group_id, transaction_date, description, entry_type, created_by, member_id=None, reference_number=None):
@@ -1221,6 +1438,69 @@ class GroupCashbook(db.Model):
         }
 
 
+class GroupCashbookHead(db.Model):
+    """Current running balances of a group's cashbook, one row per group.
+
+    Locked with SELECT ... FOR UPDATE while appending an entry, so appends
+    cost O(1) and concurrent postings in one group serialize on this row.
+    """
+
+    __tablename__ = "group_cashbook_heads"
+
+    group_id = db.Column(db.Integer, db.ForeignKey('savings_groups.id'), primary_key=True)
+    last_entry_id = db.Column(db.Integer, db.ForeignKey('group_cashbook.id'), nullable=True)
+
+    individual_balance = db.Column(db.Numeric(12, 2), default=0.00, nullable=False)
+    ecd_balance = db.Column(db.Numeric(12, 2), default=0.00, nullable=False)
+    social_balance = db.Column(db.Numeric(12, 2), default=0.00, nullable=False)
+    target_balance = db.Column(db.Numeric(12, 2), default=0.00, nullable=False)
+    total_balance = db.Column(db.Numeric(12, 2), default=0.00, nullable=False)
+
+    updated_date = db.Column(db.DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+    def advance(self, entry):
+        """Move the head to a newly appended entry"""
+        self.last_entry_id = entry.id
+        self.individual_balance = entry.individual_balance
+        self.ecd_balance = entry.ecd_balance
+        self.social_balance = entry.social_balance
+        self.target_balance = entry.target_balance
+        self.total_balance = entry.total_balance
+
+
+class GroupCashbookCheckpoint(db.Model):
+    """Balances of a group's cashbook at the end of a day or month.
+
+    The balances are those of the latest active entry (by transaction_date,
+    id) dated on or before period_end, written as entries are posted so that
+    as-of questions need not search the ledger.
+    """
+
+    __tablename__ = "group_cashbook_checkpoints"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    group_id = db.Column(db.Integer, db.ForeignKey('savings_groups.id'), nullable=False)
+    period = db.Column(db.String(10), nullable=False)  # DAY, MONTH
+    period_end = db.Column(db.Date, nullable=False)
+
+    last_entry_id = db.Column(db.Integer, db.ForeignKey('group_cashbook.id'), nullable=True)
+    last_entry_date = db.Column(db.Date, nullable=False)
+
+    individual_balance = db.Column(db.Numeric(12, 2), default=0.00, nullable=False)
+    ecd_balance = db.Column(db.Numeric(12, 2), default=0.00, nullable=False)
+    social_balance = db.Column(db.Numeric(12, 2), default=0.00, nullable=False)
+    target_balance = db.Column(db.Numeric(12, 2), default=0.00, nullable=False)
+    total_balance = db.Column(db.Numeric(12, 2), default=0.00, nullable=False)
+
+    updated_date = db.Column(db.DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+    # Constraints
+    __table_args__ = (
+        db.UniqueConstraint('group_id', 'period', 'period_end', name='unique_cashbook_checkpoint'),
+        db.CheckConstraint("period IN ('DAY', 'MONTH')", name='check_valid_checkpoint_period'),
+    )
+
+
 class LoanAssessment(db.Model):
     """Assess member eligibility for loans based on saving parameters"""
 
@@ -1866,6 +2146,12 @@ class CalendarEvent(db.Model):
     reference_type = db.Column(db.String(50))  # transaction, loan, meeting, etc
     location = db.Column(db.String(255))  # Event location
 
+    # The group's location hierarchy, copied so location filters need no join
+    region = db.Column(db.String(100))
+    district = db.Column(db.String(100))
+    parish = db.Column(db.String(100))
+    village = db.Column(db.String(100))
+
     # Related entity IDs for drill-down functionality
     related_transaction_id = db.Column(db.Integer)
     related_loan_id = db.Column(db.Integer)
@@ -1894,6 +2180,12 @@ class CalendarEvent(db.Model):
         db.Index('idx_calendar_fund_type', 'fund_type'),
         db.Index('idx_calendar_gender', 'member_gender'),
         db.Index('idx_calendar_role', 'member_role'),
+        db.Index('idx_calendar_region_date', 'region', 'event_date'),
+        db.Index('idx_calendar_district_date', 'district', 'event_date'),
+        db.Index('idx_calendar_parish_date', 'parish', 'event_date'),
+        db.Index('idx_calendar_village_type_date', 'village', 'event_type', 'event_date'),
+        # One projected event per source row (see calendar_projection)
+        db.Index('idx_calendar_reference', 'reference_type', 'reference_id', unique=True),
     )
     
     def __init__(self, title, event_type, event_date, group_id, **kwargs):
@@ -1907,39 +2199,41 @@ class CalendarEvent(db.Model):
             if hasattr(self, key):
                 setattr(self, key, value)
     
+    JSON_FIELDS = {
+        "id": lambda self: self.id,
+        "title": lambda self: self.title,
+        "description": lambda self: self.description,
+        "event_type": lambda self: self.event_type,
+        "event_date": lambda self: self.event_date.isoformat() if self.event_date else None,
+        "event_time": lambda self: self.event_time.isoformat() if self.event_time else None,
+        "group_id": lambda self: self.group_id,
+        "group_name": lambda self: self.group.name if self.group else None,
+        "user_id": lambda self: self.user_id,
+        "amount": lambda self: float(self.amount) if self.amount else None,
+        "fund_type": lambda self: self.fund_type,
+        "verification_status": lambda self: self.verification_status,
+        "member_gender": lambda self: self.member_gender,
+        "member_role": lambda self: self.member_role,
+        "mobile_money_provider": lambda self: self.mobile_money_provider,
+        "reference_id": lambda self: self.reference_id,
+        "reference_type": lambda self: self.reference_type,
+        "location": lambda self: self.location,
+        "related_transaction_id": lambda self: self.related_transaction_id,
+        "related_loan_id": lambda self: self.related_loan_id,
+        "related_campaign_id": lambda self: self.related_campaign_id,
+        "related_fine_id": lambda self: self.related_fine_id,
+        "meeting_type": lambda self: self.meeting_type,
+        "attendees_count": lambda self: self.attendees_count,
+        "total_members": lambda self: self.total_members,
+        "created_date": lambda self: self.created_date.isoformat() if self.created_date else None,
+        "group_district": lambda self: self.district,
+        "group_parish": lambda self: self.parish,
+        "group_village": lambda self: self.village,
+        "group_region": lambda self: self.region,
+    }
+
     def to_json(self):
-        return {
-            "id": self.id,
-            "title": self.title,
-            "description": self.description,
-            "event_type": self.event_type,
-            "event_date": self.event_date.isoformat() if self.event_date else None,
-            "event_time": self.event_time.isoformat() if self.event_time else None,
-            "group_id": self.group_id,
-            "group_name": self.group.name if self.group else None,
-            "user_id": self.user_id,
-            "amount": float(self.amount) if self.amount else None,
-            "fund_type": self.fund_type,
-            "verification_status": self.verification_status,
-            "member_gender": self.member_gender,
-            "member_role": self.member_role,
-            "mobile_money_provider": self.mobile_money_provider,
-            "reference_id": self.reference_id,
-            "reference_type": self.reference_type,
-            "location": self.location,
-            "related_transaction_id": self.related_transaction_id,
-            "related_loan_id": self.related_loan_id,
-            "related_campaign_id": self.related_campaign_id,
-            "related_fine_id": self.related_fine_id,
-            "meeting_type": self.meeting_type,
-            "attendees_count": self.attendees_count,
-            "total_members": self.total_members,
-            "created_date": self.created_date.isoformat() if self.created_date else None,
-            "group_district": self.group.district if self.group else None,
-            "group_parish": self.group.parish if self.group else None,
-            "group_village": self.group.village if self.group else None,
-            "group_region": self.group.region if self.group else None,
-        }
+        return {name: render(self) for name, render in self.JSON_FIELDS.items()}
 
 
 # ============================================================================
@@ -2136,37 +2430,39 @@ class Meeting(db.Model):
         self.quorum_met = attendance_percentage >= required_percentage
         return self.quorum_met
 
+    JSON_FIELDS = {
+        "id": lambda self: self.id,
+        "group_id": lambda self: self.group_id,
+        "meeting_number": lambda self: self.meeting_number,
+        "meeting_date": lambda self: self.meeting_date.isoformat() if self.meeting_date else None,
+        "meeting_type": lambda self: self.meeting_type,
+        "status": lambda self: self.status,
+        "start_time": lambda self: self.start_time.isoformat() if self.start_time else None,
+        "end_time": lambda self: self.end_time.isoformat() if self.end_time else None,
+        "leadership": lambda self: {
+            "chairperson": self.chairperson.name if self.chairperson else None,
+            "secretary": self.secretary.name if self.secretary else None,
+            "treasurer": self.treasurer.name if self.treasurer else None
+        },
+        "attendance": lambda self: {
+            "total_members": self.total_members,
+            "members_present": self.members_present,
+            "quorum_met": self.quorum_met,
+            "attendance_percentage": round((self.members_present / self.total_members * 100), 2) if self.total_members > 0 else 0
+        },
+        "financial_summary": lambda self: {
+            "total_savings_collected": float(self.total_savings_collected),
+            "loans_disbursed_count": self.loans_disbursed_count,
+            "loans_disbursed_amount": float(self.loans_disbursed_amount),
+            "fines_imposed_count": self.fines_imposed_count,
+            "fines_imposed_amount": float(self.fines_imposed_amount)
+        },
+        "next_meeting_date": lambda self: self.next_meeting_date.isoformat() if self.next_meeting_date else None,
+        "created_date": lambda self: self.created_date.isoformat() if self.created_date else None,
+    }
+
     def to_json(self):
-        return {
-            "id": self.id,
-            "group_id": self.group_id,
-            "meeting_number": self.meeting_number,
-            "meeting_date": self.meeting_date.isoformat() if self.meeting_date else None,
-            "meeting_type": self.meeting_type,
-            "status": self.status,
-            "start_time": self.start_time.isoformat() if self.start_time else None,
-            "end_time": self.end_time.isoformat() if self.end_time else None,
-            "leadership": {
-                "chairperson": self.chairperson.name if self.chairperson else None,
-                "secretary": self.secretary.name if self.secretary else None,
-                "treasurer": self.treasurer.name if self.treasurer else None
-            },
-            "attendance": {
-                "total_members": self.total_members,
-                "members_present": self.members_present,
-                "quorum_met": self.quorum_met,
-                "attendance_percentage": round((self.members_present / self.total_members * 100), 2) if self.total_members > 0 else 0
-            },
-            "financial_summary": {
-                "total_savings_collected": float(self.total_savings_collected),
-                "loans_disbursed_count": self.loans_disbursed_count,
-                "loans_disbursed_amount": float(self.loans_disbursed_amount),
-                "fines_imposed_count": self.fines_imposed_count,
-                "fines_imposed_amount": float(self.fines_imposed_amount)
-            },
-            "next_meeting_date": self.next_meeting_date.isoformat() if self.next_meeting_date else None,
-            "created_date": self.created_date.isoformat() if self.created_date else None
-        }
+        return {name: render(self) for name, render in self.JSON_FIELDS.items()}
 
 
 # ============================================================================
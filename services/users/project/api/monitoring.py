@@ -10,6 +10,8 @@ from sqlalchemy import text
 from project import db
 from project.monitoring import aurora_monitor, get_monitoring_data
 from project.aurora_config import aurora_config
+from project.api.hashing import get_password_hasher
+from project.api.jobs import job_metrics
 
 monitoring_blueprint = Blueprint('monitoring', __name__)
 
@@ -109,6 +111,22 @@ def alerts():
         'message': 'Authentication required'
     }), 401
 
+@monitoring_blueprint.route('/monitoring/hashing', methods=['GET'])
+def hashing_pool():
+    """Password hashing pool load: in-flight jobs, queue depth, rejections"""
+    return jsonify({
+        'status': 'success',
+        'data': get_password_hasher().metrics()
+    }), 200
+
+@monitoring_blueprint.route('/monitoring/jobs', methods=['GET'])
+def background_jobs():
+    """Background jobs per name: queued/running/failed counts and run timings"""
+    return jsonify({
+        'status': 'success',
+        'data': job_metrics()
+    }), 200
+
 @monitoring_blueprint.route('/monitoring/ping', methods=['GET'])
 def ping():
     """Simple ping endpoint for load balancers"""
@@ -7,6 +7,11 @@ from datetime import datetime
 from project.api.models import User, Service, Notification
 from project import db
 from project.api.utils import authenticate
+from project.api.principal import get_principal
+from project.api.fieldsets import FieldsetError, parse_fieldset, serialize_with
+from project.api.pagination import (
+    CursorError, keyset_page, wants_cursor, wants_total, cursor_pagination
+)
 
 notifications_blueprint = Blueprint('notifications', __name__)
 
@@ -83,14 +88,19 @@ def create_notification(user_id):
 def get_user_notifications(user_id, target_user_id):
     """Get notifications for a specific user"""
     # Users can only see their own notifications unless they're admin
-    user = User.query.filter_by(id=user_id).first()
-    if not user:
+    principal = get_principal(user_id)
+    if not principal:
         return jsonify({'status': 'fail', 'message': 'User not found.'}), 404
 
     # Check permissions
-    if user_id != target_user_id and not user.admin and not user.is_super_admin:
+    if user_id != target_user_id and not principal.is_admin:
         return jsonify({'status': 'fail', 'message': 'Permission denied.'}), 403
 
+    try:
+        fieldset = parse_fieldset('notification')
+    except FieldsetError as e:
+        return jsonify({'status': 'fail', 'message': str(e)}), 400
+
     # Get query parameters
     unread_only = request.args.get('unread', 'false').lower() == 'true'
     limit = request.args.get('limit', 50, type=int)
@@ -111,13 +121,30 @@ def get_user_notifications(user_id, target_user_id):
     # Order by creation date (newest first)
     query = query.order_by(desc(Notification.created_date))
     
+    page_query = fieldset.apply(query, 'created_date') if fieldset else query
+
+    if wants_cursor(request.args):
+        try:
+            keyset = keyset_page(
+                page_query, Notification.created_date, Notification.id,
+                cursor=request.args.get('cursor'), limit=limit,
+                include_total=wants_total(request.args)
+            )
+        except CursorError as e:
+            return jsonify({'status': 'fail', 'message': str(e)}), 400
+        return jsonify({
+            'status': 'success',
+            'data': serialize_with(fieldset, keyset.items),
+            'pagination': cursor_pagination(keyset, limit)
+        }), 200
+
     # Apply pagination
-    notifications = query.offset(offset).limit(limit).all()
+    notifications = page_query.offset(offset).limit(limit).all()
     total_count = query.count()
 
     return jsonify({
         'status': 'success',
-        'data': [notification.to_json() for notification in notifications],
+        'data': serialize_with(fieldset, notifications),
         'pagination': {
             'total': total_count,
             'limit': limit,
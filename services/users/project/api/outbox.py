@@ -0,0 +1,245 @@
+# services/users/project/api/outbox.py
+
+import json
+from datetime import date, datetime, timedelta
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from project import db, socketio
+from project.api.models import OutboxEvent, Notification, CalendarEvent, Service
+
+
+NOTIFICATION = 'notification'
+CALENDAR_EVENT = 'calendar_event'
+BROADCAST = 'broadcast'
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return float(value)  # Decimal amounts
+
+
+def enqueue(event_type, payload):
+    """Add an outbox event to the current transaction; the caller commits"""
+    event = OutboxEvent(
+        event_type=event_type,
+        payload=json.dumps(payload, default=_json_default),
+        status='PENDING',
+        attempts=0,
+        available_at=datetime.utcnow()
+    )
+    db.session.add(event)
+    return event
+
+
+def notify(user_id, message, notification_type='info', title=None, service='Savings Groups',
+           action_url=None, action_data=None):
+    """Queue a notification for user_id; the service is looked up at delivery"""
+    return enqueue(NOTIFICATION, {
+        'user_id': user_id,
+        'message': message,
+        'type': notification_type,
+        'title': title,
+        'service': service,
+        'action_url': action_url,
+        'action_data': action_data,
+    })
+
+
+def broadcast(event, data, room=None):
+    """Queue a Socket.IO emit, sent once the write has committed.
+
+    With a SOCKETIO_MESSAGE_QUEUE the outbox dispatcher sends it through
+    the queue. Without one only this process can reach its clients, so it
+    is emitted here after the commit.
+    """
+    payload = {'event': event, 'data': data, 'room': room}
+    if current_app.config.get('SOCKETIO_MESSAGE_QUEUE'):
+        return enqueue(BROADCAST, payload)
+    db.session.info.setdefault('outbox_broadcasts', []).append(
+        json.loads(json.dumps(payload, default=_json_default))
+    )
+
+
+def project_calendar_event(title, event_type, event_date, group_id, **fields):
+    """Queue a calendar_events row; fields as accepted by CalendarEvent"""
+    return enqueue(CALENDAR_EVENT, dict(
+        fields, title=title, event_type=event_type, event_date=event_date, group_id=group_id
+    ))
+
+
+def project_group_transaction(transaction, member, group):
+    """Queue the dashboard update for a group transaction.
+
+    The transaction must have been flushed so that it has an id; its
+    calendar event was projected by that flush (see calendar_projection).
+    """
+    broadcast('dashboard_update', {
+        'event_type': 'group_transaction',
+        'data': {
+            'group_id': transaction.group_id,
+            'transaction_id': transaction.id,
+            'type': transaction.type,
+            'amount': transaction.amount,
+            'group_balance_after': transaction.group_balance_after,
+        },
+        'timestamp': None
+    }, room='dashboard')
+
+
+def _deliver_notifications(payloads):
+    names = {payload['service'] for payload in payloads} - {None}
+    services = dict(
+        db.session.query(Service.name, Service.id).filter(Service.name.in_(names))
+    ) if names else {}
+    db.session.add_all([
+        Notification(
+            user_id=payload['user_id'],
+            message=payload['message'],
+            type=payload['type'],
+            title=payload['title'],
+            service_id=services.get(payload['service']),
+            action_url=payload['action_url'],
+            action_data=json.dumps(payload['action_data']) if payload['action_data'] is not None else None
+        )
+        for payload in payloads
+    ])
+
+
+def _deliver_calendar_events(payloads):
+    from project.api import calendar_projection
+
+    events, transactions = [], set()
+    for payload in payloads:
+        if payload.get('related_transaction_id'):
+            # Queued before transactions were projected on flush
+            transactions.add(str(payload['related_transaction_id']))
+            continue
+        fields = dict(payload)
+        fields['event_date'] = date.fromisoformat(fields['event_date'])
+        events.append(CalendarEvent(
+            fields.pop('title'), fields.pop('event_type'), fields.pop('event_date'),
+            fields.pop('group_id'), **fields
+        ))
+    db.session.add_all(events)
+    calendar_projection.project(calendar_projection.TRANSACTION, transactions)
+
+
+# Handlers write their rows into the dispatcher's transaction. Broadcasts
+# have no rows: they are emitted once that transaction has committed.
+HANDLERS = {
+    NOTIFICATION: _deliver_notifications,
+    CALENDAR_EVENT: _deliver_calendar_events,
+    BROADCAST: lambda payloads: None,
+}
+
+
+def _deliver(events):
+    by_type = {}
+    for _, event_type, payload in events:
+        by_type.setdefault(event_type, []).append(payload)
+    for event_type, payloads in by_type.items():
+        handler = HANDLERS.get(event_type)
+        if handler is None:
+            raise ValueError(f'Unknown outbox event type: {event_type}')
+        handler(payloads)
+    db.session.flush()
+
+
+def _mark_delivered(event_ids):
+    db.session.execute(
+        update(OutboxEvent)
+        .where(OutboxEvent.id.in_(event_ids))
+        .values(status='DELIVERED', delivered_date=datetime.utcnow(), last_error=None),
+        execution_options={'synchronize_session': False}
+    )
+
+
+def _mark_failed(event_id, error):
+    max_attempts = current_app.config.get('OUTBOX_MAX_ATTEMPTS', 5)
+    retry_seconds = current_app.config.get('OUTBOX_RETRY_SECONDS', 30)
+    event = db.session.get(OutboxEvent, event_id)
+    event.attempts += 1
+    event.last_error = str(error)[:2000]
+    if event.attempts >= max_attempts:
+        event.status = 'FAILED'
+    else:
+        # Exponential backoff: 30s, 60s, 120s, ...
+        event.available_at = datetime.utcnow() + timedelta(
+            seconds=retry_seconds * 2 ** (event.attempts - 1)
+        )
+
+
+def _emit(events):
+    for _, event_type, payload in events:
+        if event_type == BROADCAST:
+            try:
+                socketio.emit(payload['event'], payload['data'], room=payload['room'])
+            except Exception as e:
+                # Real-time updates are best effort; clients refresh on reconnect
+                current_app.logger.warning(f'Outbox broadcast failed: {e}')
+
+
+@event.listens_for(Session, 'after_commit')
+def _emit_committed_broadcasts(session):
+    payloads = session.info.pop('outbox_broadcasts', None)
+    if payloads and has_app_context():
+        _emit([(None, BROADCAST, payload) for payload in payloads])
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_broadcasts(session):
+    session.info.pop('outbox_broadcasts', None)
+
+
+def dispatch_pending(batch_size=None):
+    """Deliver one batch of due outbox events; returns (delivered, failed).
+
+    The batch is delivered in a single transaction. If that fails the events
+    are retried one by one, so that one bad event only delays itself; it is
+    rescheduled with backoff and marked FAILED after OUTBOX_MAX_ATTEMPTS.
+    Pending rows are claimed with SKIP LOCKED so several dispatchers can run.
+    """
+    if batch_size is None:
+        batch_size = current_app.config.get('OUTBOX_BATCH_SIZE', 100)
+
+    rows = OutboxEvent.query.filter(
+        OutboxEvent.status == 'PENDING',
+        OutboxEvent.available_at <= datetime.utcnow()
+    ).order_by(OutboxEvent.id).limit(batch_size).with_for_update(skip_locked=True).all()
+    events = [(row.id, row.event_type, json.loads(row.payload)) for row in rows]
+    if not events:
+        db.session.rollback()
+        return 0, 0
+
+    try:
+        _deliver(events)
+        _mark_delivered([event[0] for event in events])
+        db.session.commit()
+        _emit(events)
+        return len(events), 0
+    except Exception:
+        db.session.rollback()
+
+    delivered = failed = 0
+    for outbox_event in events:
+        try:
+            # Re-claim: another dispatcher may have taken it since the rollback
+            if not OutboxEvent.query.filter_by(id=outbox_event[0], status='PENDING') \
+                    .with_for_update(skip_locked=True).first():
+                db.session.rollback()
+                continue
+            _deliver([outbox_event])
+            _mark_delivered([outbox_event[0]])
+            db.session.commit()
+            _emit([outbox_event])
+            delivered += 1
+        except Exception as e:
+            db.session.rollback()
+            _mark_failed(outbox_event[0], e)
+            db.session.commit()
+            failed += 1
+    return delivered, failed
@@ -0,0 +1,137 @@
+# services/users/project/api/pagination.py
+
+import base64
+import binascii
+import json
+from collections import namedtuple
+from datetime import date, datetime
+
+from sqlalchemy import and_, or_, func
+
+from project import db
+
+
+class CursorError(ValueError):
+    """Raised for a malformed or tampered cursor token"""
+
+
+KeysetPage = namedtuple('KeysetPage', ['items', 'next_cursor', 'prev_cursor', 'total'])
+
+
+def encode_cursor(sort_value, row_id, direction='next'):
+    """Opaque token for the position (sort_value, row_id) of a (date, id) ordering"""
+    payload = json.dumps([
+        sort_value.isoformat() if sort_value is not None else None,
+        row_id,
+        'n' if direction == 'next' else 'p'
+    ], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, sort_column):
+    """Inverse of encode_cursor -> (sort_value, row_id, direction)"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        raw_value, row_id, direction = json.loads(base64.urlsafe_b64decode(padded))
+        python_type = sort_column.type.python_type
+        if raw_value is None:
+            raise CursorError('Invalid cursor.')
+        if python_type is datetime:
+            sort_value = datetime.fromisoformat(raw_value)
+        elif python_type is date:
+            sort_value = date.fromisoformat(raw_value)
+        else:
+            sort_value = python_type(raw_value)
+        if not isinstance(row_id, int) or direction not in ('n', 'p'):
+            raise CursorError('Invalid cursor.')
+    except (binascii.Error, ValueError, TypeError, NotImplementedError):
+        raise CursorError('Invalid cursor.')
+    return sort_value, row_id, 'next' if direction == 'n' else 'prev'
+
+
+def _sort_key(expression, sort_column):
+    """expression in a form that orders and compares correctly on this database.
+
+    SQLite keeps DATETIME as text, with or without microseconds depending on
+    who wrote the row, so equal instants can compare unequal as strings.
+    """
+    if db.engine.dialect.name == 'sqlite' and sort_column.type.python_type is datetime:
+        return func.julianday(expression)
+    return expression
+
+
+def keyset_page(query, sort_column, id_column, cursor=None, limit=20, include_total=False):
+    """One page of query in (sort_column DESC, id_column DESC) order.
+
+    Instead of OFFSET, the cursor's (sort value, id) becomes a WHERE bound, so
+    every page costs the same index range scan however deep it is. The total
+    is only counted when include_total is set.
+    """
+    total = query.order_by(None).count() if include_total else None
+
+    if cursor:
+        sort_value, row_id, direction = decode_cursor(cursor, sort_column)
+        value = _sort_key(sort_value, sort_column)
+    else:
+        row_id = None
+        direction = 'next'
+
+    bound = _sort_key(sort_column, sort_column)
+    if direction == 'next':
+        if cursor:
+            query = query.filter(or_(
+                bound < value,
+                and_(bound == value, id_column < row_id)
+            ))
+        query = query.order_by(None).order_by(bound.desc(), id_column.desc())
+    else:
+        query = query.filter(or_(
+            bound > value,
+            and_(bound == value, id_column > row_id)
+        )).order_by(None).order_by(bound.asc(), id_column.asc())
+
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == 'prev':
+        rows.reverse()
+
+    sort_key = sort_column.key
+    id_key = id_column.key
+
+    def position(row, towards):
+        return encode_cursor(getattr(row, sort_key), getattr(row, id_key), towards)
+
+    if not rows:
+        return KeysetPage([], None, None, total)
+
+    if direction == 'next':
+        next_cursor = position(rows[-1], 'next') if has_more else None
+        prev_cursor = position(rows[0], 'prev') if cursor else None
+    else:
+        next_cursor = position(rows[-1], 'next')
+        prev_cursor = position(rows[0], 'prev') if has_more else None
+    return KeysetPage(rows, next_cursor, prev_cursor, total)
+
+
+def wants_cursor(args):
+    """Cursor pagination is opted into by passing ?cursor= (empty for the first page)"""
+    return 'cursor' in args
+
+
+def wants_total(args):
+    return args.get('include_total', 'false').lower() == 'true'
+
+
+def cursor_pagination(page, limit):
+    """The pagination block returned alongside a KeysetPage"""
+    pagination = {
+        'limit': limit,
+        'next_cursor': page.next_cursor,
+        'prev_cursor': page.prev_cursor,
+        'has_next': page.next_cursor is not None,
+        'has_prev': page.prev_cursor is not None
+    }
+    if page.total is not None:
+        pagination['total'] = page.total
+    return pagination
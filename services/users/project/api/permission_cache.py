@@ -0,0 +1,87 @@
+# services/users/project/api/permission_cache.py
+
+from collections import namedtuple
+
+from flask import current_app, has_app_context
+
+from project import db
+from project.api.models import Service, ServiceAdmin, UserServicePermission
+from project.api.cache_utils import get_app_cache, current_version, bump_version
+
+
+PERMISSIONS_VERSION = 'permissions'
+
+
+class PermissionMatrix(namedtuple('PermissionMatrix', ['admin_services', 'grants'])):
+    """Compiled permissions of one user.
+
+    admin_services is the set of service names the user administers and
+    grants the set of (service name, permission) pairs from
+    user_service_permissions. Super admin status lives on the user row and is
+    checked by the callers.
+    """
+
+    __slots__ = ()
+
+    def allows(self, service_name, permission_type='read'):
+        return (service_name in self.admin_services
+                or (service_name, permission_type) in self.grants)
+
+    def is_admin_of(self, service_name):
+        return service_name in self.admin_services
+
+
+EMPTY_MATRIX = PermissionMatrix(frozenset(), frozenset())
+
+
+def compile_permission_matrix(user_id):
+    """Build a user's PermissionMatrix from the database (two small queries)"""
+    if user_id is None:
+        return EMPTY_MATRIX
+
+    admin_services = db.session.query(Service.name).join(
+        ServiceAdmin, ServiceAdmin.service_id == Service.id
+    ).filter(ServiceAdmin.user_id == user_id).all()
+
+    permission_rows = db.session.query(
+        Service.name, UserServicePermission.permissions
+    ).join(
+        UserServicePermission, UserServicePermission.service_id == Service.id
+    ).filter(UserServicePermission.user_id == user_id).all()
+
+    grants = set()
+    for service_name, permissions in permission_rows:
+        for permission in (permissions.split(',') if permissions else []):
+            grants.add((service_name, permission))
+
+    return PermissionMatrix(
+        frozenset(name for name, in admin_services), frozenset(grants)
+    )
+
+
+def get_permission_matrix(user_id):
+    """Cached PermissionMatrix for user_id.
+
+    Entries are keyed by (user_id, permissions version), so bumping the
+    version retires every cached matrix in every worker; the TTL bounds how
+    long a change made outside bump_permission_version() can go unnoticed.
+    """
+    if not has_app_context():
+        return compile_permission_matrix(user_id)
+
+    cache = get_app_cache(
+        'permission_matrix',
+        maxsize=current_app.config.get('PERMISSION_CACHE_SIZE', 4096),
+        ttl=current_app.config.get('PERMISSION_CACHE_TTL', 300)
+    )
+    key = (user_id, current_version(PERMISSIONS_VERSION))
+    matrix = cache.get(key)
+    if matrix is None:
+        matrix = compile_permission_matrix(user_id)
+        cache.set(key, matrix)
+    return matrix
+
+
+def bump_permission_version():
+    """Invalidate cached permission matrices; takes effect when the caller commits"""
+    bump_version(PERMISSIONS_VERSION)
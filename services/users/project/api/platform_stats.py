@@ -0,0 +1,237 @@
+# services/users/project/api/platform_stats.py
+
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from project import db
+from project.api.models import PlatformStat, SavingsGroup, GroupMember, MemberSaving
+
+
+ZERO = Decimal('0.00')
+
+
+def _key(state, region):
+    return (state or 'FORMING', region or '')
+
+
+def _old(obj, attr):
+    """Value of attr before the pending change, or the current one if unchanged"""
+    history = inspect(obj).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(obj, attr)
+
+
+def _changed(obj, attr):
+    return inspect(obj).attrs[attr].history.has_changes()
+
+
+def _upsert(connection, deltas, reconciled=False):
+    """Add deltas {(state, region): [groups, members, savings]} to platform_stats"""
+    table = PlatformStat.__table__
+    now = datetime.utcnow()
+    rows = [
+        {'state': state, 'region': region, 'groups_count': groups,
+         'members_count': members, 'total_savings': savings, 'updated_date': now,
+         'reconciled_date': now if reconciled else None}
+        for (state, region), (groups, members, savings) in deltas.items()
+        if groups or members or savings or reconciled
+    ]
+    if not rows:
+        return
+    dialect = postgresql if connection.dialect.name == 'postgresql' else sqlite
+    stmt = dialect.insert(table)
+    if reconciled:
+        set_ = {column: stmt.excluded[column] for column in (
+            'groups_count', 'members_count', 'total_savings', 'updated_date', 'reconciled_date'
+        )}
+    else:
+        set_ = {
+            'groups_count': table.c.groups_count + stmt.excluded.groups_count,
+            'members_count': table.c.members_count + stmt.excluded.members_count,
+            'total_savings': table.c.total_savings + stmt.excluded.total_savings,
+            'updated_date': stmt.excluded.updated_date,
+        }
+    connection.execute(
+        stmt.on_conflict_do_update(index_elements=['state', 'region'], set_=set_), rows
+    )
+
+
+def _group_keys(session, group_ids):
+    """(state, region) as stored in the database, by group id"""
+    if not group_ids:
+        return {}
+    rows = session.execute(
+        select(SavingsGroup.id, SavingsGroup.state, SavingsGroup.region)
+        .where(SavingsGroup.id.in_(group_ids))
+    )
+    return {group_id: _key(state, region) for group_id, state, region in rows}
+
+
+def _member_groups(session, member_ids):
+    if not member_ids:
+        return {}
+    rows = session.execute(
+        select(GroupMember.id, GroupMember.group_id).where(GroupMember.id.in_(member_ids))
+    )
+    return dict(rows.all())
+
+
+def _group_totals(session, group_id):
+    """(active members, member savings) of a group as stored in the database"""
+    members = session.execute(
+        select(func.count(GroupMember.id))
+        .where(GroupMember.group_id == group_id, GroupMember.is_active.is_(True))
+    ).scalar()
+    savings = session.execute(
+        select(func.coalesce(func.sum(MemberSaving.current_balance), 0))
+        .join(GroupMember, MemberSaving.member_id == GroupMember.id)
+        .where(GroupMember.group_id == group_id)
+    ).scalar()
+    return members, Decimal(savings)
+
+
+@event.listens_for(Session, 'after_flush')
+def _apply_deltas(session, flush_context):
+    """Adjust platform_stats for the groups, members and savings just flushed.
+
+    Runs while session.new/dirty/deleted and attribute history still describe
+    the flush, and writes in the same transaction. Member and saving changes
+    count towards their group's current (state, region); a group that changed
+    state or region takes its totals along.
+    """
+    groups, members, savings = [], [], []
+    for kind, objs in (('new', session.new), ('dirty', session.dirty), ('deleted', session.deleted)):
+        for obj in objs:
+            if isinstance(obj, SavingsGroup):
+                groups.append((obj, kind))
+            elif isinstance(obj, GroupMember):
+                members.append((obj, kind))
+            elif isinstance(obj, MemberSaving):
+                savings.append((obj, kind))
+    if not (groups or members or savings):
+        return
+
+    # group id -> [groups, members, savings]
+    by_group = defaultdict(lambda: [0, 0, ZERO])
+    for member, kind in members:
+        was_active = kind != 'new' and _old(member, 'is_active') is not False
+        is_active = kind != 'deleted' and member.is_active is not False
+        if was_active != is_active:
+            by_group[member.group_id][1] += 1 if is_active else -1
+
+    saving_deltas = defaultdict(lambda: ZERO)
+    for saving, kind in savings:
+        if kind == 'new':
+            delta = saving.current_balance or ZERO
+        elif kind == 'deleted':
+            delta = -(_old(saving, 'current_balance') or ZERO)
+        else:
+            delta = (saving.current_balance or ZERO) - (_old(saving, 'current_balance') or ZERO)
+        if delta:
+            saving_deltas[saving.member_id] += Decimal(delta)
+    for member_id, group_id in _member_groups(session, set(saving_deltas)).items():
+        by_group[group_id][2] += saving_deltas[member_id]
+
+    deleted = {}
+    moved = {}  # group id -> key before this flush
+    for group, kind in groups:
+        if kind == 'new':
+            by_group[group.id][0] += 1
+        elif kind == 'deleted':
+            by_group[group.id][0] -= 1
+            deleted[group.id] = _key(_old(group, 'state'), _old(group, 'region'))
+        elif _changed(group, 'state') or _changed(group, 'region'):
+            old_key = _key(_old(group, 'state'), _old(group, 'region'))
+            if old_key != _key(group.state, group.region):
+                moved[group.id] = old_key
+
+    keys = _group_keys(session, set(by_group) | set(moved))
+    keys.update(deleted)
+
+    deltas = defaultdict(lambda: [0, 0, ZERO])
+    for group_id, old_key in moved.items():
+        # The stored totals already include this flush's changes
+        members_now, savings_now = _group_totals(session, group_id)
+        _, member_delta, saving_delta = by_group.pop(group_id, (0, 0, ZERO))
+        old = deltas[old_key]
+        old[0] -= 1
+        old[1] -= members_now - member_delta
+        old[2] -= savings_now - saving_delta
+        new = deltas[keys[group_id]]
+        new[0] += 1
+        new[1] += members_now
+        new[2] += savings_now
+
+    for group_id, (group_delta, member_delta, saving_delta) in by_group.items():
+        if group_id not in keys:
+            continue
+        total = deltas[keys[group_id]]
+        total[0] += group_delta
+        total[1] += member_delta
+        total[2] += saving_delta
+
+    _upsert(session.connection(), deltas)
+
+
+def reconcile():
+    """Recompute platform_stats from groups, members and savings; returns rows written"""
+    active_members = select(
+        GroupMember.group_id, func.count(GroupMember.id).label('members')
+    ).where(GroupMember.is_active.is_(True)).group_by(GroupMember.group_id).subquery()
+    member_savings = select(
+        GroupMember.group_id, func.sum(MemberSaving.current_balance).label('savings')
+    ).join(GroupMember, MemberSaving.member_id == GroupMember.id) \
+        .group_by(GroupMember.group_id).subquery()
+    region = func.coalesce(SavingsGroup.region, '')
+
+    rows = db.session.execute(
+        select(
+            SavingsGroup.state, region, func.count(SavingsGroup.id),
+            func.coalesce(func.sum(active_members.c.members), 0),
+            func.coalesce(func.sum(member_savings.c.savings), 0)
+        )
+        .outerjoin(active_members, active_members.c.group_id == SavingsGroup.id)
+        .outerjoin(member_savings, member_savings.c.group_id == SavingsGroup.id)
+        .group_by(SavingsGroup.state, region)
+    ).all()
+
+    totals = {
+        (state, region): [groups, int(members), Decimal(savings)]
+        for state, region, groups, members, savings in rows
+    }
+    # Keys no group has any more are zeroed rather than deleted
+    for state, region in db.session.execute(select(PlatformStat.state, PlatformStat.region)):
+        totals.setdefault((state, region), [0, 0, ZERO])
+    _upsert(db.session.connection(), totals, reconciled=True)
+    db.session.commit()
+    return len(totals)
+
+
+def platform_summary():
+    """Totals over all platform_stats rows, broken down by state and region"""
+    rows = PlatformStat.query.all()
+    by_state, by_region = defaultdict(int), defaultdict(int)
+    for row in rows:
+        by_state[row.state] += row.groups_count
+        by_region[row.region or 'Unassigned'] += row.groups_count
+    updated = max((row.updated_date for row in rows), default=None)
+    reconciled = max((row.reconciled_date for row in rows if row.reconciled_date), default=None)
+
+    return {
+        'summary': {
+            'total_groups': sum(row.groups_count for row in rows),
+            'total_members': sum(row.members_count for row in rows),
+            'total_savings': float(sum((row.total_savings for row in rows), ZERO)),
+            'active_groups': by_state.get('ACTIVE', 0),
+        },
+        'groups_by_status': {state: count for state, count in by_state.items() if count},
+        'groups_by_region': {region: count for region, count in by_region.items() if count},
+        'stats_updated': updated.isoformat() if updated else None,
+        'stats_reconciled': reconciled.isoformat() if reconciled else None,
+    }
@@ -0,0 +1,283 @@
+# services/users/project/api/portfolio.py
+
+from datetime import datetime
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import select
+
+from project import db
+from project.api.models import (
+    SavingsGroup, GroupMember, MemberSaving, SavingType, GroupTransaction, MeetingAttendance
+)
+from project.api.cache_utils import get_app_cache
+
+
+# Dictionary-encoded dimensions of each table; a fact table also reaches
+# the dimensions of its member and group
+GROUP_DIMENSIONS = ('district', 'parish', 'village', 'region', 'state')
+MEMBER_DIMENSIONS = ('gender', 'role', 'is_active')
+FACT_DIMENSIONS = ('saving_type', 'type')
+
+# measure -> (table, summed column or None to count rows, fixed filter)
+MEASURES = {
+    'members': ('members', None, {'is_active': True}),
+    'savings': ('savings', 'balance', {'is_active': True}),
+    'contributions': ('transactions', 'amount', {'type': 'SAVING_CONTRIBUTION'}),
+    'withdrawals': ('transactions', 'amount', {'type': 'WITHDRAWAL'}),
+    'loans_disbursed': ('transactions', 'amount', {'type': 'LOAN_DISBURSEMENT'}),
+    'attendance': ('attendance', 'attended', {}),
+}
+
+# Above this many possible key combinations, group by the keys that occur
+DENSE_GROUP_LIMIT = 1 << 20
+
+
+class Categorical:
+    """A column stored as int32 codes into a list of distinct values"""
+
+    def __init__(self):
+        self.categories = []
+        self._index = {}
+        self._chunks = []
+        self.codes = None
+
+    def extend(self, values):
+        index = self._index
+
+        def code(value):
+            found = index.get(value)
+            if found is None:
+                found = index[value] = len(self.categories)
+                self.categories.append(value)
+            return found
+
+        self._chunks.append(np.fromiter((code(v) for v in values), dtype=np.int32, count=len(values)))
+
+    def finish(self):
+        self.codes = np.concatenate(self._chunks) if self._chunks else np.empty(0, dtype=np.int32)
+        self._chunks = []
+        return self
+
+
+def _load(connection, statement, numeric=(), categorical=()):
+    """Stream statement into {column: ndarray or Categorical}, chunk by chunk.
+
+    Columns named in numeric become float64 (ids: int64 if named '*_id' or
+    'id'), those in categorical are dictionary-encoded.
+    """
+    chunk_size = current_app.config.get('EXPORT_CHUNK_SIZE', 1000)
+    names = numeric + categorical
+    arrays = {name: [] for name in numeric}
+    categories = {name: Categorical() for name in categorical}
+
+    result = connection.execute(statement.execution_options(yield_per=chunk_size))
+    for partition in result.partitions():
+        columns = dict(zip(names, zip(*partition)))
+        for name in numeric:
+            dtype = np.int64 if name == 'id' or name.endswith('_id') else np.float64
+            arrays[name].append(np.array(
+                [0 if v is None else v for v in columns[name]], dtype=dtype
+            ))
+        for name in categorical:
+            categories[name].extend(columns[name])
+
+    loaded = {
+        name: np.concatenate(chunks) if chunks else np.empty(0)
+        for name, chunks in arrays.items()
+    }
+    loaded.update({name: column.finish() for name, column in categories.items()})
+    return loaded
+
+
+def _link(loaded, ids, foreign_key, name):
+    """Replace loaded[foreign_key] by the row positions in ids, as loaded[name].
+
+    Rows whose key is not in ids (deleted, or created after ids were
+    loaded) are dropped.
+    """
+    keys = loaded.pop(foreign_key)
+    positions = np.searchsorted(ids, keys)
+    found = positions < len(ids)
+    found[found] = ids[positions[found]] == keys[found]
+    for column, values in loaded.items():
+        if isinstance(values, Categorical):
+            values.codes = values.codes[found]
+        else:
+            loaded[column] = values[found]
+    loaded[name] = positions[found]
+    return loaded
+
+
+class PortfolioSnapshot:
+    """Columns of the groups, members, savings, transactions and attendance
+    tables as NumPy arrays, for platform-wide breakdowns.
+
+    Loaded once (see get_snapshot) and reused for many aggregate() calls;
+    group-bys are bincounts over combined dimension codes. The tables are
+    read in one read-only REPEATABLE READ transaction on PostgreSQL, so
+    they agree with each other.
+    """
+
+    def __init__(self):
+        options = {}
+        if db.engine.dialect.name == 'postgresql':
+            options = {'isolation_level': 'REPEATABLE READ', 'postgresql_readonly': True}
+        with db.engine.connect().execution_options(**options) as connection:
+            group_ids, self.groups = self._load_groups(connection)
+            member_ids, self.members = self._load_members(connection, group_ids)
+            self.savings = self._load_savings(connection, member_ids)
+            self.transactions = self._load_transactions(connection, group_ids)
+            self.attendance = self._load_attendance(connection, group_ids)
+            connection.rollback()
+        self.loaded_at = datetime.utcnow()
+
+    @staticmethod
+    def _load_groups(connection):
+        g = SavingsGroup
+        loaded = _load(
+            connection,
+            select(g.id, *(getattr(g, name) for name in GROUP_DIMENSIONS)).order_by(g.id),
+            numeric=('id',), categorical=GROUP_DIMENSIONS
+        )
+        return loaded.pop('id'), loaded
+
+    @staticmethod
+    def _load_members(connection, group_ids):
+        m = GroupMember
+        loaded = _load(
+            connection,
+            select(m.id, m.group_id, *(getattr(m, name) for name in MEMBER_DIMENSIONS)).order_by(m.id),
+            numeric=('id', 'group_id'), categorical=MEMBER_DIMENSIONS
+        )
+        _link(loaded, group_ids, 'group_id', 'group')
+        return loaded.pop('id'), loaded
+
+    @staticmethod
+    def _load_savings(connection, member_ids):
+        loaded = _load(
+            connection,
+            select(
+                MemberSaving.member_id, MemberSaving.current_balance.label('balance'),
+                SavingType.code.label('saving_type'), MemberSaving.is_active
+            ).join(SavingType, SavingType.id == MemberSaving.saving_type_id),
+            numeric=('member_id', 'balance'), categorical=('saving_type', 'is_active')
+        )
+        return _link(loaded, member_ids, 'member_id', 'member')
+
+    @staticmethod
+    def _load_transactions(connection, group_ids):
+        t = GroupTransaction
+        loaded = _load(
+            connection, select(t.group_id, t.amount, t.type),
+            numeric=('group_id', 'amount'), categorical=('type',)
+        )
+        return _link(loaded, group_ids, 'group_id', 'group')
+
+    @staticmethod
+    def _load_attendance(connection, group_ids):
+        a = MeetingAttendance
+        loaded = _load(
+            connection, select(a.group_id, a.attended), numeric=('group_id', 'attended')
+        )
+        return _link(loaded, group_ids, 'group_id', 'group')
+
+    def _table(self, name):
+        tables = {
+            'members': self.members, 'savings': self.savings,
+            'transactions': self.transactions, 'attendance': self.attendance,
+        }
+        if name not in tables:
+            raise ValueError(f'Unknown table: {name}')
+        return tables[name]
+
+    def _dimension(self, table, name):
+        """(codes aligned with table's rows, categories) of dimension name"""
+        column = table.get(name)
+        if isinstance(column, Categorical):
+            return column.codes, column.categories
+        if 'member' in table:
+            if name in self.members and isinstance(self.members[name], Categorical):
+                column = self.members[name]
+                return column.codes[table['member']], column.categories
+            group = self.members['group'][table['member']]
+        elif 'group' in table:
+            group = table['group']
+        else:
+            raise ValueError(f'Unknown dimension: {name}')
+        if name not in GROUP_DIMENSIONS:
+            raise ValueError(f'Unknown dimension: {name}')
+        column = self.groups[name]
+        return column.codes[group], column.categories
+
+    def aggregate(self, table, by=(), value=None, where=None):
+        """Row count and sum of value for each combination of the by
+        dimensions, over rows matching where ({dimension: value or list}).
+
+        Returns [{dimension: value, ..., 'count': n, 'sum': total}], by
+        descending count.
+        """
+        rows = self._table(table)
+        size = len(rows['member'] if 'member' in rows else rows['group'])
+
+        mask = np.ones(size, dtype=bool)
+        for name, wanted in (where or {}).items():
+            codes, categories = self._dimension(rows, name)
+            wanted = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            lookup = {category: i for i, category in enumerate(categories)}
+            mask &= np.isin(codes, [lookup[w] for w in wanted if w in lookup])
+
+        weights = None
+        if value is not None:
+            if value not in rows or isinstance(rows[value], Categorical):
+                raise ValueError(f'Unknown measure column: {value}')
+            weights = rows[value][mask]
+
+        dimensions = [self._dimension(rows, name) for name in by]
+        cardinalities = [max(len(categories), 1) for _, categories in dimensions]
+        keys = np.zeros(int(mask.sum()), dtype=np.int64)
+        for (codes, _), cardinality in zip(dimensions, cardinalities):
+            keys = keys * cardinality + codes[mask]
+
+        total_keys = int(np.prod(cardinalities, dtype=np.int64)) if dimensions else 1
+        if total_keys <= DENSE_GROUP_LIMIT:
+            counts = np.bincount(keys, minlength=total_keys)
+            sums = np.bincount(keys, weights=weights, minlength=total_keys) if weights is not None else None
+            present = np.flatnonzero(counts)
+            counts = counts[present]
+            sums = sums[present] if sums is not None else None
+        else:
+            present, inverse = np.unique(keys, return_inverse=True)
+            counts = np.bincount(inverse)
+            sums = np.bincount(inverse, weights=weights) if weights is not None else None
+
+        codes = np.unravel_index(present, cardinalities) if dimensions else ()
+        result = []
+        for i in np.argsort(-counts, kind='stable'):
+            row = {name: categories[int(code[i])] for name, (_, categories), code
+                   in zip(by, dimensions, codes)}
+            row['count'] = int(counts[i])
+            if sums is not None:
+                row['sum'] = round(float(sums[i]), 2)
+            result.append(row)
+        return result
+
+    def report(self, measure, by=(), where=None):
+        """aggregate() for one of the named MEASURES"""
+        if measure not in MEASURES:
+            raise ValueError(f'Unknown measure: {measure}')
+        table, value, fixed = MEASURES[measure]
+        return self.aggregate(table, by=by, value=value, where=dict(where or {}, **fixed))
+
+
+def get_snapshot(refresh=False):
+    """The process's PortfolioSnapshot, reloaded after PORTFOLIO_SNAPSHOT_TTL"""
+    cache = get_app_cache(
+        'portfolio_snapshot', maxsize=1,
+        ttl=current_app.config.get('PORTFOLIO_SNAPSHOT_TTL', 600)
+    )
+    snapshot = None if refresh else cache.get('snapshot')
+    if snapshot is None:
+        snapshot = PortfolioSnapshot()
+        cache.set('snapshot', snapshot)
+    return snapshot
@@ -0,0 +1,125 @@
+# services/users/project/api/principal.py
+
+from collections import namedtuple
+
+from flask import g, has_app_context
+from sqlalchemy.orm import joinedload
+
+from project.api.models import User, GroupMember
+from project.api.permission_cache import get_permission_matrix
+
+
+# Plain snapshot of an active membership; survives session commits/expiry
+Membership = namedtuple(
+    'Membership', ['member_id', 'group_id', 'role', 'officer_role']
+)
+
+
+class Principal:
+    """The authenticated caller, loaded once per request.
+
+    Holds the user row, the cached permission matrix and the active group
+    memberships (with officer roles), so permission decorators and handlers
+    never have to go back to the database for them.
+    """
+
+    def __init__(self, user, memberships, permission_matrix):
+        self.user = user
+        self.user_id = user.id
+        self.active = user.active
+        self.admin = user.admin
+        self.is_super_admin = user.is_super_admin
+        self.role = user.role
+
+        self.permission_matrix = permission_matrix
+        self.memberships = {
+            member.group_id: Membership(
+                member_id=member.id,
+                group_id=member.group_id,
+                role=member.role,
+                officer_role=_officer_role(member)
+            )
+            for member in memberships
+        }
+
+    @property
+    def is_admin(self):
+        return self.admin or self.is_super_admin
+
+    @property
+    def group_ids(self):
+        return list(self.memberships.keys())
+
+    def has_permission(self, service_name, permission_type='read'):
+        """Same rules as User.has_permission, answered from memory"""
+        if self.is_super_admin:
+            return True
+        return self.permission_matrix.allows(service_name, permission_type)
+
+    def is_service_admin(self, service_name):
+        """Same rules as User.is_service_admin, answered from memory"""
+        return self.is_super_admin or self.permission_matrix.is_admin_of(service_name)
+
+    def membership(self, group_id):
+        """Active membership in the given group, or None"""
+        if group_id is None:
+            return None
+        return self.memberships.get(int(group_id))
+
+    def is_officer(self, group_id=None, officer_roles=None):
+        """Whether the caller holds an officer position (optionally in one group)"""
+        if group_id is not None:
+            candidates = [self.membership(group_id)]
+        else:
+            candidates = self.memberships.values()
+
+        for membership in candidates:
+            if membership and membership.officer_role:
+                if officer_roles is None or membership.officer_role in officer_roles:
+                    return True
+        return False
+
+
+def _officer_role(member):
+    group = member.group
+    if group.chair_member_id == member.id:
+        return 'chair'
+    if group.treasurer_member_id == member.id:
+        return 'treasurer'
+    if group.secretary_member_id == member.id:
+        return 'secretary'
+    return None
+
+
+def load_principal(user_id):
+    """Build a Principal: the user row, its memberships and the cached permissions"""
+    user = User.query.filter(User.id == user_id).first()
+    if not user:
+        return None
+
+    memberships = GroupMember.query.options(
+        joinedload(GroupMember.group)
+    ).filter(
+        GroupMember.user_id == user_id,
+        GroupMember.is_active.is_(True)
+    ).all()
+
+    return Principal(user, memberships, get_permission_matrix(user_id))
+
+
+def get_principal(user_id):
+    """Return the request's cached Principal for user_id, loading it on first use"""
+    if not has_app_context():
+        return load_principal(user_id)
+
+    principal = g.get('_principal')
+    if principal is None or principal.user_id != user_id:
+        principal = load_principal(user_id)
+        g._principal = principal
+    return principal
+
+
+def clear_principal():
+    """Drop the cached Principal, e.g. after changing the caller's own permissions"""
+    if has_app_context():
+        g.pop('_principal', None)
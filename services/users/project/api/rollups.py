@@ -0,0 +1,332 @@
+# services/users/project/api/rollups.py
+
+from collections import namedtuple
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from flask import current_app
+from sqlalchemy import Date, case, delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from project import db
+from project.api.models import (
+    GroupDailyStat, ProcessingWatermark, GroupCashbook, GroupMember, MemberFine,
+    MeetingAttendance
+)
+
+
+# A ledger feeding group_daily_stats. Rows are consumed in id order past
+# the source's watermark; `added` columns are summed into the day's row,
+# `replaced` ones overwrite it.
+Source = namedtuple('Source', 'name id timestamp group_id day statement added replaced')
+
+# Summed over a period by period_totals
+FLOW_COLUMNS = (
+    'entries_count', 'deposits', 'withdrawals', 'loans_disbursed', 'loans_repaid',
+    'fines_paid', 'fines_count', 'fines_amount', 'meetings_held', 'attendance_records',
+    'attendance_present',
+)
+BALANCE_COLUMNS = (
+    'individual_balance', 'ecd_balance', 'social_balance', 'target_balance', 'total_balance',
+)
+
+
+def _cashbook_statement(*where):
+    c = GroupCashbook
+    withdrawal = c.entry_type == 'WITHDRAWAL'
+    funds = c.individual_saving + c.ecd_fund + c.social_fund + c.target_saving
+    withdrawn = (func.abs(c.individual_saving) + func.abs(c.ecd_fund)
+                 + func.abs(c.social_fund) + func.abs(c.target_saving))
+    totals = select(
+        c.group_id, c.transaction_date.label('day'),
+        func.count(c.id).label('entries_count'),
+        func.sum(case((withdrawal, 0), else_=funds)).label('deposits'),
+        func.sum(case((withdrawal, withdrawn), else_=0)).label('withdrawals'),
+        func.sum(c.loan_taken).label('loans_disbursed'),
+        func.sum(c.loan_repayment).label('loans_repaid'),
+        func.sum(c.fines).label('fines_paid'),
+        func.max(c.id).label('last_id'),
+    ).where(c.status == 'ACTIVE', *where).group_by(c.group_id, c.transaction_date).subquery()
+
+    # Entries are ordered by (transaction_date, id): the day's closing
+    # balances are those of its highest id
+    return select(
+        *(column for column in totals.c if column.name != 'last_id'),
+        *(getattr(c, name) for name in BALANCE_COLUMNS)
+    ).join(c, c.id == totals.c.last_id)
+
+
+_fine_day = func.date(MemberFine.imposed_date, type_=Date)
+
+
+def _fine_statement(*where):
+    return select(
+        GroupMember.group_id, _fine_day.label('day'),
+        func.count(MemberFine.id).label('fines_count'),
+        func.sum(MemberFine.amount).label('fines_amount'),
+    ).join(GroupMember, GroupMember.id == MemberFine.member_id) \
+        .where(*where).group_by(GroupMember.group_id, _fine_day)
+
+
+def _attendance_statement(*where):
+    a = MeetingAttendance
+    return select(
+        a.group_id, a.meeting_date.label('day'),
+        func.count(func.distinct(a.meeting_date)).label('meetings_held'),
+        func.count(a.id).label('attendance_records'),
+        func.count(case((a.attended.is_(True), a.id))).label('attendance_present'),
+    ).where(*where).group_by(a.group_id, a.meeting_date)
+
+
+SOURCES = (
+    Source(
+        'group_daily_stats:group_cashbook', GroupCashbook.id, GroupCashbook.created_date,
+        GroupCashbook.group_id, GroupCashbook.transaction_date, _cashbook_statement,
+        added=('entries_count', 'deposits', 'withdrawals', 'loans_disbursed', 'loans_repaid', 'fines_paid'),
+        replaced=BALANCE_COLUMNS
+    ),
+    Source(
+        'group_daily_stats:member_fines', MemberFine.id, MemberFine.imposed_date,
+        GroupMember.group_id, _fine_day, _fine_statement,
+        added=('fines_count', 'fines_amount'), replaced=()
+    ),
+    Source(
+        'group_daily_stats:meeting_attendance', MeetingAttendance.id, MeetingAttendance.recorded_date,
+        MeetingAttendance.group_id, MeetingAttendance.meeting_date, _attendance_statement,
+        added=('attendance_records', 'attendance_present'), replaced=('meetings_held',)
+    ),
+)
+
+
+def _dialect():
+    return postgresql if db.session.get_bind().dialect.name == 'postgresql' else sqlite
+
+
+def _lock_watermark(name):
+    """The watermark row called name, locked for the rest of the transaction"""
+    db.session.execute(
+        _dialect().insert(ProcessingWatermark.__table__)
+        .values(name=name, last_id=0, updated_date=datetime.utcnow())
+        .on_conflict_do_nothing(index_elements=['name'])
+    )
+    return db.session.query(ProcessingWatermark).filter_by(name=name).with_for_update().one()
+
+
+def _merge(source, where, now):
+    """Add the source's totals for rows matching where to group_daily_stats.
+
+    Returns the (group_id, day) keys written.
+    """
+    rows = [dict(row._mapping, updated_date=now) for row in db.session.execute(source.statement(*where))]
+    if not rows:
+        return []
+    table = GroupDailyStat.__table__
+    stmt = _dialect().insert(table)
+    set_ = {name: table.c[name] + stmt.excluded[name] for name in source.added}
+    set_.update({name: stmt.excluded[name] for name in source.replaced})
+    set_['updated_date'] = stmt.excluded.updated_date
+    db.session.execute(stmt.on_conflict_do_update(index_elements=['group_id', 'day'], set_=set_), rows)
+    return [(row['group_id'], row['day']) for row in rows]
+
+
+def _upper_bound(source, last_id, batch_size, cutoff):
+    """(highest id, row count) of the next batch after last_id, stopping at
+    the first row newer than cutoff"""
+    upper, count = last_id, 0
+    for row_id, stamp in db.session.execute(
+        select(source.id, source.timestamp).where(source.id > last_id)
+        .order_by(source.id).limit(batch_size)
+    ):
+        if stamp is not None and stamp > cutoff:
+            break
+        upper, count = row_id, count + 1
+    return upper, count
+
+
+def update_group_daily_stats(batch_size=None):
+    """Fold the next batch of each source into group_daily_stats.
+
+    Returns {source name: rows consumed}. Rows younger than
+    ROLLUP_LAG_SECONDS are left for the next run, so that a transaction
+    committing after a later id was consumed is not skipped. The upserts
+    and the watermarks commit together: a batch is counted exactly once.
+    """
+    batch_size = batch_size or current_app.config.get('ROLLUP_BATCH_SIZE', 5000)
+    lag = timedelta(seconds=current_app.config.get('ROLLUP_LAG_SECONDS', 60))
+    # Database clock, as the source timestamps default to it
+    cutoff = db.session.scalar(select(func.now())).replace(tzinfo=None) - lag
+    now = datetime.utcnow()
+
+    consumed = {}
+    try:
+        for source in SOURCES:
+            mark = _lock_watermark(source.name)
+            upper, consumed[source.name] = _upper_bound(source, mark.last_id, batch_size, cutoff)
+            if consumed[source.name]:
+                _merge(source, (source.id > mark.last_id, source.id <= upper), now)
+                mark.last_id = upper
+                mark.updated_date = now
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return consumed
+
+
+def catch_up(batch_size=None):
+    """Run update_group_daily_stats until no source has an eligible row left"""
+    total = 0
+    while True:
+        consumed = sum(update_group_daily_stats(batch_size).values())
+        if not consumed:
+            return total
+        total += consumed
+
+
+def backfill(start=None, end=None, group_id=None):
+    """Recompute group_daily_stats from the sources, optionally for a day
+    range and one group.
+
+    Catches up first, then rebuilds the selected rows from every source
+    row up to the watermarks (locked meanwhile), so rows past them are
+    still left to the incremental job. Returns the number of rows written.
+    """
+    catch_up()
+    now = datetime.utcnow()
+    try:
+        marks = {source.name: _lock_watermark(source.name).last_id for source in SOURCES}
+
+        stale = delete(GroupDailyStat)
+        if start:
+            stale = stale.where(GroupDailyStat.day >= start)
+        if end:
+            stale = stale.where(GroupDailyStat.day <= end)
+        if group_id:
+            stale = stale.where(GroupDailyStat.group_id == group_id)
+        db.session.execute(stale)
+
+        written = set()
+        for source in SOURCES:
+            where = [source.id <= marks[source.name]]
+            if start:
+                where.append(source.day >= start)
+            if end:
+                where.append(source.day <= end)
+            if group_id:
+                where.append(source.group_id == group_id)
+            written.update(_merge(source, where, now))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return len(written)
+
+
+def daily_stats(group_id, start, end):
+    """GroupDailyStat rows of a group from start to end inclusive, oldest first"""
+    return GroupDailyStat.query.filter(
+        GroupDailyStat.group_id == group_id,
+        GroupDailyStat.day >= start,
+        GroupDailyStat.day <= end
+    ).order_by(GroupDailyStat.day).all()
+
+
+def _unrolled(group_id, end):
+    """Per-day totals of each source's rows not yet folded in: those past
+    its watermark (all of them before the first run), up to end"""
+    marks = dict(db.session.query(ProcessingWatermark.name, ProcessingWatermark.last_id).filter(
+        ProcessingWatermark.name.in_([source.name for source in SOURCES])
+    ))
+    return [
+        (source, db.session.execute(source.statement(
+            source.id > marks.get(source.name, 0), source.group_id == group_id, source.day <= end
+        )).all())
+        for source in SOURCES
+    ]
+
+
+def period_totals(group_id, start, end):
+    """Flow totals of a group from start to end, and its fund balances at end.
+
+    Rows the incremental job has not reached yet (inside ROLLUP_LAG_SECONDS,
+    or before it first ran) are read from the sources and merged in.
+    """
+    totals = db.session.execute(
+        select(*(
+            func.coalesce(func.sum(getattr(GroupDailyStat, name)), 0).label(name)
+            for name in FLOW_COLUMNS
+        )).where(
+            GroupDailyStat.group_id == group_id,
+            GroupDailyStat.day >= start,
+            GroupDailyStat.day <= end
+        )
+    ).one()
+    closing = GroupDailyStat.query.filter(
+        GroupDailyStat.group_id == group_id,
+        GroupDailyStat.day <= end,
+        GroupDailyStat.total_balance.isnot(None)
+    ).order_by(GroupDailyStat.day.desc()).first()
+
+    result = dict(totals._mapping)
+    result.update({name: getattr(closing, name) if closing else None for name in BALANCE_COLUMNS})
+    closing_day = closing.day if closing else None
+
+    for source, rows in _unrolled(group_id, end):
+        in_period = [row._mapping for row in rows if row.day >= start]
+        replaced = [name for name in source.replaced if name in FLOW_COLUMNS]
+        rolled = {
+            row.day: row for row in GroupDailyStat.query.filter(
+                GroupDailyStat.group_id == group_id,
+                GroupDailyStat.day.in_([row['day'] for row in in_period])
+            )
+        } if replaced and in_period else {}
+        for row in in_period:
+            for name in source.added:
+                result[name] += row[name]
+            for name in replaced:
+                # The day's rolled-up value is replaced, not added to
+                day = rolled.get(row['day'])
+                result[name] += row[name] - ((getattr(day, name) or 0) if day else 0)
+
+        if 'total_balance' in source.replaced:
+            for row in sorted(rows, key=lambda row: row.day):
+                if closing_day is None or row.day >= closing_day:
+                    result.update({name: getattr(row, name) for name in BALANCE_COLUMNS})
+                    closing_day = row.day
+    return result
+
+
+def daily_series(group_id, start, end):
+    """GroupDailyStat.to_json of a group's days from start to end, oldest
+    first, with the rows the incremental job has not reached yet merged in
+    the way it will fold them.
+    """
+    def value(number):
+        return float(number) if isinstance(number, Decimal) else number
+
+    days = {row.day: row.to_json() for row in daily_stats(group_id, start, end)}
+    for source, rows in _unrolled(group_id, end):
+        for row in rows:
+            if row.day < start:
+                continue
+            day = days.get(row.day)
+            if day is None:
+                day = days[row.day] = GroupDailyStat(
+                    group_id=group_id, day=row.day,
+                    **{name: 0 for name in FLOW_COLUMNS}
+                ).to_json()
+            for name in source.added:
+                day[name] += value(row._mapping[name]) or 0
+            for name in source.replaced:
+                day[name] = value(row._mapping[name])
+    return [days[day] for day in sorted(days)]
+
+
+def freshness():
+    """When each source was last folded into group_daily_stats -> {source: datetime}"""
+    prefix = 'group_daily_stats:'
+    return {
+        name[len(prefix):]: updated
+        for name, updated in db.session.query(ProcessingWatermark.name, ProcessingWatermark.updated_date)
+        .filter(ProcessingWatermark.name.like(prefix + '%'))
+    }
@@ -1,13 +1,24 @@
 # services/users/project/api/savings_groups.py
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from sqlalchemy import exc, desc, func
 from datetime import datetime, date, timedelta
+from decimal import Decimal
 
-from project.api.models import User, Service, SavingsGroup, GroupMember, GroupLoan, GroupTransaction, MemberCampaignParticipation
+from project.api.models import User, SavingsGroup, GroupMember, GroupLoan, GroupTransaction, MemberCampaignParticipation
 from project import db
 from project.api.utils import authenticate
-from project.api.notifications import create_system_notification
+from project.api.principal import get_principal
+from project.api import outbox, rollups
+from project.api.loading_plans import with_plan, serialize_groups
+from project.api.fieldsets import FieldsetError, parse_fieldset, serialize_with
+from project.api.idempotency import GROUP_TRANSACTION, lookup, lookup_many, remember
+from project.api.cache_utils import get_app_cache
+from project.api.platform_stats import platform_summary
+from project.api.member_dashboard import get_member_dashboard_data
+from project.api.pagination import (
+    CursorError, keyset_page, wants_cursor, wants_total, cursor_pagination
+)
 
 savings_groups_blueprint = Blueprint('savings_groups', __name__)
 
@@ -17,15 +28,17 @@ savings_groups_blueprint = Blueprint('savings_groups', __name__)
 def get_user_membership(requesting_user_id, user_id):
     """Get user's membership information across all groups"""
     # Allow users to view their own membership or admins to view any
-    user = User.query.filter_by(id=requesting_user_id).first()
-    if not user:
+    principal = get_principal(requesting_user_id)
+    if not principal:
         return jsonify({'status': 'fail', 'message': 'User not found.'}), 404
 
-    if requesting_user_id != user_id and not (user.is_super_admin or user.admin):
+    if requesting_user_id != user_id and not principal.is_admin:
         return jsonify({'status': 'fail', 'message': 'Permission denied.'}), 403
 
     # Get all group memberships for the user
-    memberships = GroupMember.query.filter_by(user_id=user_id, is_active=True).all()
+    memberships = with_plan(GroupMember.query, 'group_member.membership').filter_by(
+        user_id=user_id, is_active=True
+    ).all()
 
     membership_data = []
     for membership in memberships:
@@ -56,42 +69,42 @@ def get_user_membership(requesting_user_id, user_id):
 @authenticate
 def get_admin_dashboard(user_id):
     """Get admin dashboard data"""
-    user = User.query.filter_by(id=user_id).first()
-    if not user:
+    principal = get_principal(user_id)
+    if not principal:
         return jsonify({'status': 'fail', 'message': 'User not found.'}), 404
 
-    if not (user.is_super_admin or user.admin):
+    if not principal.is_admin:
         return jsonify({'status': 'fail', 'message': 'Admin access required.'}), 403
 
-    # Get summary statistics
-    total_groups = SavingsGroup.query.count()
-    total_members = GroupMember.query.filter_by(is_active=True).count()
-
-    # Get total savings across all groups
-    from project.api.models import MemberSaving
-    total_savings = db.session.query(func.sum(MemberSaving.current_balance)).scalar() or 0
-
-    # Get recent groups
-    recent_groups = SavingsGroup.query.order_by(desc(SavingsGroup.created_date)).limit(5).all()
-
-    # Get groups by status
-    groups_by_status = db.session.query(
-        SavingsGroup.state,
-        func.count(SavingsGroup.id)
-    ).group_by(SavingsGroup.state).all()
+    # Totals come from platform_stats, kept current by the write paths; the
+    # whole payload is cached for ADMIN_DASHBOARD_CACHE_TTL seconds
+    cache = get_app_cache(
+        'admin_dashboard', maxsize=1,
+        ttl=current_app.config.get('ADMIN_DASHBOARD_CACHE_TTL', 30)
+    )
+    data = cache.get('dashboard')
+    if data is None:
+        stats = platform_summary()
+        recent_groups = with_plan(SavingsGroup.query, 'savings_group.list').order_by(
+            desc(SavingsGroup.created_date)
+        ).limit(5).all()
+        data = {
+            'summary': stats['summary'],
+            'recent_groups': serialize_groups(recent_groups),
+            'groups_by_status': stats['groups_by_status'],
+            'groups_by_region': stats['groups_by_region'],
+            'freshness': {
+                'generated_at': datetime.utcnow().isoformat(),
+                'stats_updated': stats['stats_updated'],
+                'stats_reconciled': stats['stats_reconciled'],
+                'cache_ttl': cache.ttl
+            }
+        }
+        cache.set('dashboard', data)
 
     return jsonify({
         'status': 'success',
-        'data': {
-            'summary': {
-                'total_groups': total_groups,
-                'total_members': total_members,
-                'total_savings': float(total_savings),
-                'active_groups': len([count for status, count in groups_by_status if status == 'ACTIVE'])
-            },
-            'recent_groups': [group.to_json() for group in recent_groups],
-            'groups_by_status': dict(groups_by_status)
-        }
+        'data': data
     }), 200
 
 
@@ -99,49 +112,17 @@ def get_admin_dashboard(user_id):
 @authenticate
 def get_member_dashboard(user_id, member_id):
     """Get member dashboard data"""
-    member = GroupMember.query.filter_by(id=member_id).first()
-    if not member:
+    data = get_member_dashboard_data(member_id)
+    if not data:
         return jsonify({'status': 'fail', 'message': 'Member not found.'}), 404
 
     # Check permissions - user can view their own dashboard or admins can view any
-    user = User.query.filter_by(id=user_id).first()
-    if member.user_id != user_id and not (user.is_super_admin or user.admin):
+    if data['user_id'] != user_id and not get_principal(user_id).is_admin:
         return jsonify({'status': 'fail', 'message': 'Permission denied.'}), 403
 
-    # Get member savings
-    from project.api.models import MemberSaving, SavingTransaction, MeetingAttendance
-    savings = MemberSaving.query.filter_by(member_id=member_id, is_active=True).all()
-
-    # Get recent transactions
-    recent_transactions = SavingTransaction.query.join(MemberSaving).filter(
-        MemberSaving.member_id == member_id
-    ).order_by(desc(SavingTransaction.processed_date)).limit(10).all()
-
-    # Get attendance rate (last 3 months)
-    three_months_ago = date.today() - timedelta(days=90)
-    total_meetings = MeetingAttendance.query.filter(
-        MeetingAttendance.member_id == member_id,
-        MeetingAttendance.meeting_date >= three_months_ago
-    ).count()
-
-    attended_meetings = MeetingAttendance.query.filter(
-        MeetingAttendance.member_id == member_id,
-        MeetingAttendance.meeting_date >= three_months_ago,
-        MeetingAttendance.attended == True
-    ).count()
-
-    attendance_rate = (attended_meetings / total_meetings * 100) if total_meetings > 0 else 0
-
     return jsonify({
         'status': 'success',
-        'data': {
-            'member': member.to_json(),
-            'group': member.group.to_json(),
-            'savings': [saving.to_json() for saving in savings],
-            'recent_transactions': [tx.to_json() for tx in recent_transactions],
-            'attendance_rate': round(attendance_rate, 2),
-            'total_savings': sum(float(saving.current_balance) for saving in savings)
-        }
+        'data': {key: value for key, value in data.items() if key not in ('user_id', 'group_id')}
     }), 200
 
 
@@ -154,8 +135,8 @@ def get_member_transactions(user_id, member_id):
         return jsonify({'status': 'fail', 'message': 'Member not found.'}), 404
 
     # Check permissions
-    user = User.query.filter_by(id=user_id).first()
-    if member.user_id != user_id and not (user.is_super_admin or user.admin):
+    principal = get_principal(user_id)
+    if member.user_id != user_id and not principal.is_admin:
         return jsonify({'status': 'fail', 'message': 'Permission denied.'}), 403
 
     # Get transactions with pagination
@@ -167,6 +148,23 @@ def get_member_transactions(user_id, member_id):
         MemberSaving.member_id == member_id
     ).order_by(desc(SavingTransaction.processed_date))
 
+    if wants_cursor(request.args):
+        try:
+            keyset = keyset_page(
+                transactions_query, SavingTransaction.processed_date, SavingTransaction.id,
+                cursor=request.args.get('cursor'), limit=per_page,
+                include_total=wants_total(request.args)
+            )
+        except CursorError as e:
+            return jsonify({'status': 'fail', 'message': str(e)}), 400
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'transactions': [tx.to_json() for tx in keyset.items],
+                'pagination': cursor_pagination(keyset, per_page)
+            }
+        }), 200
+
     transactions = transactions_query.paginate(
         page=page, per_page=per_page, error_out=False
     )
@@ -192,16 +190,16 @@ def service_permission_required(service_name, permission_type='read'):
 
         @wraps(f)
         def decorated_function(user_id, *args, **kwargs):
-            user = User.query.filter_by(id=user_id).first()
-            if not user:
+            principal = get_principal(user_id)
+            if not principal:
                 return jsonify({'status': 'fail', 'message': 'User not found.'}), 404
 
             # Super admin has access to everything
-            if user.is_super_admin:
+            if principal.is_super_admin:
                 return f(user_id, *args, **kwargs)
 
             # Check if user has permission for this service
-            if not user.has_permission(service_name, permission_type):
+            if not principal.has_permission(service_name, permission_type):
                 return jsonify({'status': 'fail', 'message': f'Permission denied. Requires {permission_type} access to {service_name}.'}), 403
 
             return f(user_id, *args, **kwargs)
@@ -216,26 +214,16 @@ def group_officer_required(officer_roles=None):
 
         @wraps(f)
         def decorated_function(user_id, *args, **kwargs):
-            user = User.query.filter_by(id=user_id).first()
-            if not user:
+            principal = get_principal(user_id)
+            if not principal:
                 return jsonify({'status': 'fail', 'message': 'User not found.'}), 404
 
             # Super admin and service admin have access to everything
-            if user.is_super_admin or user.is_service_admin('Savings Groups'):
+            if principal.is_service_admin('Savings Groups'):
                 return f(user_id, *args, **kwargs)
 
             # Check if user is an officer in any group
-            member_records = GroupMember.query.filter_by(user_id=user_id, is_active=True).all()
-
-            is_officer = False
-            for member in member_records:
-                if member.is_officer():
-                    officer_role = member.get_officer_role()
-                    if officer_roles is None or officer_role in officer_roles:
-                        is_officer = True
-                        break
-
-            if not is_officer:
+            if not principal.is_officer(officer_roles=officer_roles):
                 roles_str = ', '.join(officer_roles) if officer_roles else 'Secretary, Chair, or Treasurer'
                 return jsonify({
                     'status': 'fail',
@@ -254,12 +242,12 @@ def group_member_or_officer_required(group_id_param='group_id'):
 
         @wraps(f)
         def decorated_function(user_id, *args, **kwargs):
-            user = User.query.filter_by(id=user_id).first()
-            if not user:
+            principal = get_principal(user_id)
+            if not principal:
                 return jsonify({'status': 'fail', 'message': 'User not found.'}), 404
 
             # Super admin and service admin have access to everything
-            if user.is_super_admin or user.is_service_admin('Savings Groups'):
+            if principal.is_service_admin('Savings Groups'):
                 return f(user_id, *args, **kwargs)
 
             # Get group_id from kwargs or args
@@ -272,13 +260,7 @@ def group_member_or_officer_required(group_id_param='group_id'):
                 return jsonify({'status': 'fail', 'message': 'Group ID required.'}), 400
 
             # Check if user is a member of this group
-            member = GroupMember.query.filter_by(
-                user_id=user_id,
-                group_id=group_id,
-                is_active=True
-            ).first()
-
-            if not member:
+            if not principal.membership(group_id):
                 return jsonify({
                     'status': 'fail',
                     'message': 'Access denied. Must be a member of this group.'
@@ -295,15 +277,15 @@ def group_member_or_officer_required(group_id_param='group_id'):
 @authenticate
 def create_savings_group(user_id):
     """Create a new savings group - Available to Secretaries, Officers, and Admins"""
-    user = User.query.filter_by(id=user_id).first()
-    if not user:
+    principal = get_principal(user_id)
+    if not principal:
         return jsonify({'status': 'fail', 'message': 'User not found.'}), 404
+    user = principal.user
 
     # Check permissions: Super admin, Service admin, or existing group officer can create groups
     can_create = (
-        user.is_super_admin or
-        user.is_service_admin('Savings Groups') or
-        _is_existing_group_officer(user_id)
+        principal.is_service_admin('Savings Groups') or
+        principal.is_officer()
     )
 
     if not can_create:
@@ -398,18 +380,14 @@ def create_savings_group(user_id):
         group.members_count = 1
         group.update_state()  # Update group state based on members
 
-        db.session.commit()
+        outbox.notify(
+            user_id=user_id,
+            message=f'Savings group "{name}" created successfully. You are now the {creator_role.title()}.',
+            notification_type='success',
+            title='Group Created'
+        )
 
-        # Create notification for group creation
-        service = Service.query.filter_by(name='Savings Groups').first()
-        if service:
-            create_system_notification(
-                user_id=user_id,
-                message=f'Savings group "{name}" created successfully. You are now the {creator_role.title()}.',
-                notification_type='success',
-                title='Group Created',
-                service_id=service.id
-            )
+        db.session.commit()
 
         return jsonify({
             'status': 'success',
@@ -433,16 +411,6 @@ def create_savings_group(user_id):
         return jsonify(response_object), 500
 
 
-def _is_existing_group_officer(user_id):
-    """Helper function to check if user is an officer in any existing group"""
-    member_records = GroupMember.query.filter_by(user_id=user_id, is_active=True).all()
-
-    for member in member_records:
-        if member.is_officer():
-            return True
-    return False
-
-
 @savings_groups_blueprint.route('/savings-groups/<int:group_id>', methods=['GET'])
 @authenticate
 @service_permission_required('Savings Groups', 'read')
@@ -468,7 +436,7 @@ def get_all_savings_groups(user_id):
     per_page = request.args.get('per_page', 20, type=int)
     state_filter = request.args.get('state')
 
-    query = SavingsGroup.query
+    query = with_plan(SavingsGroup.query, 'savings_group.list')
 
     if state_filter:
         query = query.filter_by(state=state_filter)
@@ -482,7 +450,7 @@ def get_all_savings_groups(user_id):
     return jsonify({
         'status': 'success',
         'data': {
-            'groups': [group.to_json() for group in groups.items],
+            'groups': serialize_groups(groups.items),
             'pagination': {
                 'page': page,
                 'per_page': per_page,
@@ -559,15 +527,9 @@ def add_group_member(user_id, group_id):
         return jsonify({'status': 'fail', 'message': 'Savings group not found.'}), 404
 
     # Check if requesting user is an officer in this group (unless admin)
-    requesting_user = User.query.filter_by(id=user_id).first()
-    if not (requesting_user.is_super_admin or requesting_user.is_service_admin('Savings Groups')):
-        requesting_member = GroupMember.query.filter_by(
-            user_id=user_id,
-            group_id=group_id,
-            is_active=True
-        ).first()
-
-        if not requesting_member or not requesting_member.is_officer():
+    principal = get_principal(user_id)
+    if not principal.is_service_admin('Savings Groups'):
+        if not principal.is_officer(group_id=group_id):
             return jsonify({
                 'status': 'fail',
                 'message': 'Only group officers can add new members.'
@@ -677,18 +639,14 @@ def add_group_member(user_id, group_id):
 
         group.update_state()  # Check if state should change
 
-        db.session.commit()
+        outbox.notify(
+            user_id=target_user_id,
+            message=f'You have been added to savings group "{group.name}" as a {role.lower()}.',
+            notification_type='info',
+            title='Added to Savings Group'
+        )
 
-        # Create notification for new member
-        service = Service.query.filter_by(name='Savings Groups').first()
-        if service:
-            create_system_notification(
-                user_id=target_user_id,
-                message=f'You have been added to savings group "{group.name}" as a {role.lower()}.',
-                notification_type='info',
-                title='Added to Savings Group',
-                service_id=service.id
-            )
+        db.session.commit()
 
         return jsonify({
             'status': 'success',
@@ -717,17 +675,25 @@ def add_group_member(user_id, group_id):
 @service_permission_required('Savings Groups', 'read')
 def get_group_members(user_id, group_id):
     """Get all members of a savings group"""
+    try:
+        fieldset = parse_fieldset('group_member')
+    except FieldsetError as e:
+        return jsonify({'status': 'fail', 'message': str(e)}), 400
+
     group = SavingsGroup.query.filter_by(id=group_id).first()
     
     if not group:
         return jsonify({'status': 'fail', 'message': 'Savings group not found.'}), 404
 
-    members = GroupMember.query.filter_by(group_id=group_id, is_active=True).all()
+    query = GroupMember.query.filter_by(group_id=group_id, is_active=True)
+    if fieldset:
+        query = fieldset.apply(query)
+    members = query.all()
 
     return jsonify({
         'status': 'success',
         'data': {
-            'members': [member.to_json() for member in members],
+            'members': serialize_with(fieldset, members),
             'total_members': len(members)
         }
     }), 200
@@ -832,17 +798,15 @@ def remove_group_member(user_id, group_id, member_id):
         group.members_count -= 1
         group.update_state()  # Check if state should change
 
-        db.session.commit()
-
-        # Create notification for removed member
-        create_system_notification(
+        outbox.notify(
             user_id=member.user_id,
             message=f'You have been removed from savings group "{group.name}"',
             notification_type='warning',
-            title='Removed from Savings Group',
-            service_id=Service.query.filter_by(name='Savings Groups').first().id
+            title='Removed from Savings Group'
         )
 
+        db.session.commit()
+
         return jsonify({
             'status': 'success',
             'message': 'Member removed successfully.'
@@ -898,17 +862,15 @@ def assign_officer(user_id, group_id):
         # Update member role
         member.role = 'OFFICER'
 
-        db.session.commit()
-
-        # Create notification for new officer
-        create_system_notification(
+        outbox.notify(
             user_id=member.user_id,
             message=f'You have been assigned as {officer_role} of savings group "{group.name}"',
             notification_type='success',
-            title='Officer Role Assigned',
-            service_id=Service.query.filter_by(name='Savings Groups').first().id
+            title='Officer Role Assigned'
         )
 
+        db.session.commit()
+
         return jsonify({
             'status': 'success',
             'message': f'Member assigned as {officer_role} successfully.',
@@ -956,12 +918,11 @@ def remove_officer(user_id, group_id, officer_role):
                 member.role = 'MEMBER'
 
             # Create notification
-            create_system_notification(
+            outbox.notify(
                 user_id=member.user_id,
                 message=f'You have been removed as {officer_role} of savings group "{group.name}"',
                 notification_type='info',
-                title='Officer Role Removed',
-                service_id=Service.query.filter_by(name='Savings Groups').first().id
+                title='Officer Role Removed'
             )
 
         db.session.commit()
@@ -978,6 +939,73 @@ def remove_officer(user_id, group_id, officer_role):
 
 # Transaction Endpoints
 
+GROUP_TRANSACTION_TYPES = (
+    'SAVING_CONTRIBUTION', 'WITHDRAWAL', 'LOAN_DISBURSEMENT',
+    'LOAN_REPAYMENT', 'PENALTY', 'INTEREST'
+)
+
+MAX_TRANSACTION_BATCH = 500
+
+
+def processed_transactions(keys):
+    """Stored transaction JSON for each idempotency key already used -> {key: json}.
+
+    Keys that predate the idempotency store, or have expired from it, are
+    still found on GroupTransaction.idempotency_key.
+    """
+    found = lookup_many(GROUP_TRANSACTION, keys)
+    legacy = [key for key in keys if key not in found]
+    if legacy:
+        for transaction in GroupTransaction.query.filter(GroupTransaction.idempotency_key.in_(legacy)):
+            found[transaction.idempotency_key] = transaction.to_json()
+    return found
+
+
+def apply_group_transaction(group, member, transaction_type, amount, user_id, description=None,
+                            idempotency_key=None):
+    """Apply one transaction to the group (and member) balances.
+
+    Returns the unsaved GroupTransaction with its before/after balances.
+    Raises ValueError, leaving every balance untouched, when a withdrawal
+    exceeds the group or member balance.
+    """
+    amount_decimal = Decimal(str(amount))
+    if transaction_type == 'WITHDRAWAL':
+        if group.savings_balance < amount_decimal:
+            raise ValueError('Insufficient group balance.')
+        if member and member.share_balance < amount_decimal:
+            raise ValueError('Insufficient member balance.')
+
+    transaction = GroupTransaction(
+        group_id=group.id,
+        member_id=member.id if member else None,
+        type=transaction_type,
+        amount=amount,
+        description=description,
+        processed_by=user_id,
+        idempotency_key=idempotency_key
+    )
+
+    # Record balances before transaction
+    transaction.group_balance_before = group.savings_balance
+    transaction.member_balance_before = member.share_balance if member else None
+
+    if transaction_type == 'SAVING_CONTRIBUTION':
+        group.savings_balance += amount_decimal
+        if member:
+            member.share_balance += amount_decimal
+            member.total_contributions += amount_decimal
+    elif transaction_type == 'WITHDRAWAL':
+        group.savings_balance -= amount_decimal
+        if member:
+            member.share_balance -= amount_decimal
+
+    # Record balances after transaction
+    transaction.group_balance_after = group.savings_balance
+    transaction.member_balance_after = member.share_balance if member else None
+    return transaction
+
+
 @savings_groups_blueprint.route('/savings-groups/<int:group_id>/transactions', methods=['POST'])
 @authenticate
 @service_permission_required('Savings Groups', 'write')
@@ -1016,12 +1044,12 @@ def record_group_transaction(user_id, group_id):
 
     # Check for duplicate transaction if idempotency key provided
     if idempotency_key:
-        existing_transaction = GroupTransaction.query.filter_by(idempotency_key=idempotency_key).first()
+        existing_transaction = processed_transactions([idempotency_key]).get(idempotency_key)
         if existing_transaction:
             return jsonify({
                 'status': 'success',
                 'message': 'Transaction already processed.',
-                'data': {'transaction': existing_transaction.to_json()}
+                'data': {'transaction': existing_transaction}
             }), 200
 
     # Validate member if provided
@@ -1033,65 +1061,35 @@ def record_group_transaction(user_id, group_id):
             return jsonify(response_object), 404
 
     try:
-        # Record balances before transaction
-        group_balance_before = group.savings_balance
-        member_balance_before = member.share_balance if member else None
-
-        # Create transaction
-        transaction = GroupTransaction(
-            group_id=group_id,
-            member_id=member_id,
-            type=transaction_type,
-            amount=amount,
-            description=description,
-            processed_by=user_id,
+        transaction = apply_group_transaction(
+            group, member, transaction_type, amount, user_id, description=description,
             idempotency_key=idempotency_key
         )
-        
-        # Set balance tracking fields
-        transaction.group_balance_before = group_balance_before
-        transaction.member_balance_before = member_balance_before
-
-        # Update balances based on transaction type
-        from decimal import Decimal
-        amount_decimal = Decimal(str(amount))
-        
-        if transaction_type == 'SAVING_CONTRIBUTION':
-            group.savings_balance += amount_decimal
-            if member:
-                member.share_balance += amount_decimal
-                member.total_contributions += amount_decimal
-        elif transaction_type == 'WITHDRAWAL':
-            if group.savings_balance < amount_decimal:
-                response_object['message'] = 'Insufficient group balance.'
-                return jsonify(response_object), 400
-            group.savings_balance -= amount_decimal
-            if member:
-                if member.share_balance < amount_decimal:
-                    response_object['message'] = 'Insufficient member balance.'
-                    return jsonify(response_object), 400
-                member.share_balance -= amount_decimal
-
-        # Record balances after transaction
-        transaction.group_balance_after = group.savings_balance
-        transaction.member_balance_after = member.share_balance if member else None
+    except ValueError as e:
+        response_object['message'] = str(e)
+        return jsonify(response_object), 400
 
+    try:
         db.session.add(transaction)
         
         # Update group state if needed
         group.update_state()
-        
-        db.session.commit()
 
-        # Create notification for transaction
+        db.session.flush()
+        if idempotency_key:
+            remember(GROUP_TRANSACTION, idempotency_key, transaction.to_json())
+
+        # Delivered by the outbox dispatcher once this commit is done
         if member:
-            create_system_notification(
+            outbox.notify(
                 user_id=member.user_id,
                 message=f'{transaction_type.replace("_", " ").title()} of ${amount:.2f} processed for group "{group.name}"',
                 notification_type='info',
-                title='Transaction Processed',
-                service_id=Service.query.filter_by(name='Savings Groups').first().id
+                title='Transaction Processed'
             )
+        outbox.project_group_transaction(transaction, member, group)
+
+        db.session.commit()
 
         return jsonify({
             'status': 'success',
@@ -1101,14 +1099,153 @@ def record_group_transaction(user_id, group_id):
 
     except exc.IntegrityError:
         db.session.rollback()
+        # A concurrent retry with the same key may have committed first
+        existing_transaction = lookup(GROUP_TRANSACTION, idempotency_key) if idempotency_key else None
+        if existing_transaction:
+            return jsonify({
+                'status': 'success',
+                'message': 'Transaction already processed.',
+                'data': {'transaction': existing_transaction}
+            }), 200
         return jsonify(response_object), 400
 
 
+@savings_groups_blueprint.route('/savings-groups/<int:group_id>/transactions/batch', methods=['POST'])
+@authenticate
+@service_permission_required('Savings Groups', 'write')
+def record_group_transactions_batch(user_id, group_id):
+    """Record many transactions for a savings group under one group lock"""
+    post_data = request.get_json(silent=True)
+    items = post_data.get('transactions') if isinstance(post_data, dict) else None
+    if not isinstance(items, list) or not items:
+        return jsonify({'status': 'fail', 'message': 'Invalid payload.'}), 400
+    if len(items) > MAX_TRANSACTION_BATCH:
+        return jsonify({
+            'status': 'fail',
+            'message': f'At most {MAX_TRANSACTION_BATCH} transactions per batch.'
+        }), 400
+
+    # Concurrent writers to this group wait here, not item by item
+    group = SavingsGroup.query.filter_by(id=group_id).with_for_update().first()
+    if not group:
+        return jsonify({'status': 'fail', 'message': 'Savings group not found.'}), 404
+
+    def field(item, name):
+        return item.get(name) if isinstance(item, dict) else None
+
+    def invalid(item):
+        """Why the item's key or member id cannot be used, or None"""
+        key, member_id = field(item, 'idempotency_key'), field(item, 'member_id')
+        if key is not None and not isinstance(key, str):
+            return 'Invalid idempotency key.'
+        if member_id is not None and (isinstance(member_id, bool) or not isinstance(member_id, int)):
+            return 'Invalid member id.'
+        return None
+
+    valid = [item for item in items if not invalid(item)]
+    keys = {field(item, 'idempotency_key') for item in valid} - {None}
+    processed = processed_transactions(list(keys)) if keys else {}
+    member_ids = {field(item, 'member_id') for item in valid} - {None}
+    members = {
+        m.id: m for m in GroupMember.query.filter(
+            GroupMember.group_id == group_id, GroupMember.id.in_(member_ids)
+        )
+    } if member_ids else {}
+
+    results, created = [], []
+    for index, item in enumerate(items):
+        error = invalid(item)
+        if error:
+            results.append({'index': index, 'status': 'failed', 'message': error})
+            continue
+        key = field(item, 'idempotency_key')
+        if key in processed:
+            results.append({'index': index, 'status': 'duplicate', 'transaction': processed[key]})
+            continue
+
+        transaction_type = field(item, 'type')
+        amount = field(item, 'amount')
+        member_id = field(item, 'member_id')
+        try:
+            if not transaction_type or not amount:
+                raise ValueError('Transaction type and amount are required.')
+            if transaction_type not in GROUP_TRANSACTION_TYPES:
+                raise ValueError('Invalid transaction type.')
+            try:
+                amount = float(amount)
+            except (ValueError, TypeError):
+                raise ValueError('Invalid amount format.')
+            if amount <= 0:
+                raise ValueError('Amount must be positive.')
+            member = members.get(member_id) if member_id else None
+            if member_id and not member:
+                raise ValueError('Member not found in this group.')
+
+            transaction = apply_group_transaction(
+                group, member, transaction_type, amount, user_id,
+                description=field(item, 'description'), idempotency_key=key
+            )
+        except ValueError as e:
+            results.append({'index': index, 'status': 'failed', 'message': str(e)})
+            continue
+
+        if key:
+            processed[key] = transaction
+        created.append((transaction, member, amount))
+        results.append({'index': index, 'status': 'created', 'transaction': transaction})
+
+    if created:
+        db.session.add_all([transaction for transaction, _, _ in created])
+        group.update_state()
+        db.session.flush()
+
+        for transaction, member, amount in created:
+            if member and member.user_id:
+                outbox.notify(
+                    user_id=member.user_id,
+                    message=f'{transaction.type.replace("_", " ").title()} of ${amount:.2f} processed for group "{group.name}"',
+                    notification_type='info',
+                    title='Transaction Processed'
+                )
+            outbox.project_group_transaction(transaction, member, group)
+        db.session.flush()
+
+    # Serialized before commit so the rows need not be reloaded
+    for result in results:
+        if isinstance(result.get('transaction'), GroupTransaction):
+            result['transaction'] = result['transaction'].to_json()
+
+    if not created:
+        db.session.rollback()
+    else:
+        for result in results:
+            key = field(items[result['index']], 'idempotency_key')
+            if result['status'] == 'created' and key:
+                remember(GROUP_TRANSACTION, key, result['transaction'])
+        try:
+            db.session.commit()
+        except exc.IntegrityError:
+            # A concurrent request used one of the keys first; a retry reports it
+            db.session.rollback()
+            return jsonify({'status': 'fail', 'message': 'Failed to record transactions.'}), 409
+
+    return jsonify({
+        'status': 'success',
+        'message': f'{len(created)} of {len(items)} transactions recorded.',
+        'data': {'results': results}
+    }), 201 if created else 200
+
+
 @savings_groups_blueprint.route('/savings-groups/<int:group_id>/transactions', methods=['GET'])
 @authenticate
 @service_permission_required('Savings Groups', 'read')
 def get_group_transactions(user_id, group_id):
     """Get transaction history for a savings group"""
+    try:
+        fieldset = parse_fieldset('group_transaction')
+    except FieldsetError as e:
+        return jsonify({'status': 'fail', 'message': str(e)}), 400
+
     group = SavingsGroup.query.filter_by(id=group_id).first()
     
     if not group:
@@ -1125,6 +1262,25 @@ def get_group_transactions(user_id, group_id):
 
     # Order by date (newest first)
     query = query.order_by(desc(GroupTransaction.processed_date))
+    if fieldset:
+        query = fieldset.apply(query, 'processed_date')
+
+    if wants_cursor(request.args):
+        try:
+            keyset = keyset_page(
+                query, GroupTransaction.processed_date, GroupTransaction.id,
+                cursor=request.args.get('cursor'), limit=per_page,
+                include_total=wants_total(request.args)
+            )
+        except CursorError as e:
+            return jsonify({'status': 'fail', 'message': str(e)}), 400
+        return jsonify({
+            'status': 'success',
+            'data': {
+                'transactions': serialize_with(fieldset, keyset.items),
+                'pagination': cursor_pagination(keyset, per_page)
+            }
+        }), 200
 
     # Paginate
     transactions = query.paginate(page=page, per_page=per_page, error_out=False)
@@ -1132,7 +1288,7 @@ def get_group_transactions(user_id, group_id):
     return jsonify({
         'status': 'success',
         'data': {
-            'transactions': [transaction.to_json() for transaction in transactions.items],
+            'transactions': serialize_with(fieldset, transactions.items),
             'pagination': {
                 'page': page,
                 'per_page': per_page,
@@ -1174,9 +1330,19 @@ def get_group_cashbook(user_id, group_id):
     except ValueError:
         return jsonify({'status': 'fail', 'message': 'Invalid date format. Use YYYY-MM-DD.'}), 400
 
-    cashbook_data = CashbookService.get_group_cashbook(
-        group_id, start_date, end_date, limit, offset
-    )
+    if wants_cursor(request.args):
+        try:
+            cashbook_data = CashbookService.get_group_cashbook(
+                group_id, start_date, end_date, limit,
+                cursor=request.args.get('cursor'),
+                include_total=wants_total(request.args)
+            )
+        except CursorError as e:
+            return jsonify({'status': 'fail', 'message': str(e)}), 400
+    else:
+        cashbook_data = CashbookService.get_group_cashbook(
+            group_id, start_date, end_date, limit, offset
+        )
 
     return jsonify({
         'status': 'success',
@@ -1213,6 +1379,102 @@ def get_financial_summary(user_id, group_id):
     }), 200
 
 
+@savings_groups_blueprint.route('/savings-groups/<int:group_id>/financial-summary/series', methods=['GET'])
+@authenticate
+@service_permission_required('Savings Groups', 'read')
+def get_financial_summary_series(user_id, group_id):
+    """Get month-end balances of a savings group over a date range"""
+    from project.api.cashbook_service import CashbookService
+
+    group = SavingsGroup.query.filter_by(id=group_id).first()
+    if not group:
+        return jsonify({'status': 'fail', 'message': 'Savings group not found.'}), 404
+
+    try:
+        end_date = datetime.strptime(request.args['end_date'], '%Y-%m-%d').date() \
+            if request.args.get('end_date') else date.today()
+        start_date = datetime.strptime(request.args['start_date'], '%Y-%m-%d').date() \
+            if request.args.get('start_date') else (end_date.replace(day=1) - timedelta(days=320)).replace(day=1)
+    except ValueError:
+        return jsonify({'status': 'fail', 'message': 'Invalid date format. Use YYYY-MM-DD.'}), 400
+
+    if start_date > end_date:
+        return jsonify({'status': 'fail', 'message': 'start_date must not be after end_date.'}), 400
+    if (end_date.year - start_date.year) * 12 + end_date.month - start_date.month >= 120:
+        return jsonify({'status': 'fail', 'message': 'A series can cover at most 120 months.'}), 400
+
+    series = CashbookService.get_group_balance_series(group_id, start_date, end_date)
+
+    return jsonify({
+        'status': 'success',
+        'data': {'series': series}
+    }), 200
+
+
+@savings_groups_blueprint.route('/savings-groups/<int:group_id>/cashbook/batch', methods=['POST'])
+@authenticate
+@service_permission_required('Savings Groups', 'write')
+def post_meeting_batch(user_id, group_id):
+    """Record a meeting's savings, fine payments and loan repayments in one transaction"""
+    from project.api.cashbook_service import CashbookService
+
+    group = SavingsGroup.query.filter_by(id=group_id).first()
+    if not group:
+        return jsonify({'status': 'fail', 'message': 'Savings group not found.'}), 404
+
+    post_data = request.get_json(silent=True)
+    if not post_data or not isinstance(post_data.get('postings'), list) or not post_data['postings']:
+        return jsonify({'status': 'fail', 'message': 'Invalid payload.'}), 400
+
+    transaction_date = None
+    if post_data.get('transaction_date'):
+        try:
+            transaction_date = datetime.strptime(post_data['transaction_date'], '%Y-%m-%d').date()
+        except (ValueError, TypeError):
+            return jsonify({'status': 'fail', 'message': 'Invalid date format. Use YYYY-MM-DD.'}), 400
+
+    atomic = post_data.get('atomic', True) is not False
+
+    try:
+        result = CashbookService.post_meeting_batch(
+            group_id, post_data['postings'], user_id,
+            transaction_date=transaction_date, atomic=atomic
+        )
+        if not result['posted']:
+            db.session.rollback()
+            return jsonify({
+                'status': 'fail',
+                'message': 'No postings were recorded.',
+                'data': {'errors': result['errors']}
+            }), 400
+        db.session.commit()
+
+        return jsonify({
+            'status': 'success',
+            'message': f"{len(result['posted'])} of {len(post_data['postings'])} postings recorded.",
+            'data': {
+                'posted': [
+                    {
+                        'index': line['index'],
+                        'type': line['type'],
+                        'cashbook_entry': line['cashbook_entry'].to_json(),
+                        'saving_transaction': line['saving_transaction'].to_json()
+                        if line['saving_transaction'] else None
+                    }
+                    for line in result['posted']
+                ],
+                'errors': result['errors']
+            }
+        }), 201
+
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'status': 'fail', 'message': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'status': 'fail', 'message': 'Failed to record meeting postings.'}), 500
+
+
 # Member Savings Endpoints
 
 @savings_groups_blueprint.route('/savings-groups/<int:group_id>/members/<int:member_id>/savings', methods=['POST'])
@@ -1494,7 +1756,7 @@ def get_group_analytics(user_id, group_id):
         loan_analytics = LoanAssessmentService.get_group_loan_analytics(group_id)
         
         # Get member statistics
-        from project.api.models import MemberSaving, MeetingAttendance, MemberFine
+        from project.api.models import MemberSaving, MemberFine
         
         total_members = GroupMember.query.filter_by(group_id=group_id, is_active=True).count()
         
@@ -1506,19 +1768,13 @@ def get_group_analytics(user_id, group_id):
             GroupMember.is_active.is_(True)
         ).scalar() or 0
         
-        # Meeting attendance statistics (last 3 months)
-        three_months_ago = date.today() - timedelta(days=90)
-        recent_meetings = MeetingAttendance.query.filter(
-            MeetingAttendance.group_id == group_id,
-            MeetingAttendance.meeting_date >= three_months_ago
-        ).count()
-        
-        attended_meetings = MeetingAttendance.query.filter(
-            MeetingAttendance.group_id == group_id,
-            MeetingAttendance.meeting_date >= three_months_ago,
-            MeetingAttendance.attended.is_(True)
-        ).count()
-        
+        # Activity over the last 3 months, from the daily rollups
+        today = date.today()
+        three_months_ago = today - timedelta(days=90)
+        trends = rollups.period_totals(group_id, three_months_ago, today)
+        recent_meetings = trends['attendance_records']
+        attended_meetings = trends['attendance_present']
+
         attendance_rate = (attended_meetings / recent_meetings * 100) if recent_meetings > 0 else 0
         
         # Fines statistics
@@ -1545,6 +1801,23 @@ def get_group_analytics(user_id, group_id):
                 'attendance_rate': round(attendance_rate, 2),
                 'recent_meetings': recent_meetings,
                 'total_outstanding_fines': float(total_fines)
+            },
+            'trends': {
+                'period_days': 90,
+                'deposits': float(trends['deposits']),
+                'withdrawals': float(trends['withdrawals']),
+                'loans_disbursed': float(trends['loans_disbursed']),
+                'loans_repaid': float(trends['loans_repaid']),
+                'fines_imposed': float(trends['fines_amount']),
+                'fines_paid': float(trends['fines_paid']),
+                'meetings_held': trends['meetings_held'],
+                'fund_balances': {
+                    name: float(trends[name]) if trends[name] is not None else None
+                    for name in rollups.BALANCE_COLUMNS
+                }
+            },
+            'rollups_updated': {
+                source: updated.isoformat() for source, updated in rollups.freshness().items()
             }
         }
 
@@ -1557,6 +1830,43 @@ def get_group_analytics(user_id, group_id):
         return jsonify({'status': 'fail', 'message': 'Failed to generate analytics.'}), 500
 
 
+MAX_DAILY_ANALYTICS_DAYS = 731
+
+
+@savings_groups_blueprint.route('/savings-groups/<int:group_id>/analytics/daily', methods=['GET'])
+@authenticate
+@service_permission_required('Savings Groups', 'read')
+def get_group_daily_analytics(user_id, group_id):
+    """Daily time series of a group's activity, read from group_daily_stats
+    with the rows not yet rolled up merged in"""
+    group = SavingsGroup.query.filter_by(id=group_id).first()
+    if not group:
+        return jsonify({'status': 'fail', 'message': 'Savings group not found.'}), 404
+
+    try:
+        days = int(request.args.get('days', 365))
+    except ValueError:
+        return jsonify({'status': 'fail', 'message': 'days must be an integer.'}), 400
+    if not 1 <= days <= MAX_DAILY_ANALYTICS_DAYS:
+        return jsonify({
+            'status': 'fail', 'message': f'days must be between 1 and {MAX_DAILY_ANALYTICS_DAYS}.'
+        }), 400
+
+    end = date.today()
+    start = end - timedelta(days=days - 1)
+    return jsonify({
+        'status': 'success',
+        'data': {
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'days': rollups.daily_series(group_id, start, end),
+            'rollups_updated': {
+                source: updated.isoformat() for source, updated in rollups.freshness().items()
+            }
+        }
+    }), 200
+
+
 # Target Savings Campaign Endpoints
 
 @savings_groups_blueprint.route('/target-campaigns', methods=['POST'])
@@ -1567,8 +1877,8 @@ def create_target_campaign(user_id):
     from project.api.models import TargetSavingsCampaign
     
     # Check if user is admin
-    user = User.query.get(user_id)
-    if not user.is_super_admin and not user.is_service_admin('Savings Groups'):
+    principal = get_principal(user_id)
+    if not principal.is_service_admin('Savings Groups'):
         return jsonify({'status': 'fail', 'message': 'Only admins can create target campaigns.'}), 403
 
     post_data = request.get_json()
@@ -1736,22 +2046,21 @@ def assign_campaign_to_group(user_id, group_id, campaign_id):
             )
             db.session.add(participation)
 
-        db.session.commit()
-
         # Create notifications for group members
         for member in active_members:
             message = f'New target savings campaign "{campaign.name}" has been assigned to your group'
             if campaign.requires_group_vote:
                 message += '. Please vote on whether to participate.'
-            
-            create_system_notification(
+
+            outbox.notify(
                 user_id=member.user_id,
                 message=message,
                 notification_type='info',
-                title='New Target Savings Campaign',
-                service_id=Service.query.filter_by(name='Savings Groups').first().id
+                title='New Target Savings Campaign'
             )
 
+        db.session.commit()
+
         return jsonify({
             'status': 'success',
             'message': 'Target campaign assigned to group successfully.',
@@ -0,0 +1,106 @@
+# services/users/project/api/token_cache.py
+
+import hashlib
+import time
+from collections import namedtuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from project import db
+from project.api.models import User
+from project.api.cache_utils import get_app_cache
+
+
+INVALID_TOKEN_MESSAGE = 'Provide a valid auth token.'
+
+# A token that passed signature verification; active is the user's flag as of
+# checked_at (monotonic seconds)
+VerifiedToken = namedtuple('VerifiedToken', ['sub', 'exp', 'active', 'checked_at'])
+
+
+def _token_cache():
+    return get_app_cache(
+        'verified_tokens',
+        maxsize=current_app.config.get('TOKEN_CACHE_SIZE', 10000),
+        ttl=current_app.config.get('TOKEN_ACTIVE_RECHECK_SECONDS', 30)
+    )
+
+
+def _revoked_users():
+    """User ids deactivated in this process, kept for one recheck window"""
+    return get_app_cache(
+        'revoked_users',
+        maxsize=current_app.config.get('TOKEN_CACHE_SIZE', 10000),
+        ttl=current_app.config.get('TOKEN_ACTIVE_RECHECK_SECONDS', 30)
+    )
+
+
+def _is_active(user_id):
+    return bool(db.session.query(User.active).filter(User.id == user_id).scalar())
+
+
+def verify_auth_token(auth_token):
+    """Resolve a bearer token to a user id, or return an error message.
+
+    Same contract as User.decode_auth_token, but also rejects inactive or
+    deleted users. Verified tokens are cached by digest until their exp, so
+    repeat calls skip both the HS256 check and the user lookup; the active
+    flag is re-read once per TOKEN_ACTIVE_RECHECK_SECONDS, and deactivations
+    made in this process apply immediately.
+    """
+    if not has_app_context():
+        resp = User.decode_auth_token(auth_token)
+        if isinstance(resp, str):
+            return resp
+        return resp if _is_active(resp) else INVALID_TOKEN_MESSAGE
+
+    cache = _token_cache()
+    digest = hashlib.sha256(auth_token.encode()).digest()
+    entry = cache.get(digest)
+    now = time.monotonic()
+
+    if entry is None:
+        payload = User.decode_auth_payload(auth_token)
+        if isinstance(payload, str):
+            return payload
+        sub, exp = payload['sub'], payload['exp']
+        entry = VerifiedToken(sub, exp, _is_active(sub), now)
+        cache.set(digest, entry, ttl=max(exp - time.time(), 0))
+    elif time.time() >= entry.exp:
+        cache.pop(digest)
+        return 'Signature expired. Please log in again.'
+    elif now - entry.checked_at >= current_app.config.get('TOKEN_ACTIVE_RECHECK_SECONDS', 30):
+        entry = entry._replace(active=_is_active(entry.sub), checked_at=now)
+        cache.set(digest, entry, ttl=max(entry.exp - time.time(), 0))
+
+    if not entry.active or _revoked_users().get(entry.sub):
+        return INVALID_TOKEN_MESSAGE
+    return entry.sub
+
+
+@event.listens_for(User.active, 'set')
+def _track_deactivation(target, value, oldvalue, initiator):
+    # Applied to the revoked set once the change commits
+    session = object_session(target)
+    if target.id is None or session is None:
+        return
+    session.info.setdefault('user_active_changes', {})[target.id] = bool(value)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_committed_deactivations(session):
+    changes = session.info.pop('user_active_changes', None)
+    if changes and has_app_context():
+        revoked = _revoked_users()
+        for user_id, active in changes.items():
+            if active:
+                revoked.pop(user_id)
+            else:
+                revoked.set(user_id, True)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_deactivations(session):
+    session.info.pop('user_active_changes', None)
@@ -2,7 +2,8 @@
 
 from functools import wraps
 from flask import request, jsonify
-from project.api.models import User
+from project.api.principal import get_principal
+from project.api.token_cache import verify_auth_token
 
 
 def authenticate(f):
@@ -16,13 +17,10 @@ def authenticate(f):
         if not auth_header:
             return jsonify(response_object), 403
         auth_token = auth_header.split(" ")[1]
-        resp = User.decode_auth_token(auth_token)
+        resp = verify_auth_token(auth_token)
         if isinstance(resp, str):
             response_object['message'] = resp
             return jsonify(response_object), 401
-        user = User.query.filter_by(id=resp).first()
-        if not user or not user.active:
-            return jsonify(response_object), 401
         return f(resp, *args, **kwargs)
     return decorated_function
 
@@ -38,27 +36,24 @@ def authenticate_restful(f):
         if not auth_header:
             return response_object, 403
         auth_token = auth_header.split(" ")[1]
-        resp = User.decode_auth_token(auth_token)
+        resp = verify_auth_token(auth_token)
         if isinstance(resp, str):
             response_object['message'] = resp
             return response_object, 401
-        user = User.query.filter_by(id=resp).first()
-        if not user or not user.active:
-            return response_object, 401
         return f(resp, *args, **kwargs)
     return decorated_function
 
 
 def is_admin(user_id):
-    user = User.query.filter_by(id=user_id).first()
-    return user.admin
+    principal = get_principal(user_id)
+    return principal.admin
 
 
 def admin_required(f):
     @wraps(f)
     def decorated_function(user_id, *args, **kwargs):
-        user = User.query.filter_by(id=user_id).first()
-        if not user or not (user.admin or user.is_super_admin):
+        principal = get_principal(user_id)
+        if not principal or not principal.is_admin:
             return jsonify({'status': 'fail', 'message': 'Admin access required.'}), 403
 
         return f(user_id, *args, **kwargs)
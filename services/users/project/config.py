@@ -15,6 +15,77 @@ class BaseConfig:
     TOKEN_EXPIRATION_DAYS = 30
     TOKEN_EXPIRATION_SECONDS = 0
 
+    # In-process caches; versions in cache_versions are re-read this often
+    CACHE_VERSION_POLL_SECONDS = 5
+    PERMISSION_CACHE_SIZE = 4096
+    PERMISSION_CACHE_TTL = 300
+    TOKEN_CACHE_SIZE = 10000
+    TOKEN_ACTIVE_RECHECK_SECONDS = 30
+
+    # Password hashing pool; None sizes it to the CPU count, 0 hashes inline
+    HASHING_WORKERS = None
+    HASHING_MAX_PENDING = None
+    HASHING_TIMEOUT_SECONDS = 10
+
+    # Idempotency keys: how long responses are kept, and the hot cache
+    IDEMPOTENCY_TTL_SECONDS = 7 * 24 * 3600
+    IDEMPOTENCY_CACHE_SIZE = 10000
+    IDEMPOTENCY_CACHE_TTL = 600
+
+    # Admin dashboard payload (read from platform_stats) is cached this long
+    ADMIN_DASHBOARD_CACHE_TTL = 30
+
+    # Member dashboards: keyed by per-group cache_versions counters, so
+    # relevant commits retire every worker's copy
+    MEMBER_DASHBOARD_CACHE_SIZE = 5000
+    MEMBER_DASHBOARD_CACHE_TTL = 60
+
+    # Rows fetched per server-side cursor round trip in streaming exports
+    EXPORT_CHUNK_SIZE = 1000
+
+    # Outbox dispatcher: events per batch, retries (with backoff) and polling
+    OUTBOX_BATCH_SIZE = 100
+    OUTBOX_MAX_ATTEMPTS = 5
+    OUTBOX_RETRY_SECONDS = 30
+    OUTBOX_POLL_SECONDS = 1
+
+    # Socket.IO message queue (e.g. redis://redis:6379/0) through which
+    # workers and dispatchers emit to clients of the web processes. Without
+    # one, broadcasts are emitted by the web process that commits them.
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+
+    # Background jobs (manage.py run_workers): retries with backoff, polling,
+    # and how long a RUNNING job may go before its worker is presumed dead
+    JOB_MAX_ATTEMPTS = 3
+    JOB_RETRY_SECONDS = 30
+    JOB_POLL_SECONDS = 2
+    JOB_TIMEOUT_SECONDS = 3600
+
+    # Jobs the workers queue for themselves: name -> seconds between runs
+    PERIODIC_JOBS = {
+        'outbox.dispatch': 60,
+        'rollups.group_daily': 300,
+        'loans.update_overdue': 3600,
+        'idempotency.purge': 3600,
+        'platform_stats.reconcile': 24 * 3600,
+    }
+
+    # group_daily_stats rollup: source rows per batch, and how old a row must
+    # be before it is folded in (covers transactions that commit late)
+    ROLLUP_BATCH_SIZE = 5000
+    ROLLUP_LAG_SECONDS = 60
+
+    # Portfolio reports reuse one in-memory NumPy snapshot per worker this long
+    PORTFOLIO_SNAPSHOT_TTL = 600
+
+    # Calendar filter summaries, per viewer and normalized filter set
+    CALENDAR_SUMMARY_CACHE_SIZE = 2000
+    CALENDAR_SUMMARY_CACHE_TTL = 30
+
+    # Group names and locations for filter options; rebuilt when the
+    # group_directory version is bumped, at the latest after this long
+    GROUP_DIRECTORY_CACHE_TTL = 3600
+
     # Aurora-specific SQLAlchemy configuration
     SQLALCHEMY_ENGINE_OPTIONS = aurora_config.get_connection_params()
 
@@ -36,6 +107,8 @@ class TestingConfig(BaseConfig):
     TOKEN_EXPIRATION_DAYS = 0
     TOKEN_EXPIRATION_SECONDS = 3
     PRESERVE_CONTEXT_ON_EXCEPTION = False
+    HASHING_WORKERS = 0
+    PERIODIC_JOBS = {}
 
     # Override Aurora config for testing
     SQLALCHEMY_ENGINE_OPTIONS = {
@@ -16,6 +16,8 @@ os.environ['SECRET_KEY'] = 'my_precious'
 
 class BaseTestCase(TestCase):
     def create_app(self):
+        # test_config switches APP_SETTINGS for its own apps
+        os.environ['APP_SETTINGS'] = 'project.config.TestingConfig'
         app, socketio = create_app()
         return app
 
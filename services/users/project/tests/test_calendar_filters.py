@@ -0,0 +1,113 @@
+# services/users/project/tests/test_calendar_filters.py
+
+
+import json
+import unittest
+from datetime import date, timedelta
+
+from sqlalchemy import event
+from werkzeug.datastructures import MultiDict
+
+from project import db
+from project.api.calendar import summary_cache_key
+from project.api.models import CalendarEvent, SavingsGroup, GroupMember
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestCalendarFilters(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        admin = add_user('admin', 'admin@test.com', 'greaterthaneight')
+        admin.is_super_admin = True
+        member = add_user('member', 'member@test.com', 'greaterthaneight')
+        groups = []
+        for name, district, village in (('North Group', 'Gulu', 'Layibi'),
+                                        ('South Group', 'Kampala', 'Nakasero')):
+            group = SavingsGroup(name=name, formation_date=date.today(), created_by=admin.id,
+                                 district=district, parish='Central', village=village)
+            db.session.add(group)
+            db.session.flush()
+            groups.append(group)
+        db.session.add(GroupMember(groups[0].id, member.id, 'Mary', 'F'))
+        for day, (group, event_type, fund_type, amount) in enumerate((
+            (groups[0], 'TRANSACTION', 'PERSONAL', 100),
+            (groups[0], 'TRANSACTION', 'SOCIAL', 50),
+            (groups[0], 'FINE', None, 20),
+            (groups[1], 'TRANSACTION', 'PERSONAL', 1000),
+        )):
+            db.session.add(CalendarEvent(f'Event {day}', event_type, date.today() - timedelta(days=day),
+                                         group.id, fund_type=fund_type, amount=amount))
+        db.session.commit()
+        self.admin_headers = {'Authorization': f'Bearer {admin.encode_auth_token(admin.id)}'}
+        self.member_headers = {'Authorization': f'Bearer {member.encode_auth_token(member.id)}'}
+
+    def _get(self, url, headers):
+        response = self.client.get(url, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.data.decode())
+
+    def test_summary_covers_every_page(self):
+        data = self._get('/calendar/events?district=Gulu&per_page=1', self.admin_headers)
+        self.assertEqual(len(data['events']), 1)
+        self.assertEqual(data['summary']['total_events'], 3)
+        self.assertEqual(data['summary']['total_amount'], 170.0)
+        self.assertEqual(data['summary']['event_type_breakdown'], {'TRANSACTION': 2, 'FINE': 1})
+        self.assertEqual(data['summary']['fund_type_breakdown'], {'PERSONAL': 1, 'SOCIAL': 1})
+        self.assertEqual(data['summary']['applied_filters'], ['District: Gulu'])
+
+        # Regular users only count events of their own groups
+        data = self._get('/calendar/events?per_page=1&cursor=', self.member_headers)
+        self.assertEqual(data['summary']['total_events'], 3)
+        data = self._get('/calendar/events?event_types=TRANSACTION', self.admin_headers)
+        self.assertEqual(data['summary']['total_amount'], 1150.0)
+
+    def test_summary_is_cached_per_filter_set(self):
+        url = '/calendar/events?event_types=TRANSACTION,FINE&district=Gulu'
+        self.assertEqual(self._get(url, self.admin_headers)['summary']['total_events'], 3)
+
+        CalendarEvent.query.filter_by(event_type='FINE').delete()
+        db.session.commit()
+        # Same filters in another order and page: served from the cache
+        data = self._get('/calendar/events?page=2&district=Gulu&event_types=FINE,TRANSACTION',
+                         self.admin_headers)
+        self.assertEqual(data['summary']['total_events'], 3)
+        self.assertEqual(self._get(url + '&village=Layibi', self.admin_headers)['summary']['total_events'], 2)
+
+    def test_filter_options_come_from_the_group_directory(self):
+        data = self._get('/api/calendar/filter-options', self.admin_headers)
+        self.assertEqual([d['value'] for d in data['districts']], ['Gulu', 'Kampala'])
+        self.assertEqual([g['label'] for g in data['groups']], ['North Group', 'South Group'])
+        data = self._get('/api/calendar/filter-options', self.member_headers)
+        self.assertEqual(data['villages'], [{'value': 'Layibi', 'label': 'Layibi'}])
+        self.assertEqual([g['label'] for g in data['groups']], ['North Group'])
+
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = db.engine
+        event.listen(engine, 'before_cursor_execute', capture)
+        try:
+            self._get('/api/calendar/filter-options', self.admin_headers)
+        finally:
+            event.remove(engine, 'before_cursor_execute', capture)
+        self.assertFalse([s for s in statements if 'FROM savings_groups' in s])
+
+        # Moving a group rebuilds the directory
+        group = SavingsGroup.query.filter_by(name='South Group').first()
+        group.district = 'Wakiso'
+        db.session.commit()
+        data = self._get('/api/calendar/filter-options', self.admin_headers)
+        self.assertEqual([d['value'] for d in data['districts']], ['Gulu', 'Wakiso'])
+
+    def test_summary_cache_key(self):
+        key = summary_cache_key('all', MultiDict([('b', '2'), ('a', 'x, y'), ('page', '3'), ('c', 'ALL')]))
+        self.assertEqual(key, summary_cache_key('all', MultiDict([('a', 'y,x'), ('b', '2')])))
+        self.assertNotEqual(key, summary_cache_key(7, MultiDict([('a', 'y,x'), ('b', '2')])))
+
+
+if __name__ == '__main__':
+    unittest.main()
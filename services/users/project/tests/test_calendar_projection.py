@@ -0,0 +1,172 @@
+# services/users/project/tests/test_calendar_projection.py
+
+
+import unittest
+from datetime import date, datetime, timedelta
+
+from sqlalchemy.dialects import postgresql
+
+from project import db
+from project.api.calendar import FilterProcessor
+from project.api.calendar_projection import BULK_PROJECTIONS, bulk_insert_statement, rebuild
+from project.api.jobs import enqueue, work
+from project.api.models import (
+    BackgroundJob, CalendarEvent, SavingsGroup, GroupMember, GroupTransaction, GroupLoan, MeetingAttendance,
+    MemberFine
+)
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestCalendarProjection(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        user = add_user('projector', 'projector@test.com', 'greaterthaneight')
+        group = SavingsGroup(
+            name='Projection Group', formation_date=date.today(), created_by=user.id,
+            district='Kampala', parish='Central', village='Nakasero'
+        )
+        db.session.add(group)
+        db.session.flush()
+        alice = GroupMember(group.id, user.id, 'Alice', 'F')
+        bob = GroupMember(group.id, add_user('bob', 'bob@test.com', 'greaterthaneight').id, 'Bob', 'M')
+        db.session.add_all([alice, bob])
+        db.session.commit()
+        self.user_id = user.id
+        self.headers = {'Authorization': f'Bearer {user.encode_auth_token(user.id)}'}
+        self.group_id = group.id
+        self.alice_id = alice.id
+        self.bob_id = bob.id
+
+    def _events(self, event_type):
+        return CalendarEvent.query.filter_by(event_type=event_type).order_by(CalendarEvent.id).all()
+
+    def test_writes_project_their_events(self):
+        transaction = GroupTransaction(self.group_id, 'SAVING_CONTRIBUTION', 100, self.user_id,
+                                       member_id=self.alice_id)
+        transaction.group_balance_before = 0
+        transaction.group_balance_after = 100
+        loan = GroupLoan(self.group_id, 500, 6, 10, self.alice_id, 'stock')
+        fine = MemberFine(self.bob_id, 20, 'Late', 'LATE_ATTENDANCE', self.user_id)
+        db.session.add_all([transaction, loan, fine])
+        db.session.commit()
+
+        event = self._events('TRANSACTION')[0]
+        self.assertEqual((event.reference_type, event.reference_id), ('transaction', str(transaction.id)))
+        self.assertEqual(event.title, 'Alice - SAVING_CONTRIBUTION')
+        self.assertEqual(event.location, 'Nakasero')
+        self.assertEqual(self._events('LOAN')[0].title, 'Alice - Loan PENDING')
+        self.assertEqual(self._events('FINE')[0].verification_status, 'PENDING')
+
+        # Updates rewrite the same event, deletes remove it
+        loan.status = 'APPROVED'
+        fine.status = 'PAID'
+        db.session.commit()
+        loans = self._events('LOAN')
+        self.assertEqual(len(loans), 1)
+        self.assertEqual(loans[0].title, 'Alice - Loan APPROVED')
+        self.assertEqual(loans[0].verification_status, 'VERIFIED')
+        self.assertEqual(self._events('FINE')[0].title, 'Bob - Fine PAID')
+
+        db.session.delete(fine)
+        db.session.commit()
+        self.assertEqual(self._events('FINE'), [])
+
+    def test_meeting_event_follows_attendance(self):
+        meeting_date = date.today() - timedelta(days=2)
+        db.session.add(MeetingAttendance(self.group_id, self.alice_id, meeting_date, self.user_id,
+                                         attended=True))
+        db.session.commit()
+        self.assertEqual(self._events('MEETING')[0].attendees_count, 1)
+
+        bob = MeetingAttendance(self.group_id, self.bob_id, meeting_date, self.user_id, attended=True)
+        db.session.add(bob)
+        db.session.commit()
+        meetings = self._events('MEETING')
+        self.assertEqual(len(meetings), 1)
+        self.assertEqual(meetings[0].description, 'REGULAR meeting with 2/2 members present')
+
+        # Moving the only other record leaves one event per meeting
+        bob.meeting_date = meeting_date - timedelta(days=7)
+        db.session.commit()
+        self.assertEqual(
+            sorted((e.event_date, e.attendees_count) for e in self._events('MEETING')),
+            [(meeting_date - timedelta(days=7), 1), (meeting_date, 1)]
+        )
+
+    def test_events_follow_group_location(self):
+        db.session.add(MemberFine(self.alice_id, 10, 'Noise', 'OTHER', self.user_id))
+        db.session.add(CalendarEvent('Hand-made', 'TRANSACTION', date.today(), self.group_id,
+                                     location='Town hall'))
+        db.session.commit()
+        for event in CalendarEvent.query.all():
+            self.assertEqual((event.district, event.parish, event.village),
+                             ('Kampala', 'Central', 'Nakasero'))
+
+        group = db.session.get(SavingsGroup, self.group_id)
+        group.village = 'Kololo'
+        db.session.commit()
+        fine, hand_made = self._events('FINE')[0], self._events('TRANSACTION')[0]
+        self.assertEqual((fine.village, fine.location), ('Kololo', 'Kololo'))
+        self.assertEqual((hand_made.village, hand_made.location), ('Kololo', 'Town hall'))
+
+        filters = FilterProcessor({'district': 'Kampala', 'village': 'Kololo'})
+        query = filters.apply_geographic_filters(CalendarEvent.query)
+        self.assertNotIn('JOIN', str(query.statement))
+        self.assertEqual(query.count(), 2)
+        self.assertEqual(filters.applied_filters, ['District: Kampala', 'Village: Kololo'])
+        self.assertEqual(
+            FilterProcessor({'village': 'Nakasero'}).apply_geographic_filters(CalendarEvent.query).count(), 0
+        )
+
+    def test_rebuild_replaces_projected_events(self):
+        db.session.add(MemberFine(self.alice_id, 10, 'Noise', 'OTHER', self.user_id))
+        db.session.add(CalendarEvent('Hand-made', 'TRANSACTION', date.today(), self.group_id))
+        db.session.commit()
+        CalendarEvent.query.filter_by(event_type='FINE').update({'title': 'stale'})
+        db.session.commit()
+
+        self.assertEqual(rebuild(), 1)
+        self.assertEqual(self._events('FINE')[0].title, 'Alice - Fine PENDING')
+        self.assertEqual(CalendarEvent.query.count(), 2)
+
+    def test_rebuild_reports_progress(self):
+        for amount in (10, 20, 30):
+            db.session.add(MemberFine(self.alice_id, amount, 'Noise', 'OTHER', self.user_id))
+        db.session.commit()
+
+        reported = []
+        self.assertEqual(rebuild(chunk_size=2, progress=lambda *step: reported.append(step)), 3)
+        self.assertIn(('fine', 2), reported)
+        self.assertEqual(reported[-1], ('fine', 3))
+
+    def test_reading_an_empty_calendar_writes_nothing(self):
+        # Source rows from before the projector have no events
+        db.session.add(MemberFine(self.alice_id, 10, 'Noise', 'OTHER', self.user_id))
+        db.session.commit()
+        CalendarEvent.query.delete()
+        db.session.commit()
+
+        response = self.client.get('/calendar/events', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(BackgroundJob.query.count(), 0)
+
+        # The rebuild the migration queues projects them
+        enqueue('calendar.regenerate')
+        db.session.commit()
+        self.assertEqual(work(once=True), 1)
+        self.assertEqual(self._events('FINE')[0].title, 'Alice - Fine PENDING')
+
+    def test_bulk_statements_are_insert_select(self):
+        for reference_type in BULK_PROJECTIONS:
+            sql = str(bulk_insert_statement(reference_type, datetime.utcnow()).compile(
+                dialect=postgresql.dialect()
+            ))
+            self.assertTrue(sql.startswith('INSERT INTO calendar_events'), reference_type)
+            self.assertIn('SELECT', sql)
+            self.assertIn('reference_id', sql)
+
+
+if __name__ == '__main__':
+    unittest.main()
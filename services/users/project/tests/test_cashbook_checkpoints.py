@@ -0,0 +1,106 @@
+# services/users/project/tests/test_cashbook_checkpoints.py
+
+
+import json
+import unittest
+from datetime import date
+from decimal import Decimal
+
+from project import db
+from project.api.models import SavingsGroup, GroupCashbookCheckpoint
+from project.api.cashbook_service import CashbookService
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestCashbookCheckpoints(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = add_user('ledger', 'ledger@test.com', 'greaterthaneight')
+        self.user.is_super_admin = True
+        group = SavingsGroup(
+            name='Checkpoint Group', formation_date=date(2026, 1, 1),
+            created_by=self.user.id, district='Kampala', parish='Central',
+            village='Nakasero'
+        )
+        db.session.add(group)
+        db.session.commit()
+        self.group_id = group.id
+
+    def _deposit(self, on, amount):
+        entry = CashbookService.create_cashbook_entry(
+            self.group_id, on, 'Deposit', 'DEPOSIT', self.user.id,
+            individual_saving=amount
+        )
+        db.session.commit()
+        return entry
+
+    def _checkpoint(self, period, period_end):
+        return GroupCashbookCheckpoint.query.filter_by(
+            group_id=self.group_id, period=period, period_end=period_end
+        ).first()
+
+    def test_postings_write_day_and_month_checkpoints(self):
+        self._deposit(date(2026, 1, 10), 100)
+        self._deposit(date(2026, 1, 20), 50)
+        self._deposit(date(2026, 2, 1), 25)
+
+        self.assertEqual(self._checkpoint('DAY', date(2026, 1, 10)).total_balance, Decimal('100.00'))
+        month = self._checkpoint('MONTH', date(2026, 1, 31))
+        self.assertEqual(month.last_entry_date, date(2026, 1, 20))
+        self.assertEqual(month.total_balance, Decimal('150.00'))
+        self.assertEqual(self._checkpoint('MONTH', date(2026, 2, 28)).total_balance, Decimal('175.00'))
+
+    def test_as_of_matches_ledger_scan(self):
+        for day, amount in ((date(2026, 1, 10), 100), (date(2026, 2, 3), 40), (date(2026, 2, 9), 10)):
+            self._deposit(day, amount)
+
+        for as_of, expected in ((date(2026, 1, 9), 0.0), (date(2026, 1, 31), 100.0),
+                                (date(2026, 2, 5), 140.0), (date(2026, 3, 1), 150.0)):
+            summary = CashbookService.get_group_financial_summary(self.group_id, as_of)
+            self.assertEqual(summary['total_balance'], expected)
+
+    def test_as_of_replays_entries_missing_checkpoints(self):
+        self._deposit(date(2026, 1, 10), 100)
+        GroupCashbookCheckpoint.query.delete()
+        db.session.commit()
+
+        summary = CashbookService.get_group_financial_summary(self.group_id, date(2026, 1, 12))
+        self.assertEqual(summary['total_balance'], 100.0)
+        self.assertEqual(summary['last_transaction_date'], '2026-01-10')
+
+        self.assertEqual(CashbookService.rebuild_checkpoints(self.group_id), 2)
+        db.session.commit()
+        self.assertIsNotNone(self._checkpoint('MONTH', date(2026, 1, 31)))
+
+    def test_month_series_endpoint(self):
+        self._deposit(date(2025, 12, 20), 10)
+        self._deposit(date(2026, 1, 10), 100)
+        self._deposit(date(2026, 3, 5), 5)
+        self._deposit(date(2026, 3, 25), 5)
+
+        response = self.client.get(
+            f'/savings-groups/{self.group_id}/financial-summary/series'
+            '?start_date=2026-01-01&end_date=2026-03-20',
+            headers={'Authorization': f'Bearer {self.user.encode_auth_token(self.user.id)}'}
+        )
+        data = json.loads(response.data.decode())
+        self.assertEqual(response.status_code, 200)
+        series = data['data']['series']
+        self.assertEqual([point['as_of_date'] for point in series],
+                         ['2026-01-31', '2026-02-28', '2026-03-20'])
+        self.assertEqual([point['total_balance'] for point in series], [110.0, 110.0, 115.0])
+
+    def test_month_series_without_checkpoints(self):
+        for day, amount in ((date(2026, 1, 10), 100), (date(2026, 2, 3), 40), (date(2026, 4, 9), 10)):
+            self._deposit(day, amount)
+        GroupCashbookCheckpoint.query.delete()
+        db.session.commit()
+
+        series = CashbookService.get_group_balance_series(self.group_id, date(2026, 1, 1), date(2026, 4, 30))
+        self.assertEqual([point['total_balance'] for point in series], [100.0, 140.0, 140.0, 150.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
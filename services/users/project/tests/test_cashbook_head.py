@@ -0,0 +1,74 @@
+# services/users/project/tests/test_cashbook_head.py
+
+
+import unittest
+from datetime import date, timedelta
+from decimal import Decimal
+
+from project import db
+from project.api.models import SavingsGroup, GroupCashbook, GroupCashbookHead
+from project.api.cashbook_service import CashbookService
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestCashbookHead(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = add_user('cashier', 'cashier@test.com', 'greaterthaneight')
+        group = SavingsGroup(
+            name='Head Group', formation_date=date.today(),
+            created_by=self.user.id, district='Kampala', parish='Central',
+            village='Nakasero'
+        )
+        db.session.add(group)
+        db.session.commit()
+        self.group_id = group.id
+
+    def _deposit(self, **amounts):
+        entry = CashbookService.create_cashbook_entry(
+            self.group_id, date.today(), 'Deposit', 'DEPOSIT', self.user.id,
+            **amounts
+        )
+        db.session.commit()
+        return entry
+
+    def test_head_tracks_running_balances(self):
+        self._deposit(individual_saving=100, ecd_fund=20)
+        entry = self._deposit(social_fund=5)
+
+        head = GroupCashbookHead.query.get(self.group_id)
+        self.assertEqual(head.last_entry_id, entry.id)
+        self.assertEqual(head.individual_balance, Decimal('100.00'))
+        self.assertEqual(head.social_balance, Decimal('5.00'))
+        self.assertEqual(head.total_balance, Decimal('125.00'))
+        self.assertEqual(entry.total_balance, Decimal('125.00'))
+
+    def test_head_is_seeded_from_existing_ledger(self):
+        legacy = GroupCashbook(
+            self.group_id, date.today() - timedelta(days=3), 'Opening balance',
+            'DEPOSIT', self.user.id
+        )
+        legacy.individual_balance = Decimal('400.00')
+        legacy.ecd_balance = legacy.social_balance = legacy.target_balance = Decimal('0.00')
+        legacy.calculate_total_balance()
+        db.session.add(legacy)
+        db.session.commit()
+
+        entry = self._deposit(individual_saving=50)
+        self.assertEqual(entry.individual_balance, Decimal('450.00'))
+        self.assertEqual(GroupCashbookHead.query.count(), 1)
+
+    def test_entry_is_not_committed_by_the_service(self):
+        CashbookService.create_cashbook_entry(
+            self.group_id, date.today(), 'Deposit', 'DEPOSIT', self.user.id,
+            individual_saving=10
+        )
+        db.session.rollback()
+        self.assertEqual(GroupCashbook.query.count(), 0)
+        self.assertIsNone(GroupCashbookHead.query.get(self.group_id))
+
+
+if __name__ == '__main__':
+    unittest.main()
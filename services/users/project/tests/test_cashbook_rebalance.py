@@ -0,0 +1,103 @@
+# services/users/project/tests/test_cashbook_rebalance.py
+
+
+import unittest
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import event
+
+from project import db
+from project.api.models import (
+    SavingsGroup, GroupCashbook, GroupCashbookHead, GroupCashbookCheckpoint
+)
+from project.api.cashbook_service import CashbookService
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestCashbookRebalance(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = add_user('rebalance', 'rebalance@test.com', 'greaterthaneight')
+        group = SavingsGroup(
+            name='Rebalance Group', formation_date=date(2026, 1, 1),
+            created_by=self.user.id, district='Kampala', parish='Central',
+            village='Nakasero'
+        )
+        db.session.add(group)
+        db.session.commit()
+        self.group_id = group.id
+
+    def _post(self, on, amount, entry_type='DEPOSIT'):
+        entry = CashbookService.create_cashbook_entry(
+            self.group_id, on, entry_type.title(), entry_type, self.user.id,
+            individual_saving=amount
+        )
+        db.session.commit()
+        return entry.id
+
+    def _totals(self):
+        return [
+            float(entry.total_balance) for entry in GroupCashbook.query.filter_by(
+                group_id=self.group_id, status='ACTIVE'
+            ).order_by(GroupCashbook.transaction_date, GroupCashbook.id)
+        ]
+
+    def test_backdated_entry_rebalances_later_rows(self):
+        self._post(date(2026, 1, 10), 100)
+        last_id = self._post(date(2026, 2, 20), 50)
+        self._post(date(2026, 1, 15), 25)
+
+        self.assertEqual(self._totals(), [100.0, 125.0, 175.0])
+        head = GroupCashbookHead.query.get(self.group_id)
+        self.assertEqual(head.last_entry_id, last_id)
+        self.assertEqual(head.total_balance, Decimal('175.00'))
+        january = GroupCashbookCheckpoint.query.filter_by(
+            group_id=self.group_id, period='MONTH', period_end=date(2026, 1, 31)
+        ).one()
+        self.assertEqual(january.total_balance, Decimal('125.00'))
+
+        # the next append continues from the rebalanced head
+        self._post(date(2026, 2, 21), 5)
+        self.assertEqual(self._totals()[-1], 180.0)
+
+    def test_reversal_rewrites_only_the_suffix(self):
+        self._post(date(2026, 1, 5), 10)
+        first = self._post(date(2026, 1, 10), 100)
+        self._post(date(2026, 1, 20), 50)
+        self._post(date(2026, 1, 25), 30, 'WITHDRAWAL')
+
+        updates = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith('UPDATE group_cashbook SET individual_balance'):
+                updates.append(parameters)
+
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            CashbookService.reverse_cashbook_entry(first)
+            db.session.commit()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+
+        # withdrawals keep build_cashbook_entry's arithmetic (amount - |amount|)
+        self.assertEqual(self._totals(), [10.0, 60.0, 60.0])
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(GroupCashbookHead.query.get(self.group_id).total_balance, Decimal('60.00'))
+        summary = CashbookService.get_group_financial_summary(self.group_id, date(2026, 1, 12))
+        self.assertEqual(summary['total_balance'], 10.0)
+
+    def test_rebalance_refuses_negative_balances(self):
+        first = self._post(date(2026, 1, 10), 100)
+        self._post(date(2026, 1, 20), -40, 'WITHDRAWAL')
+
+        with self.assertRaises(ValueError):
+            CashbookService.reverse_cashbook_entry(first)
+        db.session.rollback()
+        self.assertEqual(GroupCashbook.query.get(first).status, 'ACTIVE')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+# services/users/project/tests/test_exports.py
+
+
+import csv
+import io
+import json
+import unittest
+from datetime import date
+
+from project import db
+from project.api.models import (
+    SavingsGroup, GroupMember, SavingType, Service, UserServicePermission
+)
+from project.api.cashbook_service import CashbookService
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestExports(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.app.config['EXPORT_CHUNK_SIZE'] = 2
+        self.admin = add_user('auditor', 'auditor@test.com', 'greaterthaneight')
+        self.admin.is_super_admin = True
+        self.groups = []
+        for name, district in (('North', 'Gulu'), ('South', 'Masaka')):
+            group = SavingsGroup(
+                name=name, formation_date=date(2026, 1, 1), created_by=self.admin.id,
+                district=district, parish='Central', village='Town'
+            )
+            db.session.add(group)
+            db.session.flush()
+            self.groups.append(group.id)
+        self.member = GroupMember(self.groups[0], self.admin.id, 'Alice', 'F')
+        db.session.add(self.member)
+        db.session.add(SavingType('Personal Savings', 'PERSONAL', self.admin.id))
+        db.session.commit()
+
+        for group_id in self.groups:
+            for day in (3, 4, 5):
+                CashbookService.create_cashbook_entry(
+                    group_id, date(2026, 1, day), f'Deposit {day}', 'DEPOSIT',
+                    self.admin.id, individual_saving=10
+                )
+        db.session.commit()
+
+    def _get(self, path, user=None):
+        user = user or self.admin
+        return self.client.get(path, headers={
+            'Authorization': f'Bearer {user.encode_auth_token(user.id)}'
+        })
+
+    def test_cashbook_csv_by_district_and_date(self):
+        response = self._get('/exports/cashbook?district=Gulu&start_date=2026-01-04')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        self.assertIn('text/csv', response.content_type)
+
+        rows = list(csv.DictReader(io.StringIO(response.data.decode())))
+        self.assertEqual([row['transaction_date'] for row in rows], ['2026-01-04', '2026-01-05'])
+        self.assertEqual({row['group_id'] for row in rows}, {str(self.groups[0])})
+        self.assertEqual(rows[-1]['total_balance'], '30.00')
+
+    def test_saving_transactions_ndjson(self):
+        response = self.client.post(
+            f'/savings-groups/{self.groups[0]}/cashbook/batch',
+            data=json.dumps({'postings': [
+                {'type': 'SAVING', 'member_id': self.member.id,
+                 'saving_type_code': 'PERSONAL', 'amount': amount}
+                for amount in (100, 200, 300)
+            ]}),
+            content_type='application/json',
+            headers={'Authorization': f'Bearer {self.admin.encode_auth_token(self.admin.id)}'}
+        )
+        self.assertEqual(response.status_code, 201)
+
+        response = self._get(f'/exports/saving-transactions?group_id={self.groups[0]}&format=ndjson')
+        self.assertEqual(response.status_code, 200)
+        lines = [json.loads(line) for line in response.data.decode().splitlines()]
+        self.assertEqual([line['balance_after'] for line in lines], [100.0, 300.0, 600.0])
+        self.assertEqual(lines[0]['saving_type'], 'PERSONAL')
+
+    def test_members_only_export_their_groups(self):
+        member_user = add_user('member', 'member@test.com', 'greaterthaneight')
+        service = Service(name='Savings Groups')
+        db.session.add(service)
+        db.session.flush()
+        db.session.add(UserServicePermission(
+            user_id=member_user.id, service_id=service.id, permissions='read'
+        ))
+        db.session.add(GroupMember(self.groups[1], member_user.id, 'Bob', 'M'))
+        db.session.commit()
+
+        response = self._get(f'/exports/cashbook?group_id={self.groups[0]}', member_user)
+        self.assertEqual(response.status_code, 403)
+
+        response = self._get('/exports/cashbook', member_user)
+        self.assertEqual(response.status_code, 200)
+        rows = list(csv.DictReader(io.StringIO(response.data.decode())))
+        self.assertEqual({row['group_id'] for row in rows}, {str(self.groups[1])})
+
+    def test_unscoped_or_unknown_exports_are_rejected(self):
+        self.assertEqual(self._get('/exports/cashbook').status_code, 400)
+        self.assertEqual(self._get('/exports/loans?district=Gulu').status_code, 404)
+        self.assertEqual(self._get('/exports/cashbook?district=Gulu&format=xml').status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
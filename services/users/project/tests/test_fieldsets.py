@@ -0,0 +1,112 @@
+# services/users/project/tests/test_fieldsets.py
+
+
+import json
+import unittest
+from datetime import date
+
+from sqlalchemy import event
+
+from project import db
+from project.api.models import (
+    SavingsGroup, GroupMember, GroupTransaction, Notification
+)
+from project.api.fieldsets import FIELDSETS, parse_fieldset
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestFieldsets(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = add_user('fields', 'fields@test.com', 'greaterthaneight')
+        self.user.is_super_admin = True
+        group = SavingsGroup(
+            name='Fields Group', formation_date=date.today(),
+            created_by=self.user.id, district='Kampala', parish='Central',
+            village='Nakasero'
+        )
+        db.session.add(group)
+        db.session.flush()
+        member = GroupMember(
+            group_id=group.id, user_id=self.user.id, name='Alice', gender='F'
+        )
+        db.session.add(member)
+        db.session.flush()
+        transaction = GroupTransaction(
+            group_id=group.id, type='SAVING_CONTRIBUTION', amount=5000,
+            processed_by=self.user.id, member_id=member.id,
+            description='Weekly saving'
+        )
+        transaction.group_balance_before = 0
+        transaction.group_balance_after = 5000
+        db.session.add(transaction)
+        db.session.commit()
+        self.group_id = group.id
+        self.headers = {
+            'Authorization': f'Bearer {self.user.encode_auth_token(self.user.id)}'
+        }
+
+    def test_transactions_projection(self):
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            response = self.client.get(
+                f'/savings-groups/{self.group_id}/transactions?fields=amount,member',
+                headers=self.headers
+            )
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+
+        data = json.loads(response.data.decode())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            data['data']['transactions'], [{'amount': 5000.0, 'member': 'Alice'}]
+        )
+        selects = [s for s in statements if 'FROM group_transactions' in s and 'count(' not in s]
+        self.assertTrue(selects)
+        self.assertNotIn('description', selects[-1])
+
+    def test_full_projection_matches_to_json(self):
+        _, available = FIELDSETS['group_transaction']
+        fieldset = parse_fieldset('group_transaction', {'fields': ','.join(available)})
+        transaction = fieldset.apply(GroupTransaction.query).one()
+        self.assertEqual(fieldset.serialize(transaction), transaction.to_json())
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(
+            f'/savings-groups/{self.group_id}/members?fields=name,salary',
+            headers=self.headers
+        )
+        data = json.loads(response.data.decode())
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('salary', data['message'])
+
+    def test_members_and_notifications_projection(self):
+        db.session.add(Notification(user_id=self.user.id, message='Hello'))
+        db.session.commit()
+
+        response = self.client.get(
+            f'/savings-groups/{self.group_id}/members?fields=name,is_officer',
+            headers=self.headers
+        )
+        data = json.loads(response.data.decode())
+        self.assertEqual(
+            data['data']['members'], [{'name': 'Alice', 'is_officer': False}]
+        )
+
+        response = self.client.get(
+            f'/notifications/user/{self.user.id}?fields=message,read',
+            headers=self.headers
+        )
+        data = json.loads(response.data.decode())
+        self.assertEqual(data['data'], [{'message': 'Hello', 'read': False}])
+
+
+if __name__ == '__main__':
+    unittest.main()
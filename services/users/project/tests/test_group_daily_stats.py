@@ -0,0 +1,197 @@
+# services/users/project/tests/test_group_daily_stats.py
+
+
+import json
+import unittest
+from datetime import date, timedelta
+from decimal import Decimal
+
+from project import db
+from project.api import rollups
+from project.api.cashbook_service import CashbookService
+from project.api.jobs import work
+from project.api.models import (
+    BackgroundJob, GroupCashbookHead, GroupDailyStat, GroupMember, MeetingAttendance, MemberFine,
+    SavingsGroup
+)
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestGroupDailyStats(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.app.config['ROLLUP_LAG_SECONDS'] = 0
+        user = add_user('rollup', 'rollup@test.com', 'greaterthaneight')
+        user.is_super_admin = True
+        group = SavingsGroup(
+            name='Rollup Group', formation_date=date.today() - timedelta(days=30),
+            created_by=user.id, district='Kampala', parish='Central', village='Nakasero'
+        )
+        db.session.add(group)
+        db.session.flush()
+        member = GroupMember(group.id, user.id, 'Alice', 'F')
+        db.session.add(member)
+        db.session.commit()
+
+        self.user_id = user.id
+        self.group_id = group.id
+        self.member_id = member.id
+        self.headers = {'Authorization': f'Bearer {user.encode_auth_token(user.id)}'}
+        self.today = date.today()
+        self.yesterday = self.today - timedelta(days=1)
+
+    def _post(self, on, entry_type='DEPOSIT', **amounts):
+        CashbookService.create_cashbook_entry(
+            self.group_id, on, entry_type.title(), entry_type, self.user_id, **amounts
+        )
+        db.session.commit()
+
+    def _day(self, on):
+        return db.session.get(GroupDailyStat, (self.group_id, on))
+
+    def _head_total(self):
+        return db.session.get(GroupCashbookHead, self.group_id).total_balance
+
+    def _seed(self):
+        self._post(self.yesterday, individual_saving=100)
+        self._post(self.yesterday, social_fund=20)
+        self._post(self.today, 'WITHDRAWAL', individual_saving=30)
+        self._post(self.today, 'LOAN', loan_taken=200)
+        db.session.add_all([
+            MeetingAttendance(self.group_id, self.member_id, self.yesterday, self.user_id, attended=True),
+            MemberFine(self.member_id, 15, 'Late', 'LATE_ATTENDANCE', self.user_id),
+        ])
+        db.session.commit()
+
+    def test_catch_up_folds_new_rows_once(self):
+        self._seed()
+        self.assertEqual(rollups.catch_up(), 6)
+        self.assertEqual(rollups.catch_up(), 0)
+
+        yesterday = self._day(self.yesterday)
+        self.assertEqual(yesterday.entries_count, 2)
+        self.assertEqual(yesterday.deposits, Decimal('120.00'))
+        self.assertEqual(yesterday.total_balance, Decimal('120.00'))
+        self.assertEqual((yesterday.meetings_held, yesterday.attendance_records,
+                          yesterday.attendance_present), (1, 1, 1))
+
+        today = self._day(self.today)
+        self.assertEqual(today.withdrawals, Decimal('30.00'))
+        self.assertEqual(today.loans_disbursed, Decimal('200.00'))
+        self.assertEqual(today.total_balance, self._head_total())
+        self.assertEqual((today.fines_count, today.fines_amount), (1, Decimal('15.00')))
+
+        # Only the new row is read on the next run
+        self._post(self.today, individual_saving=5)
+        self.assertEqual(rollups.catch_up(), 1)
+        today = self._day(self.today)
+        self.assertEqual(today.deposits, Decimal('5.00'))
+        self.assertEqual(today.total_balance, self._head_total())
+
+    def test_rows_inside_the_lag_wait(self):
+        self.app.config['ROLLUP_LAG_SECONDS'] = 3600
+        self._post(self.today, individual_saving=100)
+        self.assertEqual(rollups.catch_up(), 0)
+        self.assertIsNone(self._day(self.today))
+
+    def test_backfill_repairs_a_range(self):
+        self._seed()
+        rollups.catch_up()
+        GroupDailyStat.query.update({'deposits': 999})
+        db.session.commit()
+
+        self.assertEqual(rollups.backfill(start=self.today), 1)
+        self.assertEqual(self._day(self.today).deposits, Decimal('0.00'))
+        self.assertEqual(self._day(self.yesterday).deposits, Decimal('999.00'))
+
+        rollups.backfill()
+        self.assertEqual(self._day(self.yesterday).deposits, Decimal('120.00'))
+
+    def test_backdated_entry_queues_a_backfill(self):
+        self._post(self.today, individual_saving=50)
+        rollups.catch_up()
+
+        self._post(self.yesterday, individual_saving=25)
+        queued = BackgroundJob.query.filter_by(name='rollups.group_daily_backfill').one()
+        self.assertEqual(json.loads(queued.args)['start'], self.yesterday.isoformat())
+
+        work(once=True)
+        self.assertEqual(self._day(self.yesterday).total_balance, Decimal('25.00'))
+        self.assertEqual(self._day(self.today).total_balance, Decimal('75.00'))
+
+    def test_analytics_read_rollups(self):
+        self._seed()
+        rollups.catch_up()
+
+        response = self.client.get(f'/savings-groups/{self.group_id}/analytics/daily?days=7',
+                                   headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data.decode())['data']
+        self.assertEqual([day['day'] for day in data['days']],
+                         [self.yesterday.isoformat(), self.today.isoformat()])
+        self.assertIn('group_cashbook', data['rollups_updated'])
+
+        response = self.client.get(f'/savings-groups/{self.group_id}/analytics', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        analytics = json.loads(response.data.decode())['data']['analytics']
+        self.assertEqual(analytics['trends']['deposits'], 120.0)
+        self.assertEqual(analytics['trends']['fund_balances']['total_balance'], float(self._head_total()))
+        self.assertEqual(analytics['member_engagement']['attendance_rate'], 100.0)
+
+        response = self.client.get(f'/savings-groups/{self.group_id}/analytics/daily?days=0',
+                                   headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+    def test_daily_series_includes_rows_not_yet_rolled_up(self):
+        self._seed()
+        pending = rollups.daily_series(self.group_id, self.yesterday, self.today)
+        self.assertIsNone(self._day(self.today))
+        rollups.catch_up()
+        self.assertEqual(pending, [row.to_json() for row in
+                                   rollups.daily_stats(self.group_id, self.yesterday, self.today)])
+
+        # Half rolled up: the new entry is added to the day's row
+        self._post(self.today, individual_saving=5)
+        today = rollups.daily_series(self.group_id, self.today, self.today)[0]
+        self.assertEqual(today['deposits'], 5.0)
+        self.assertEqual(today['total_balance'], float(self._head_total()))
+
+    def test_period_totals_include_rows_not_yet_rolled_up(self):
+        self._seed()
+        expected = None
+        for _ in range(2):
+            totals = rollups.period_totals(self.group_id, self.yesterday, self.today)
+            self.assertEqual((totals['meetings_held'], totals['attendance_records'],
+                              totals['attendance_present']), (1, 1, 1))
+            self.assertEqual(totals['deposits'], Decimal('120.00'))
+            self.assertEqual(totals['fines_amount'], Decimal('15.00'))
+            self.assertEqual(totals['total_balance'], self._head_total())
+            self.assertTrue(expected is None or totals == expected)
+            expected = totals
+            rollups.catch_up()
+
+        # A second attendance record on a rolled-up meeting day
+        self.app.config['ROLLUP_LAG_SECONDS'] = 3600
+        bob = add_user('bob', 'bob@test.com', 'greaterthaneight')
+        other = GroupMember(self.group_id, bob.id, 'Bob', 'M')
+        db.session.add(other)
+        db.session.flush()
+        db.session.add(MeetingAttendance(self.group_id, other.id, self.yesterday, self.user_id,
+                                         attended=False))
+        self._post(self.today, individual_saving=5)
+        self.assertEqual(rollups.catch_up(), 0)
+        totals = rollups.period_totals(self.group_id, self.yesterday, self.today)
+        self.assertEqual((totals['meetings_held'], totals['attendance_records'],
+                          totals['attendance_present']), (1, 2, 1))
+        self.assertEqual(totals['deposits'], Decimal('125.00'))
+        self.assertEqual(totals['total_balance'], self._head_total())
+
+        response = self.client.get(f'/savings-groups/{self.group_id}/analytics', headers=self.headers)
+        engagement = json.loads(response.data.decode())['data']['analytics']['member_engagement']
+        self.assertEqual((engagement['recent_meetings'], engagement['attendance_rate']), (2, 50.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
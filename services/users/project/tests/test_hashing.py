@@ -0,0 +1,83 @@
+# services/users/project/tests/test_hashing.py
+
+
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from project.api.hashing import (
+    HashingOverloaded, PasswordHasher, check_password, hash_password
+)
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestPasswordHasher(BaseTestCase):
+
+    def test_hash_and_check_inline(self):
+        pw_hash = hash_password('greaterthaneight')
+        self.assertTrue(check_password(pw_hash, 'greaterthaneight'))
+        self.assertFalse(check_password(pw_hash, 'wrongpassword'))
+
+    def test_admission_control_rejects_when_full(self):
+        hasher = PasswordHasher(workers=0, max_pending=1, timeout=1)
+        hasher._slots.acquire()
+        with self.assertRaises(HashingOverloaded):
+            hasher.hash_password('greaterthaneight', 4)
+        self.assertEqual(hasher.metrics()['rejected'], 1)
+
+    def test_timed_out_job_keeps_its_slot_until_done(self):
+        hasher = PasswordHasher(workers=0, max_pending=1, timeout=0.05)
+        hasher._executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(hasher._executor.shutdown)
+        release = threading.Event()
+
+        with self.assertRaises(HashingOverloaded):
+            hasher._run(release.wait)
+        self.assertEqual(hasher.metrics()['in_flight'], 1)
+        with self.assertRaises(HashingOverloaded):
+            hasher._run(release.wait)
+        self.assertEqual(hasher.metrics()['rejected'], 1)
+
+        release.set()
+        hasher._executor.submit(lambda: None).result()
+        self.assertTrue(hasher._run(release.wait))
+        metrics = hasher.metrics()
+        self.assertEqual((metrics['timed_out'], metrics['in_flight']), (1, 0))
+
+    def test_register_returns_503_when_hashing_times_out(self):
+        with mock.patch.object(PasswordHasher, 'hash_password', side_effect=HashingOverloaded):
+            response = self.client.post(
+                '/auth/register',
+                data=json.dumps({'username': 'slow', 'email': 'slow@test.com', 'password': 'test'}),
+                content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 503)
+
+    def test_login_returns_503_when_overloaded(self):
+        add_user('test', 'test@test.com', 'test')
+        with mock.patch.object(
+            PasswordHasher, 'check_password', side_effect=HashingOverloaded
+        ):
+            response = self.client.post(
+                '/auth/login',
+                data=json.dumps({'email': 'test@test.com', 'password': 'test'}),
+                content_type='application/json'
+            )
+        data = json.loads(response.data.decode())
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(data['status'], 'fail')
+
+    def test_hashing_metrics_endpoint(self):
+        hash_password('greaterthaneight')
+        response = self.client.get('/monitoring/hashing')
+        data = json.loads(response.data.decode())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data['data']['completed'], 1)
+        self.assertIn('queue_depth', data['data'])
+
+
+if __name__ == '__main__':
+    unittest.main()
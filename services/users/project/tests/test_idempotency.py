@@ -0,0 +1,103 @@
+# services/users/project/tests/test_idempotency.py
+
+
+import json
+import unittest
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import event
+
+from project import db
+from project.api.models import SavingsGroup, GroupTransaction, IdempotencyKey
+from project.api.idempotency import GROUP_TRANSACTION, lookup, purge_expired, remember
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestIdempotency(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        user = add_user('retry', 'retry@test.com', 'greaterthaneight')
+        user.is_super_admin = True
+        group = SavingsGroup(
+            name='Retry Group', formation_date=date.today(),
+            created_by=user.id, district='Kampala', parish='Central',
+            village='Nakasero'
+        )
+        db.session.add(group)
+        db.session.commit()
+        self.user_id = user.id
+        self.group_id = group.id
+        self.headers = {'Authorization': f'Bearer {user.encode_auth_token(user.id)}'}
+
+    def _record(self, key, amount=100):
+        return self.client.post(
+            f'/savings-groups/{self.group_id}/transactions',
+            data=json.dumps({'type': 'SAVING_CONTRIBUTION', 'amount': amount, 'idempotency_key': key}),
+            content_type='application/json',
+            headers=self.headers
+        )
+
+    def test_retry_is_answered_from_cache(self):
+        first = json.loads(self._record('mobile-1').data.decode())
+        self.assertEqual(GroupTransaction.query.one().idempotency_key, 'mobile-1')
+        self.assertEqual(first['data']['transaction']['idempotency_key'], 'mobile-1')
+
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            if 'group_transactions' in statement or 'idempotency_keys' in statement:
+                statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            response = self._record('mobile-1')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+
+        data = json.loads(response.data.decode())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data['message'], 'Transaction already processed.')
+        self.assertEqual(data['data']['transaction']['id'], first['data']['transaction']['id'])
+        self.assertEqual(statements, [])
+        self.assertEqual(GroupTransaction.query.count(), 1)
+
+    def test_stored_key_survives_cache_loss(self):
+        self._record('mobile-2')
+        self.app.extensions['ttl_caches'].clear()
+
+        response = self._record('mobile-2', amount=999)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(GroupTransaction.query.count(), 1)
+
+    def test_legacy_keys_on_transactions_are_honoured(self):
+        legacy = GroupTransaction(
+            group_id=self.group_id, type='SAVING_CONTRIBUTION', amount=50,
+            processed_by=self.user_id, idempotency_key='legacy-1'
+        )
+        legacy.group_balance_before = 0
+        legacy.group_balance_after = 50
+        db.session.add(legacy)
+        db.session.commit()
+
+        self.assertEqual(self._record('legacy-1').status_code, 200)
+        self.assertEqual(GroupTransaction.query.count(), 1)
+
+    def test_purge_removes_only_expired_keys(self):
+        remember(GROUP_TRANSACTION, 'old', {'id': 1}, ttl=60)
+        remember(GROUP_TRANSACTION, 'fresh', {'id': 2})
+        db.session.commit()
+        IdempotencyKey.query.filter_by(key='old').update(
+            {'expires_at': datetime.utcnow() - timedelta(seconds=1)}
+        )
+        db.session.commit()
+        self.app.extensions['ttl_caches'].clear()
+
+        self.assertEqual(purge_expired(batch_size=1), 1)
+        self.assertIsNone(lookup(GROUP_TRANSACTION, 'old'))
+        self.assertEqual(lookup(GROUP_TRANSACTION, 'fresh'), {'id': 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+# services/users/project/tests/test_jobs.py
+
+
+import json
+import unittest
+from datetime import date, datetime, timedelta
+
+from project import db
+from project.api import jobs
+from project.api.models import (
+    BackgroundJob, GroupLoan, GroupMember, LoanRepaymentSchedule, Notification, SavingsGroup
+)
+from project.api.outbox import notify
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestJobs(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.app.config['JOB_MAX_ATTEMPTS'] = 2
+        self.calls = []
+
+        @jobs.job('test.flaky')
+        def flaky(fail_times):
+            self.calls.append(fail_times)
+            if len(self.calls) <= fail_times:
+                raise RuntimeError('boom')
+            return {'calls': len(self.calls)}
+
+        self.addCleanup(jobs.JOBS.pop, 'test.flaky')
+
+    def test_job_runs_and_records_timing(self):
+        queued = jobs.enqueue('test.flaky', {'fail_times': 0})
+        db.session.commit()
+
+        self.assertEqual(jobs.work('w1', once=True), 1)
+        finished = db.session.get(BackgroundJob, queued.id)
+        self.assertEqual(finished.status, 'SUCCEEDED')
+        self.assertEqual(json.loads(finished.result), {'calls': 1})
+        self.assertIsNotNone(finished.duration_ms)
+        self.assertEqual(jobs.job_metrics()['test.flaky']['SUCCEEDED'], 1)
+
+    def test_failures_are_retried_with_backoff_then_failed(self):
+        queued = jobs.enqueue('test.flaky', {'fail_times': 5})
+        db.session.commit()
+
+        jobs.work('w1', once=True)
+        retried = db.session.get(BackgroundJob, queued.id)
+        self.assertEqual((retried.status, retried.attempts), ('QUEUED', 1))
+        self.assertIn('RuntimeError: boom', retried.last_error)
+        self.assertGreater(retried.run_at, datetime.utcnow())
+        self.assertIsNone(jobs.claim_next('w1'))
+
+        retried.run_at = datetime.utcnow()
+        db.session.commit()
+        jobs.work('w1', once=True)
+        self.assertEqual(db.session.get(BackgroundJob, queued.id).status, 'FAILED')
+        self.assertEqual(self.calls, [5, 5])
+
+    def test_a_job_is_claimed_once(self):
+        queued = jobs.enqueue('test.flaky', {'fail_times': 0})
+        db.session.commit()
+
+        self.assertEqual(jobs.claim_next('w1'), queued.id)
+        self.assertIsNone(jobs.claim_next('w2'))
+        self.assertEqual(db.session.get(BackgroundJob, queued.id).locked_by, 'w1')
+
+    def test_stale_running_jobs_are_requeued(self):
+        queued = jobs.enqueue('test.flaky', {'fail_times': 0})
+        db.session.commit()
+        jobs.claim_next('w1')
+        BackgroundJob.query.filter_by(id=queued.id).update(
+            {'started_at': datetime.utcnow() - timedelta(hours=2)}
+        )
+        db.session.commit()
+
+        self.assertEqual(jobs.requeue_stale(timeout_seconds=3600), 1)
+        self.assertEqual(db.session.get(BackgroundJob, queued.id).status, 'QUEUED')
+
+    def test_unique_and_unknown_jobs(self):
+        first = jobs.enqueue('test.flaky', {'fail_times': 0}, unique=True)
+        db.session.commit()
+        self.assertIs(jobs.enqueue('test.flaky', {'fail_times': 0}, unique=True), first)
+        with self.assertRaises(jobs.UnknownJob):
+            jobs.enqueue('no.such.job')
+
+    def test_registered_maintenance_jobs(self):
+        user = add_user('officer', 'officer@test.com', 'greaterthaneight')
+        group = SavingsGroup(
+            name='Jobs Group', formation_date=date.today(), created_by=user.id,
+            district='Kampala', parish='Central', village='Nakasero'
+        )
+        db.session.add(group)
+        db.session.flush()
+        member = GroupMember(group.id, user.id, 'Alice', 'F')
+        db.session.add(member)
+        db.session.flush()
+        loan = GroupLoan(group.id, 1000, 3, 10, member.id, 'school fees')
+        db.session.add(loan)
+        db.session.flush()
+        db.session.add(LoanRepaymentSchedule(loan.id, 1, date.today() - timedelta(days=4), 300, 30))
+        notify(user.id, 'queued earlier')
+        jobs.enqueue('loans.update_overdue')
+        jobs.enqueue('outbox.dispatch')
+        db.session.commit()
+
+        self.assertEqual(jobs.work('w1', once=True), 2)
+        installment = LoanRepaymentSchedule.query.one()
+        self.assertEqual((installment.status, installment.days_overdue), ('OVERDUE', 4))
+        self.assertEqual(Notification.query.count(), 1)
+
+    def test_periodic_jobs_are_queued_by_the_workers(self):
+        self.app.config['PERIODIC_JOBS'] = {'idempotency.purge': 3600}
+        self.assertEqual(jobs.schedule_periodic(), ['idempotency.purge'])
+        self.assertEqual(jobs.schedule_periodic(), [])
+
+        self.assertEqual(jobs.work('w1', once=True), 1)
+        self.assertEqual(jobs.schedule_periodic(), ['idempotency.purge'])
+        runs = BackgroundJob.query.filter_by(name='idempotency.purge').order_by(BackgroundJob.id).all()
+        self.assertEqual([run.status for run in runs], ['SUCCEEDED', 'QUEUED'])
+        self.assertEqual(runs[1].run_at, runs[0].run_at + timedelta(seconds=3600))
+
+    def test_admins_enqueue_and_inspect_jobs(self):
+        admin = add_user('root', 'root@test.com', 'greaterthaneight')
+        admin.is_super_admin = True
+        db.session.commit()
+        headers = {'Authorization': f'Bearer {admin.encode_auth_token(admin.id)}'}
+
+        response = self.client.post(
+            '/admin/jobs', data=json.dumps({'name': 'test.flaky', 'args': {'fail_times': 0}}),
+            content_type='application/json', headers=headers
+        )
+        self.assertEqual(response.status_code, 202)
+        job_id = json.loads(response.data.decode())['data']['job']['id']
+
+        jobs.work('w1', once=True)
+        data = json.loads(self.client.get(f'/admin/jobs/{job_id}', headers=headers).data.decode())
+        self.assertEqual(data['data']['job']['status'], 'SUCCEEDED')
+
+        response = self.client.post(
+            '/admin/jobs', data=json.dumps({'name': 'no.such.job'}),
+            content_type='application/json', headers=headers
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
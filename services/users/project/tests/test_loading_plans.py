@@ -0,0 +1,84 @@
+# services/users/project/tests/test_loading_plans.py
+
+
+import json
+import unittest
+from datetime import date
+
+from sqlalchemy import event
+
+from project import db
+from project.api.models import SavingsGroup, GroupMember, GroupLoan
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestGroupListLoading(BaseTestCase):
+
+    def _add_groups(self, owner, count):
+        for i in range(count):
+            group = SavingsGroup(
+                name=f'Group {i}', formation_date=date.today(),
+                created_by=owner.id, district='Kampala', parish='Central',
+                village='Nakasero'
+            )
+            db.session.add(group)
+            db.session.flush()
+            member = GroupMember(
+                group_id=group.id, user_id=owner.id, name=f'Chair {i}', gender='F'
+            )
+            db.session.add(member)
+            db.session.flush()
+            group.chair_member_id = member.id
+            group.treasurer_member_id = member.id
+            if i % 2:
+                loan = GroupLoan(
+                    group_id=group.id, principal=1000, term_months=6,
+                    interest_rate_annual=12, requested_by=owner.id
+                )
+                loan.status = 'DISBURSED'
+                db.session.add(loan)
+        db.session.commit()
+
+    def _list_groups(self, auth_token):
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            response = self.client.get(
+                '/savings-groups?per_page=50',
+                headers={'Authorization': f'Bearer {auth_token}'}
+            )
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+        return response, len(statements)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        owner = add_user('owner', 'owner@test.com', 'greaterthaneight')
+        owner.is_super_admin = True
+        db.session.commit()
+        auth_token = owner.encode_auth_token(owner.id)
+
+        self._add_groups(owner, 2)
+        self._list_groups(auth_token)  # warm the token and permission caches
+        _, small = self._list_groups(auth_token)
+        self._add_groups(owner, 8)
+        response, large = self._list_groups(auth_token)
+
+        data = json.loads(response.data.decode())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(data['data']['groups']), 10)
+        self.assertEqual(small, large)
+
+        by_name = {g['name']: g for g in data['data']['groups']}
+        self.assertTrue(by_name['Group 1']['has_active_loan'])
+        self.assertFalse(by_name['Group 2']['has_active_loan'])
+        self.assertEqual(by_name['Group 3']['officers']['chair']['officer_role'], 'chair')
+        self.assertEqual(by_name['Group 3']['created_by'], 'owner')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+# services/users/project/tests/test_meeting_batch.py
+
+
+import json
+import unittest
+from datetime import date
+from decimal import Decimal
+
+from project import db
+from project.api.models import (
+    SavingsGroup, GroupMember, GroupLoan, GroupCashbook, GroupCashbookHead,
+    MemberFine, MemberSaving, SavingTransaction, SavingType
+)
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestMeetingBatch(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = add_user('treasurer', 'treasurer@test.com', 'greaterthaneight')
+        self.user.is_super_admin = True
+        group = SavingsGroup(
+            name='Batch Group', formation_date=date.today(),
+            created_by=self.user.id, district='Kampala', parish='Central',
+            village='Nakasero'
+        )
+        db.session.add(group)
+        db.session.flush()
+        self.alice = GroupMember(group_id=group.id, user_id=self.user.id, name='Alice', gender='F')
+        db.session.add(self.alice)
+        db.session.add(SavingType('Personal Savings', 'PERSONAL', self.user.id))
+        db.session.flush()
+        fine = MemberFine(self.alice.id, 500, 'Late', 'LATE_ATTENDANCE', self.user.id)
+        loan = GroupLoan(group.id, 10000, 3, 12, self.alice.id)
+        loan.status = 'DISBURSED'
+        loan.outstanding_balance = Decimal('10000.00')
+        loan.total_repaid = Decimal('0.00')
+        db.session.add_all([fine, loan])
+        db.session.commit()
+        self.group_id = group.id
+        self.fine_id = fine.id
+        self.loan_id = loan.id
+        self.headers = {
+            'Authorization': f'Bearer {self.user.encode_auth_token(self.user.id)}'
+        }
+
+    def _post(self, postings, **extra):
+        return self.client.post(
+            f'/savings-groups/{self.group_id}/cashbook/batch',
+            data=json.dumps(dict(postings=postings, **extra)),
+            content_type='application/json',
+            headers=self.headers
+        )
+
+    def _saving(self, amount, transaction_type='DEPOSIT'):
+        return {
+            'type': 'SAVING', 'member_id': self.alice.id,
+            'saving_type_code': 'PERSONAL', 'amount': amount,
+            'transaction_type': transaction_type
+        }
+
+    def test_batch_posts_every_line_with_running_balances(self):
+        response = self._post([
+            self._saving(1000),
+            self._saving(2000),
+            {'type': 'FINE_PAYMENT', 'fine_id': self.fine_id, 'amount': 500},
+            {'type': 'LOAN_REPAYMENT', 'loan_id': self.loan_id, 'amount': 4000},
+        ])
+        data = json.loads(response.data.decode())
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(data['data']['posted']), 4)
+        self.assertEqual(data['data']['errors'], [])
+
+        entries = GroupCashbook.query.filter_by(group_id=self.group_id).order_by(GroupCashbook.id).all()
+        self.assertEqual([float(e.total_balance) for e in entries], [1000.0, 3000.0, 3000.0, 3000.0])
+        self.assertEqual(GroupCashbookHead.query.get(self.group_id).last_entry_id, entries[-1].id)
+
+        saving = MemberSaving.query.filter_by(member_id=self.alice.id).one()
+        self.assertEqual(saving.current_balance, Decimal('3000.00'))
+        balances = [(t.balance_before, t.balance_after) for t in SavingTransaction.query.order_by(SavingTransaction.id)]
+        self.assertEqual(balances, [(Decimal('0.00'), Decimal('1000.00')), (Decimal('1000.00'), Decimal('3000.00'))])
+        self.assertEqual(MemberFine.query.get(self.fine_id).status, 'PAID')
+        loan = GroupLoan.query.get(self.loan_id)
+        self.assertEqual(loan.status, 'PARTIALLY_REPAID')
+        self.assertEqual(loan.outstanding_balance, Decimal('6000.00'))
+
+    def test_lines_are_validated_against_earlier_lines(self):
+        response = self._post([
+            self._saving(1000),
+            self._saving(1500, 'WITHDRAWAL'),
+            {'type': 'FINE_PAYMENT', 'fine_id': self.fine_id, 'amount': 500},
+            {'type': 'FINE_PAYMENT', 'fine_id': self.fine_id, 'amount': 500},
+        ])
+        data = json.loads(response.data.decode())
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(data['message'], 'No postings were recorded.')
+        self.assertEqual(
+            data['data']['errors'],
+            [{'index': 1, 'message': 'Insufficient balance for withdrawal'},
+             {'index': 3, 'message': 'Fine is not pending payment'}]
+        )
+        self.assertEqual(GroupCashbook.query.count(), 0)
+        self.assertEqual(MemberFine.query.get(self.fine_id).status, 'PENDING')
+
+    def test_non_atomic_batch_records_valid_lines(self):
+        response = self._post([
+            self._saving(1000),
+            {'type': 'LOAN_REPAYMENT', 'loan_id': 9999, 'amount': 100},
+            self._saving(-5),
+        ], atomic=False)
+        data = json.loads(response.data.decode())
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([line['index'] for line in data['data']['posted']], [0])
+        self.assertEqual(
+            data['data']['errors'],
+            [{'index': 1, 'message': 'Loan not found in this group'},
+             {'index': 2, 'message': 'Amount must be positive'}]
+        )
+        self.assertEqual(GroupCashbook.query.count(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
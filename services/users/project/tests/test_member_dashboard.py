@@ -0,0 +1,140 @@
+# services/users/project/tests/test_member_dashboard.py
+
+
+import json
+import unittest
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import event
+
+from project import db
+from project.api.models import (
+    SavingsGroup, GroupMember, GroupLoan, MemberSaving, SavingType, SavingTransaction,
+    MeetingAttendance, MemberFine
+)
+from project.api.cache_utils import current_version
+from project.api.member_dashboard import MEMBERS_VERSION
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestMemberDashboard(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        user = add_user('member', 'member@test.com', 'greaterthaneight')
+        group = SavingsGroup(
+            name='Dashboard Group', formation_date=date.today(), created_by=user.id,
+            district='Kampala', parish='Central', village='Nakasero'
+        )
+        db.session.add(group)
+        db.session.flush()
+        member = GroupMember(group.id, user.id, 'Alice', 'F')
+        db.session.add(member)
+        db.session.flush()
+        group.chair_member_id = member.id
+        db.session.add_all([
+            SavingType('Personal Savings', 'PERSONAL', user.id),
+            SavingType('Social Fund', 'SOCIAL', user.id),
+        ])
+        for days_ago, attended in ((3, True), (10, False), (200, True)):
+            db.session.add(MeetingAttendance(
+                group.id, member.id, date.today() - timedelta(days=days_ago), user.id, attended=attended
+            ))
+        db.session.add(MemberFine(member.id, 25, 'Late', 'LATE_ATTENDANCE', user.id))
+        db.session.add(GroupLoan(group.id, 500, 6, 10, member.id, 'stock'))
+        db.session.commit()
+
+        self.user_id = user.id
+        self.group_id = group.id
+        self.member_id = member.id
+        self.headers = {'Authorization': f'Bearer {user.encode_auth_token(user.id)}'}
+
+        for code, amount in (('PERSONAL', 100), ('PERSONAL', 50), ('SOCIAL', 20)):
+            self._save(code, amount)
+
+    def _save(self, code, amount):
+        saving_type = SavingType.query.filter_by(code=code).one()
+        saving = MemberSaving.query.filter_by(
+            member_id=self.member_id, saving_type_id=saving_type.id
+        ).first()
+        if not saving:
+            saving = MemberSaving(self.member_id, saving_type.id)
+            saving.current_balance = Decimal('0.00')
+            db.session.add(saving)
+            db.session.flush()
+        transaction = SavingTransaction(saving.id, Decimal(amount), 'DEPOSIT', self.user_id)
+        transaction.balance_before = saving.current_balance
+        transaction.balance_after = saving.current_balance + Decimal(amount)
+        saving.current_balance = transaction.balance_after
+        db.session.add(transaction)
+        db.session.commit()
+
+    def _dashboard(self):
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            response = self.client.get(f'/member-dashboard/{self.member_id}', headers=self.headers)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.data.decode())['data'], statements
+
+    def test_dashboard_aggregates(self):
+        data, _ = self._dashboard()
+        self.assertEqual(
+            [(s['saving_type']['code'], s['current_balance']) for s in data['savings']],
+            [('PERSONAL', 150.0), ('SOCIAL', 20.0)]
+        )
+        self.assertEqual(data['total_savings'], 170.0)
+        self.assertEqual(data['savings_by_type'], {'PERSONAL': 150.0, 'SOCIAL': 20.0})
+        self.assertEqual(data['attendance'], {'window_days': 90, 'meetings': 2, 'attended': 1})
+        self.assertEqual(data['attendance_rate'], 50.0)
+        self.assertEqual(data['fines'], {'pending': 1, 'amount': 25.0})
+        self.assertEqual(data['active_loan']['status'], 'PENDING')
+        self.assertEqual(data['member']['officer_role'], 'chair')
+        self.assertEqual(data['group']['name'], 'Dashboard Group')
+        self.assertEqual(data['group']['officers']['chair']['name'], 'Alice')
+        self.assertEqual(data['savings'][0]['member_id'], self.member_id)
+        self.assertIn('id', data['savings'][0])
+        self.assertEqual(
+            [tx['amount'] for tx in data['recent_transactions']], [20.0, 50.0, 100.0]
+        )
+        self.assertEqual(data['recent_transactions'][0]['processed_by'], 'member')
+
+    def test_dashboard_is_cached_until_a_saving_is_recorded(self):
+        _, first = self._dashboard()
+        # One aggregate query and one for the recent transactions
+        self.assertEqual(len([s for s in first if 'meeting_attendance' in s]), 1)
+        self.assertEqual(len([s for s in first if 'member_savings' in s]), 2)
+        self.assertEqual(len([s for s in first if 'saving_transactions' in s]), 1)
+
+        data, second = self._dashboard()
+        self.assertFalse([s for s in second if 'meeting_attendance' in s or 'saving_transactions' in s])
+
+        version = current_version(MEMBERS_VERSION.format(self.group_id))
+        self._save('SOCIAL', 5)
+        # The write bumped the shared counter, so every worker's copy is retired
+        self.assertGreater(current_version(MEMBERS_VERSION.format(self.group_id)), version)
+        data, third = self._dashboard()
+        self.assertEqual(data['total_savings'], 175.0)
+        self.assertTrue([s for s in third if 'meeting_attendance' in s])
+
+    def test_group_change_only_reloads_the_group(self):
+        self._dashboard()
+        group = db.session.get(SavingsGroup, self.group_id)
+        group.name = 'Renamed Group'
+        db.session.commit()
+
+        data, statements = self._dashboard()
+        self.assertEqual(data['group']['name'], 'Renamed Group')
+        self.assertFalse([s for s in statements if 'meeting_attendance' in s])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+# services/users/project/tests/test_outbox.py
+
+
+import json
+import unittest
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+from project import db
+from project.api.models import (
+    SavingsGroup, GroupMember, GroupTransaction, Notification, CalendarEvent,
+    OutboxEvent, Service
+)
+from project.api import outbox
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestOutbox(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.app.config['OUTBOX_MAX_ATTEMPTS'] = 2
+        user = add_user('treasurer', 'treasurer@test.com', 'greaterthaneight')
+        user.is_super_admin = True
+        service = Service(name='Savings Groups')
+        group = SavingsGroup(
+            name='Outbox Group', formation_date=date.today(),
+            created_by=user.id, district='Kampala', parish='Central',
+            village='Nakasero'
+        )
+        db.session.add_all([service, group])
+        db.session.flush()
+        member = GroupMember(group.id, user.id, 'Alice', 'F')
+        db.session.add(member)
+        db.session.commit()
+        self.user_id = user.id
+        self.group_id = group.id
+        self.member_id = member.id
+        self.service_id = service.id
+        self.headers = {'Authorization': f'Bearer {user.encode_auth_token(user.id)}'}
+
+    def test_side_effects_are_queued_with_the_transaction(self):
+        with mock.patch('project.api.outbox.socketio') as socketio:
+            response = self.client.post(
+                f'/savings-groups/{self.group_id}/transactions',
+                data=json.dumps({'type': 'SAVING_CONTRIBUTION', 'amount': 100, 'member_id': self.member_id}),
+                content_type='application/json',
+                headers=self.headers
+            )
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(Notification.query.count(), 0)
+            self.assertEqual([e.event_type for e in OutboxEvent.query], ['notification'])
+            # No message queue: the web process emits once it has committed
+            socketio.emit.assert_called_once()
+            self.assertEqual(socketio.emit.call_args.kwargs['room'], 'dashboard')
+
+            self.assertEqual(outbox.dispatch_pending(), (1, 0))
+
+        notification = Notification.query.one()
+        self.assertEqual(notification.user_id, self.user_id)
+        self.assertEqual(notification.service_id, self.service_id)
+        event = CalendarEvent.query.one()
+        self.assertEqual(event.related_transaction_id, GroupTransaction.query.one().id)
+        self.assertEqual(event.event_date, date.today())
+        self.assertEqual(event.location, 'Nakasero')
+        socketio.emit.assert_called_once()
+        self.assertEqual(OutboxEvent.query.filter_by(status='DELIVERED').count(), 1)
+        self.assertEqual(outbox.dispatch_pending(), (0, 0))
+
+    def test_broadcasts_go_through_the_message_queue_when_configured(self):
+        self.app.config['SOCKETIO_MESSAGE_QUEUE'] = 'redis://redis:6379/0'
+        with mock.patch('project.api.outbox.socketio') as socketio:
+            outbox.broadcast('dashboard_update', {'group_id': self.group_id}, room='dashboard')
+            db.session.commit()
+            socketio.emit.assert_not_called()
+            self.assertEqual([e.event_type for e in OutboxEvent.query], ['broadcast'])
+
+            self.assertEqual(outbox.dispatch_pending(), (1, 0))
+        socketio.emit.assert_called_once_with(
+            'dashboard_update', {'group_id': self.group_id}, room='dashboard'
+        )
+
+    def test_rolled_back_broadcasts_are_not_emitted(self):
+        with mock.patch('project.api.outbox.socketio') as socketio:
+            outbox.broadcast('dashboard_update', {'group_id': self.group_id})
+            db.session.rollback()
+            db.session.commit()
+        socketio.emit.assert_not_called()
+
+    def test_rolled_back_writes_leave_no_events(self):
+        outbox.notify(self.user_id, 'never sent')
+        db.session.rollback()
+        self.assertEqual(OutboxEvent.query.count(), 0)
+
+    def test_bad_event_is_retried_with_backoff_then_failed(self):
+        outbox.notify(self.user_id, 'first')
+        outbox.enqueue('fax', {'to': 'nobody'})
+        outbox.notify(self.user_id, 'second')
+        db.session.commit()
+
+        self.assertEqual(outbox.dispatch_pending(), (2, 1))
+        self.assertEqual(
+            [n.message for n in Notification.query.order_by(Notification.id)], ['first', 'second']
+        )
+        bad = OutboxEvent.query.filter_by(event_type='fax').one()
+        self.assertEqual((bad.status, bad.attempts), ('PENDING', 1))
+        self.assertIn('Unknown outbox event type', bad.last_error)
+        self.assertGreater(bad.available_at, datetime.utcnow())
+
+        # Not due yet
+        self.assertEqual(outbox.dispatch_pending(), (0, 0))
+
+        bad.available_at = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+        self.assertEqual(outbox.dispatch_pending(), (0, 1))
+        self.assertEqual(OutboxEvent.query.filter_by(event_type='fax').one().status, 'FAILED')
+
+
+if __name__ == '__main__':
+    unittest.main()
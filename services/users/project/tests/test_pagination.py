@@ -0,0 +1,94 @@
+# services/users/project/tests/test_pagination.py
+
+
+import json
+import unittest
+from datetime import date
+
+from project import db
+from project.api.models import Notification, SavingsGroup
+from project.api.cashbook_service import CashbookService
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestCursorPagination(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = add_user('pager', 'pager@test.com', 'greaterthaneight')
+        for i in range(5):
+            db.session.add(Notification(user_id=self.user.id, message=f'Note {i}'))
+        db.session.commit()
+        self.headers = {
+            'Authorization': f'Bearer {self.user.encode_auth_token(self.user.id)}'
+        }
+
+    def _get(self, query):
+        response = self.client.get(
+            f'/notifications/user/{self.user.id}?limit=2&{query}',
+            headers=self.headers
+        )
+        return response, json.loads(response.data.decode())
+
+    def test_walk_forward_and_back(self):
+        seen = []
+        pages = []
+        cursor = ''
+        while cursor is not None:
+            response, data = self._get(f'cursor={cursor}')
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('total', data['pagination'])
+            ids = [n['id'] for n in data['data']]
+            pages.append(ids)
+            seen.extend(ids)
+            cursor = data['pagination']['next_cursor']
+            if len(pages) == 2:
+                prev_cursor = data['pagination']['prev_cursor']
+
+        # Same second for every row: the id tie-breaker keeps pages disjoint
+        self.assertEqual(seen, sorted(seen, reverse=True))
+        self.assertEqual(len(set(seen)), 5)
+        self.assertEqual([len(p) for p in pages], [2, 2, 1])
+
+        _, data = self._get(f'cursor={prev_cursor}')
+        self.assertEqual([n['id'] for n in data['data']], pages[0])
+        self.assertIsNone(data['pagination']['prev_cursor'])
+
+    def test_total_is_opt_in(self):
+        _, data = self._get('cursor=&include_total=true')
+        self.assertEqual(data['pagination']['total'], 5)
+
+    def test_invalid_cursor(self):
+        response, data = self._get('cursor=bm90LWEtY3Vyc29y')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(data['message'], 'Invalid cursor.')
+
+    def test_cashbook_cursor(self):
+        group = SavingsGroup(
+            name='Pager Group', formation_date=date.today(),
+            created_by=self.user.id, district='Kampala', parish='Central',
+            village='Nakasero'
+        )
+        db.session.add(group)
+        db.session.commit()
+        for amount in (100, 200, 300):
+            CashbookService.create_cashbook_entry(
+                group.id, date.today(), 'Deposit', 'DEPOSIT', self.user.id,
+                individual_saving=amount
+            )
+        db.session.commit()
+
+        first = CashbookService.get_group_cashbook(group.id, limit=2, cursor='')
+        self.assertEqual(
+            [e['individual_saving'] for e in first['entries']], [300.0, 200.0]
+        )
+        rest = CashbookService.get_group_cashbook(
+            group.id, limit=2, cursor=first['pagination']['next_cursor']
+        )
+        self.assertEqual([e['individual_saving'] for e in rest['entries']], [100.0])
+        self.assertIsNone(rest['pagination']['next_cursor'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+# services/users/project/tests/test_permission_cache.py
+
+
+import unittest
+
+from project import db
+from project.api.models import Service, UserServicePermission, CacheVersion
+from project.api.cache_utils import TTLCache, current_version
+from project.api.permission_cache import (
+    PERMISSIONS_VERSION, bump_permission_version, get_permission_matrix
+)
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestTTLCache(unittest.TestCase):
+
+    def test_lru_eviction_and_expiry(self):
+        now = [0.0]
+        cache = TTLCache(maxsize=2, ttl=10, timer=lambda: now[0])
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('d', 4, ttl=1)
+        now[0] = 5
+        self.assertIsNone(cache.get('c'))
+        self.assertIsNone(cache.get('d'))
+        self.assertEqual(cache.get('a'), 1)
+
+
+class TestPermissionCache(BaseTestCase):
+
+    def _grant(self, permissions='read,write'):
+        user = add_user('perm', 'perm@test.com', 'greaterthaneight')
+        service = Service(name='Savings Groups')
+        db.session.add(service)
+        db.session.flush()
+        db.session.add(UserServicePermission(
+            user_id=user.id, service_id=service.id, permissions=permissions
+        ))
+        db.session.commit()
+        return user
+
+    def test_matrix_answers_permission_checks(self):
+        user = self._grant()
+        self.assertTrue(user.has_permission('Savings Groups', 'write'))
+        self.assertFalse(user.has_permission('Savings Groups', 'delete'))
+        self.assertFalse(user.is_service_admin('Savings Groups'))
+        self.assertEqual(
+            get_permission_matrix(user.id).grants,
+            {('Savings Groups', 'read'), ('Savings Groups', 'write')}
+        )
+
+    def test_cached_until_version_bump(self):
+        user = self._grant()
+        self.assertTrue(user.has_permission('Savings Groups', 'write'))
+
+        # Revoked without a bump: the cached matrix still answers
+        UserServicePermission.query.delete()
+        db.session.commit()
+        self.assertTrue(user.has_permission('Savings Groups', 'write'))
+
+        bump_permission_version()
+        db.session.commit()
+        self.assertEqual(current_version(PERMISSIONS_VERSION), 1)
+        self.assertFalse(user.has_permission('Savings Groups', 'write'))
+
+    def test_bump_from_another_worker_is_polled(self):
+        self.app.config['CACHE_VERSION_POLL_SECONDS'] = 0
+        self.assertEqual(current_version(PERMISSIONS_VERSION), 0)
+        db.session.add(CacheVersion(name=PERMISSIONS_VERSION, version=7))
+        db.session.commit()
+        self.assertEqual(current_version(PERMISSIONS_VERSION), 7)
+
+    def test_rolled_back_bump_is_discarded(self):
+        bump_permission_version()
+        db.session.rollback()
+        self.assertIsNone(CacheVersion.query.get(PERMISSIONS_VERSION))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# services/users/project/tests/test_platform_stats.py
+
+
+import json
+import unittest
+from datetime import date
+from decimal import Decimal
+
+from project import db
+from project.api.models import (
+    PlatformStat, SavingsGroup, GroupMember, MemberSaving, SavingType
+)
+from project.api.platform_stats import platform_summary, reconcile
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestPlatformStats(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.admin = add_user('admin', 'admin@test.com', 'greaterthaneight')
+        self.admin.is_super_admin = True
+        self.saving_type = SavingType('Personal Savings', 'PERSONAL', self.admin.id)
+        db.session.add(self.saving_type)
+        db.session.commit()
+
+    def _group(self, name, region, members=0):
+        group = SavingsGroup(
+            name=name, formation_date=date.today(), created_by=self.admin.id,
+            region=region, district='Kampala', parish='Central', village='Town'
+        )
+        db.session.add(group)
+        db.session.flush()
+        for i in range(members):
+            user = add_user(f'{name}{i}', f'{name}{i}@test.com', 'greaterthaneight')
+            db.session.add(GroupMember(group.id, user.id, f'{name} {i}', 'F'))
+        group.members_count = members
+        db.session.commit()
+        return group
+
+    def _stats(self):
+        return {
+            (row.state, row.region): (row.groups_count, row.members_count, row.total_savings)
+            for row in PlatformStat.query
+        }
+
+    def test_writes_keep_totals_current(self):
+        north = self._group('north', 'Northern', members=2)
+        self._group('west', None)
+        member = GroupMember.query.filter_by(group_id=north.id).first()
+        saving = MemberSaving(member.id, self.saving_type.id)
+        saving.current_balance = Decimal('150.00')
+        db.session.add(saving)
+        db.session.commit()
+
+        saving.current_balance += Decimal('50.00')
+        member.is_active = False
+        db.session.commit()
+
+        self.assertEqual(self._stats(), {
+            ('FORMING', 'Northern'): (1, 1, Decimal('200.00')),
+            ('FORMING', ''): (1, 0, Decimal('0.00')),
+        })
+
+    def test_state_change_moves_group_totals(self):
+        group = self._group('east', 'Eastern', members=5)
+        member = GroupMember.query.filter_by(group_id=group.id).first()
+        saving = MemberSaving(member.id, self.saving_type.id)
+        saving.current_balance = Decimal('80.00')
+        db.session.add(saving)
+        db.session.commit()
+
+        group.update_state()
+        saving.current_balance += Decimal('20.00')
+        db.session.commit()
+
+        self.assertEqual(self._stats(), {
+            ('FORMING', 'Eastern'): (0, 0, Decimal('0.00')),
+            ('ACTIVE', 'Eastern'): (1, 5, Decimal('100.00')),
+        })
+
+    def test_reconcile_repairs_drift(self):
+        self._group('south', 'Southern', members=3)
+        PlatformStat.query.update({'members_count': 99})
+        db.session.commit()
+
+        reconcile()
+        self.assertEqual(self._stats(), {('FORMING', 'Southern'): (1, 3, Decimal('0.00'))})
+        self.assertIsNotNone(platform_summary()['stats_reconciled'])
+
+    def test_dashboard_reads_cached_stats(self):
+        self._group('central', 'Central', members=2)
+        headers = {'Authorization': f'Bearer {self.admin.encode_auth_token(self.admin.id)}'}
+
+        data = json.loads(self.client.get('/admin-dashboard', headers=headers).data.decode())['data']
+        self.assertEqual(data['summary']['total_groups'], 1)
+        self.assertEqual(data['summary']['total_members'], 2)
+        self.assertEqual(data['groups_by_region'], {'Central': 1})
+        self.assertIsNotNone(data['freshness']['stats_updated'])
+
+        self._group('later', 'Central')
+        cached = json.loads(self.client.get('/admin-dashboard', headers=headers).data.decode())['data']
+        self.assertEqual(cached, data)
+
+        self.app.extensions['ttl_caches'].clear()
+        fresh = json.loads(self.client.get('/admin-dashboard', headers=headers).data.decode())['data']
+        self.assertEqual(fresh['summary']['total_groups'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
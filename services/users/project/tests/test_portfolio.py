@@ -0,0 +1,121 @@
+# services/users/project/tests/test_portfolio.py
+
+
+import json
+import unittest
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+
+from project import db
+from project.api.models import (
+    SavingsGroup, GroupMember, MemberSaving, SavingType, GroupTransaction, MeetingAttendance
+)
+from project.api.portfolio import PortfolioSnapshot, get_snapshot
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestPortfolio(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        admin = add_user('admin', 'admin@test.com', 'greaterthaneight')
+        admin.is_super_admin = True
+        personal = SavingType('Personal Savings', 'PERSONAL', admin.id)
+        social = SavingType('Social Fund', 'SOCIAL', admin.id)
+        db.session.add_all([personal, social])
+        db.session.flush()
+
+        members = {}
+        for district, village, people in (
+            ('Kampala', 'Nakasero', (('Alice', 'F', 100), ('Bob', 'M', 40))),
+            ('Gulu', 'Layibi', (('Carol', 'F', 60),)),
+        ):
+            group = SavingsGroup(
+                name=f'{district} Group', formation_date=date.today(), created_by=admin.id,
+                region='Central' if district == 'Kampala' else 'Northern',
+                district=district, parish='Central', village=village
+            )
+            db.session.add(group)
+            db.session.flush()
+            for name, gender, balance in people:
+                user = add_user(name.lower(), f'{name.lower()}@test.com', 'greaterthaneight')
+                member = GroupMember(group.id, user.id, name, gender)
+                db.session.add(member)
+                db.session.flush()
+                members[name] = member
+                for saving_type, amount in ((personal, balance), (social, 10)):
+                    saving = MemberSaving(member.id, saving_type.id)
+                    saving.current_balance = Decimal(amount)
+                    db.session.add(saving)
+                transaction = GroupTransaction(group.id, 'SAVING_CONTRIBUTION', balance, admin.id,
+                                               member_id=member.id)
+                transaction.group_balance_before = 0
+                transaction.group_balance_after = balance
+                db.session.add(transaction)
+                db.session.add(MeetingAttendance(
+                    group.id, member.id, date.today(), admin.id, attended=gender == 'F'
+                ))
+        members['Bob'].is_active = False
+        db.session.commit()
+        self.headers = {'Authorization': f'Bearer {admin.encode_auth_token(admin.id)}'}
+
+    def test_breakdowns(self):
+        snapshot = PortfolioSnapshot()
+        self.assertEqual(snapshot.report('members', by=['district']), [
+            {'district': 'Kampala', 'count': 1}, {'district': 'Gulu', 'count': 1},
+        ])
+        self.assertEqual(
+            sorted(snapshot.aggregate('savings', by=['gender', 'saving_type'], value='balance'),
+                   key=lambda row: (row['gender'], row['saving_type'])),
+            [
+                {'gender': 'F', 'saving_type': 'PERSONAL', 'count': 2, 'sum': 160.0},
+                {'gender': 'F', 'saving_type': 'SOCIAL', 'count': 2, 'sum': 20.0},
+                {'gender': 'M', 'saving_type': 'PERSONAL', 'count': 1, 'sum': 40.0},
+                {'gender': 'M', 'saving_type': 'SOCIAL', 'count': 1, 'sum': 10.0},
+            ]
+        )
+        self.assertEqual(
+            snapshot.report('contributions', by=['region'], where={'district': 'Kampala'}),
+            [{'region': 'Central', 'count': 2, 'sum': 140.0}]
+        )
+        self.assertEqual(snapshot.report('attendance', by=['village'], where={'village': 'Nakasero'}),
+                         [{'village': 'Nakasero', 'count': 2, 'sum': 1.0}])
+        self.assertEqual(snapshot.report('savings'), [{'count': 6, 'sum': 230.0}])
+
+        with self.assertRaises(ValueError):
+            snapshot.report('members', by=['saving_type'])
+
+    def test_rows_of_groups_missing_from_the_load_are_dropped(self):
+        # As if the Gulu group was created after the groups were loaded
+        kampala = SavingsGroup.query.filter_by(district='Kampala').one().id
+        with db.engine.connect() as connection:
+            members = PortfolioSnapshot._load_members(connection, np.array([kampala]))[1]
+            transactions = PortfolioSnapshot._load_transactions(connection, np.array([kampala]))
+        self.assertEqual(members['group'].tolist(), [0, 0])
+        self.assertEqual(len(members['gender'].codes), 2)
+        self.assertEqual(transactions['amount'].tolist(), [100.0, 40.0])
+
+    def test_snapshot_is_reused(self):
+        first = get_snapshot()
+        self.assertIs(get_snapshot(), first)
+        self.assertIsNot(get_snapshot(refresh=True), first)
+
+    def test_portfolio_endpoint(self):
+        response = self.client.get(
+            '/admin/portfolio?measure=savings&by=district&saving_type=PERSONAL', headers=self.headers
+        )
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data.decode())['data']
+        self.assertEqual(
+            {row['district']: row['sum'] for row in data['rows']}, {'Kampala': 140.0, 'Gulu': 60.0}
+        )
+
+        response = self.client.get('/admin/portfolio?measure=members&by=colour', headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
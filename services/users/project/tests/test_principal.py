@@ -0,0 +1,69 @@
+# services/users/project/tests/test_principal.py
+
+
+import unittest
+from datetime import date
+
+from flask import g
+
+from project import db
+from project.api.models import (
+    Service, UserServicePermission, SavingsGroup, GroupMember
+)
+from project.api.principal import get_principal, load_principal
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestPrincipal(BaseTestCase):
+
+    def _setup_member(self):
+        user = add_user('principal', 'principal@test.com', 'greaterthaneight')
+        service = Service(name='Savings Groups')
+        db.session.add(service)
+        db.session.flush()
+        db.session.add(UserServicePermission(
+            user_id=user.id, service_id=service.id, permissions='read,write'
+        ))
+        group = SavingsGroup(
+            name='Principal Group', formation_date=date.today(),
+            created_by=user.id, district='Kampala', parish='Central',
+            village='Nakasero'
+        )
+        db.session.add(group)
+        db.session.flush()
+        member = GroupMember(
+            group_id=group.id, user_id=user.id, name='Principal', gender='F'
+        )
+        db.session.add(member)
+        db.session.flush()
+        group.treasurer_member_id = member.id
+        db.session.commit()
+        return user, group
+
+    def test_permissions_and_memberships(self):
+        user, group = self._setup_member()
+        principal = load_principal(user.id)
+        self.assertTrue(principal.active)
+        self.assertTrue(principal.has_permission('Savings Groups', 'write'))
+        self.assertFalse(principal.has_permission('Savings Groups', 'delete'))
+        self.assertFalse(principal.has_permission('Notifications'))
+        self.assertFalse(principal.is_service_admin('Savings Groups'))
+        self.assertEqual(principal.membership(group.id).officer_role, 'treasurer')
+        self.assertTrue(principal.is_officer(group_id=group.id))
+        self.assertTrue(principal.is_officer(officer_roles=['treasurer']))
+        self.assertFalse(principal.is_officer(officer_roles=['chair']))
+
+    def test_principal_is_cached_per_request(self):
+        user, _ = self._setup_member()
+        with self.app.test_request_context():
+            first = get_principal(user.id)
+            self.assertIs(first, get_principal(user.id))
+            self.assertIs(g._principal, first)
+
+    def test_unknown_user(self):
+        self.assertIsNone(load_principal(999))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# services/users/project/tests/test_token_cache.py
+
+
+import unittest
+from unittest import mock
+
+from project import db
+from project.api.models import User
+from project.api.token_cache import INVALID_TOKEN_MESSAGE, verify_auth_token
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestTokenCache(BaseTestCase):
+
+    def test_repeat_tokens_skip_verification(self):
+        user = add_user('token', 'token@test.com', 'greaterthaneight')
+        auth_token = user.encode_auth_token(user.id)
+        self.assertEqual(verify_auth_token(auth_token), user.id)
+        with mock.patch.object(User, 'decode_auth_payload') as decode:
+            self.assertEqual(verify_auth_token(auth_token), user.id)
+            decode.assert_not_called()
+
+    def test_invalid_token(self):
+        self.assertEqual(
+            verify_auth_token('not-a-token'),
+            'Invalid token. Please log in again.'
+        )
+
+    def test_deactivation_applies_to_cached_tokens(self):
+        user = add_user('token', 'token@test.com', 'greaterthaneight')
+        auth_token = user.encode_auth_token(user.id)
+        self.assertEqual(verify_auth_token(auth_token), user.id)
+        user.active = False
+        db.session.commit()
+        self.assertEqual(verify_auth_token(auth_token), INVALID_TOKEN_MESSAGE)
+
+    def test_rolled_back_deactivation_is_ignored(self):
+        user = add_user('token', 'token@test.com', 'greaterthaneight')
+        auth_token = user.encode_auth_token(user.id)
+        self.assertEqual(verify_auth_token(auth_token), user.id)
+        user.active = False
+        db.session.rollback()
+        self.assertEqual(verify_auth_token(auth_token), user.id)
+
+    def test_active_flag_is_rechecked(self):
+        self.app.config['TOKEN_ACTIVE_RECHECK_SECONDS'] = 0
+        user = add_user('token', 'token@test.com', 'greaterthaneight')
+        auth_token = user.encode_auth_token(user.id)
+        self.assertEqual(verify_auth_token(auth_token), user.id)
+        # Deactivated by another worker: only the database knows
+        User.query.filter_by(id=user.id).update({'active': False})
+        db.session.commit()
+        self.assertEqual(verify_auth_token(auth_token), INVALID_TOKEN_MESSAGE)
+
+
+if __name__ == '__main__':
+    unittest.main()
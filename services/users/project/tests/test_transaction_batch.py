@@ -0,0 +1,119 @@
+# services/users/project/tests/test_transaction_batch.py
+
+
+import json
+import unittest
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import event
+
+from project import db
+from project.api.models import SavingsGroup, GroupMember, GroupTransaction, Notification
+from project.api.outbox import dispatch_pending
+from project.tests.base import BaseTestCase
+from project.tests.utils import add_user
+
+
+class TestTransactionBatch(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.user = add_user('officer', 'officer@test.com', 'greaterthaneight')
+        self.user.is_super_admin = True
+        group = SavingsGroup(
+            name='Batch Tx Group', formation_date=date.today(),
+            created_by=self.user.id, district='Kampala', parish='Central',
+            village='Nakasero'
+        )
+        db.session.add(group)
+        db.session.flush()
+        member = GroupMember(group.id, self.user.id, 'Alice', 'F')
+        db.session.add(member)
+        db.session.commit()
+        self.group_id = group.id
+        self.member_id = member.id
+        self.user_id = self.user.id
+        self.headers = {'Authorization': f'Bearer {self.user.encode_auth_token(self.user.id)}'}
+
+    def _post(self, transactions, path='transactions/batch'):
+        return self.client.post(
+            f'/savings-groups/{self.group_id}/{path}',
+            data=json.dumps({'transactions': transactions}),
+            content_type='application/json',
+            headers=self.headers
+        )
+
+    def _saving(self, amount, key=None, **extra):
+        return dict({
+            'type': 'SAVING_CONTRIBUTION', 'amount': amount,
+            'member_id': self.member_id, 'idempotency_key': key
+        }, **extra)
+
+    def test_batch_applies_balances_in_order(self):
+        response = self._post([
+            self._saving(100, 'k1'),
+            self._saving(50, 'k2'),
+            {'type': 'WITHDRAWAL', 'amount': 500, 'member_id': self.member_id},
+            {'type': 'WITHDRAWAL', 'amount': 30, 'member_id': self.member_id},
+        ])
+        data = json.loads(response.data.decode())
+        self.assertEqual(response.status_code, 201)
+        results = data['data']['results']
+        self.assertEqual([r['status'] for r in results], ['created', 'created', 'failed', 'created'])
+        self.assertEqual(results[2]['message'], 'Insufficient group balance.')
+        self.assertEqual(
+            [(r['transaction']['group_balance_before'], r['transaction']['group_balance_after'])
+             for r in results if r['status'] == 'created'],
+            [(0.0, 100.0), (100.0, 150.0), (150.0, 120.0)]
+        )
+
+        group = SavingsGroup.query.get(self.group_id)
+        self.assertEqual(group.savings_balance, Decimal('120.00'))
+        self.assertEqual(GroupMember.query.get(self.member_id).share_balance, Decimal('120.00'))
+        self.assertEqual(Notification.query.count(), 0)
+        dispatch_pending()
+        self.assertEqual(Notification.query.filter_by(user_id=self.user_id).count(), 3)
+
+    def test_idempotency_keys_are_checked_in_one_query(self):
+        self._post([self._saving(100, 'seen')])
+
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            # Not the calendar projection reading the new rows back
+            if 'FROM group_transactions' in statement and 'group_members.name' not in statement:
+                statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            response = self._post([self._saving(100, key) for key in ('seen', 'a', 'b', 'a')])
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+
+        results = json.loads(response.data.decode())['data']['results']
+        self.assertEqual([r['status'] for r in results], ['duplicate', 'created', 'created', 'duplicate'])
+        self.assertEqual(results[3]['transaction']['id'], results[1]['transaction']['id'])
+        self.assertEqual(len(statements), 1)
+        self.assertEqual(GroupTransaction.query.count(), 3)
+
+    def test_invalid_items_are_reported_per_item(self):
+        response = self._post([
+            {'type': 'BONUS', 'amount': 10},
+            self._saving(-5),
+            self._saving(5, member_id=9999),
+            self._saving(5, key=['not', 'a', 'key']),
+            self._saving(5, member_id={'id': self.member_id}),
+        ])
+        data = json.loads(response.data.decode())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [r['message'] for r in data['data']['results']],
+            ['Invalid transaction type.', 'Amount must be positive.', 'Member not found in this group.',
+             'Invalid idempotency key.', 'Invalid member id.']
+        )
+        self.assertEqual(GroupTransaction.query.count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,20 @@
+#!/bin/sh
+
+# Start the background job workers and the outbox dispatcher next to
+# the web server.
+# Each process is restarted if it exits; JOB_WORKERS sets how many
+# worker processes run_workers forks (default 1).
+
+supervise() {
+    while true; do
+        "$@"
+        echo "⚠️  '$*' exited with status $?, restarting in 5s..."
+        sleep 5
+    done
+}
+
+echo "⚙️  Starting background job workers (${JOB_WORKERS:-1})..."
+supervise python manage.py run_workers --workers "${JOB_WORKERS:-1}" &
+
+echo "📬 Starting outbox dispatcher..."
+supervise python manage.py run_outbox_dispatcher &
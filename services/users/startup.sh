@@ -136,7 +136,8 @@ start_server() {
     echo "   • Users API: http://localhost:5000/users"
     echo "=============================================="
     
-    # Start the Flask server
+    # Start the background job workers, then the Flask server
+    sh ./run_background.sh
     exec python manage.py run -h 0.0.0.0
 }
 